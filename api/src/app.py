@@ -2,12 +2,33 @@ from litestar import Litestar
 from litestar.config.cors import CORSConfig
 from litestar.di import Provide
 
+from src.controllers.admin_controller import AdminController
 from src.controllers.chat_controller import ChatController
+from src.controllers.diagnostics_controller import DiagnosticsController
 from src.controllers.scrape_controller import ScrapeController
+from src.services.agent.agent import init_checkpointer
 from src.services.chat_service import ChatService
-from src.services.ingestion_service import IngestionService
-from src.services.pgvector_service import VectorStoreService
-from src.services.scraper_service import ScraperService
+from src.services.ingestion_jobs import (
+    close_ingestion_job_manager,
+    init_ingestion_job_manager,
+    provide_ingestion_job_manager,
+)
+from src.services.ingestion_service import (
+    close_ingestion_service,
+    init_ingestion_service,
+    provide_ingestion_service,
+)
+from src.services.pgvector_service import (
+    close_vector_store_service,
+    init_vector_store_service,
+    provide_vector_store_service,
+)
+from src.services.scraper_service import (
+    close_scraper_service,
+    init_scraper_service,
+    provide_scraper_service,
+)
+from src.services.semantic_cache import init_semantic_cache, provide_semantic_cache
 from src.logging_config import setup_logging
 
 
@@ -17,13 +38,38 @@ cors_config = CORSConfig(allow_origins=["*"])
 
 
 app = Litestar(
-    route_handlers=[ChatController, ScrapeController],
+    route_handlers=[
+        ChatController,
+        ScrapeController,
+        DiagnosticsController,
+        AdminController,
+    ],
     cors_config=cors_config,
     debug=True,
+    on_startup=[
+        init_vector_store_service,
+        init_checkpointer,
+        init_semantic_cache,
+        init_ingestion_service,
+        init_ingestion_job_manager,
+        init_scraper_service,
+    ],
+    on_shutdown=[
+        close_ingestion_job_manager,
+        close_vector_store_service,
+        close_ingestion_service,
+        close_scraper_service,
+    ],
     dependencies={
         "chat_service": Provide(ChatService),
-        "ingestion_service": Provide(IngestionService, sync_to_thread=True),
-        "vector_store_service": Provide(VectorStoreService, sync_to_thread=True),
-        "scraper_service": Provide(ScraperService),
+        "semantic_cache": Provide(provide_semantic_cache, sync_to_thread=False),
+        "ingestion_service": Provide(provide_ingestion_service, sync_to_thread=False),
+        "ingestion_job_manager": Provide(
+            provide_ingestion_job_manager, sync_to_thread=False
+        ),
+        "vector_store_service": Provide(
+            provide_vector_store_service, sync_to_thread=False
+        ),
+        "scraper_service": Provide(provide_scraper_service, sync_to_thread=False),
     },
 )
@@ -0,0 +1,38 @@
+from litestar import Controller, post
+from src.services.pgvector_service import VectorStoreService
+from src.models.admin_model import VectorIndexResponse
+from src.logging_config import get_logger
+
+logger = get_logger("admin_controller")
+
+
+class AdminController(Controller):
+    """Controller para operações administrativas do banco vetorial."""
+
+    path = "/admin"
+
+    @post(path="/vector-index/rebuild")
+    async def handle_rebuild_vector_index(
+        self,
+        vector_store_service: VectorStoreService,
+    ) -> VectorIndexResponse:
+        """
+        Reconstrói o índice ANN (HNSW/IVFFlat) com os parâmetros configurados no ambiente.
+
+        Args:
+            vector_store_service: Serviço de armazenamento vetorial.
+
+        Returns:
+            VectorIndexResponse: Tipo, parâmetros e duração da reconstrução.
+        """
+        vector_index = vector_store_service.vector_index
+        logger.info("Vector index rebuild requested | type=%s", vector_index.index_type)
+
+        duration_ms = await vector_index.rebuild_index()
+
+        return VectorIndexResponse(
+            status="success",
+            index_type=vector_index.index_type,
+            params=vector_index.params,
+            duration_ms=duration_ms,
+        )
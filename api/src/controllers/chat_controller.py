@@ -1,11 +1,14 @@
-from litestar import Controller, post
+import asyncio
+import json
+from litestar import Controller, get, post
 from litestar.response import ServerSentEvent
 from litestar.datastructures import UploadFile
 from litestar.enums import RequestEncodingType
+from litestar.exceptions import NotFoundException, ServiceUnavailableException
 from litestar.params import Body
 
 from src.services.chat_service import ChatService
-from src.services.ingestion_service import IngestionService
+from src.services.ingestion_jobs import IngestionJobManager
 from src.services.pgvector_service import VectorStoreService
 from src.models.chat_model import UserMessage, UploadResponse
 from src.logging_config import get_logger
@@ -63,40 +66,73 @@ class ChatController(Controller):
     @post(path="/upload")
     async def handle_file_upload(
         self,
-        ingestion_service: IngestionService,
-        vector_store_service: VectorStoreService,
+        ingestion_job_manager: IngestionJobManager,
         data: list[UploadFile] = Body(media_type=RequestEncodingType.MULTI_PART),
     ) -> UploadResponse:
         """
-        Processa upload de arquivos, extrai conteúdo e armazena no vector store.
+        Recebe arquivos e enfileira um job de ingestão em background.
+
+        A extração, vetorização e armazenamento ocorrem fora da requisição; o
+        progresso pode ser acompanhado em `/chat/upload/{job_id}/events`.
 
         Formatos suportados: PDF, CSV, Excel, Word, PowerPoint, HTML, JSON, TXT, Markdown e Imagens (OCR).
 
         Args:
-            ingestion_service: Serviço de ingestão e extração de conteúdo.
-            vector_store_service: Serviço de armazenamento vetorial.
+            ingestion_job_manager: Fila de jobs de ingestão.
             data: Lista de arquivos enviados via multipart/form-data.
 
         Returns:
-            UploadResponse: Status do processamento com quantidade de chunks gerados.
+            UploadResponse: Identificador do job e status inicial.
+
+        Raises:
+            ServiceUnavailableException: Se a fila de ingestão está cheia.
         """
         file_info = [{"name": f.filename, "type": f.content_type} for f in data]
         logger.info(
             "File upload received | files=%d | details=%s", len(data), file_info
         )
 
-        chunks = await ingestion_service.process_file(files_data=data)
-        logger.info(
-            "File processing completed | files=%d | chunks_generated=%d",
-            len(data),
-            len(chunks),
-        )
-
-        vector_store_service.add_documents(chunks)
-        logger.info("Documents added to vector store | chunks=%d", len(chunks))
+        try:
+            job = await ingestion_job_manager.submit(files_data=data)
+        except asyncio.QueueFull:
+            logger.warning("Ingestion queue full | files=%d", len(data))
+            raise ServiceUnavailableException(
+                detail="Fila de processamento cheia. Tente novamente em instantes."
+            )
 
         return UploadResponse(
+            job_id=job.job_id,
             filename=", ".join([file.filename for file in data]),
-            chunks_generated=len(chunks),
-            status="Processado e vetorizado com sucesso!",
+            status=job.status,
         )
+
+    @get(path="/upload/{job_id:str}/events")
+    async def handle_upload_events(
+        self,
+        job_id: str,
+        ingestion_job_manager: IngestionJobManager,
+    ) -> ServerSentEvent:
+        """
+        Transmite via SSE o progresso de um job de ingestão.
+
+        Eventos: 'queued', 'started', 'file_completed' (por arquivo, com chunks),
+        'completed' (com o total de chunks) ou 'failed'.
+
+        Args:
+            job_id: Identificador retornado pelo upload.
+            ingestion_job_manager: Fila de jobs de ingestão.
+
+        Returns:
+            ServerSentEvent: Stream de eventos de progresso.
+
+        Raises:
+            NotFoundException: Se o job não existe.
+        """
+        if not await ingestion_job_manager.get_job_status(job_id):
+            raise NotFoundException(detail=f"Job não encontrado: {job_id}")
+
+        async def event_generator():
+            async for event in ingestion_job_manager.stream_events(job_id):
+                yield json.dumps(event, ensure_ascii=False)
+
+        return ServerSentEvent(event_generator())
@@ -0,0 +1,155 @@
+from litestar import Controller, get
+from src.services.ingestion_service import IngestionService
+from src.services.pgvector_service import VectorStoreService
+from src.services.semantic_cache import SemanticAnswerCache
+from src.models.diagnostics_model import (
+    EmbeddingBackendStatsResponse,
+    IndexDiagnosticsResponse,
+    IngestionMetricsResponse,
+    OcrStatsResponse,
+    QueryPlan,
+    RerankerStatsResponse,
+    RetrievalCacheStatsResponse,
+    SemanticCacheStatsResponse,
+)
+from src.logging_config import get_logger
+
+logger = get_logger("diagnostics_controller")
+
+
+class DiagnosticsController(Controller):
+    """Controller para endpoints de diagnóstico do banco vetorial."""
+
+    path = "/diagnostics"
+
+    @get(path="/indexes")
+    async def handle_index_diagnostics(
+        self,
+        vector_store_service: VectorStoreService,
+        source: str | None = None,
+    ) -> IndexDiagnosticsResponse:
+        """
+        Mostra os planos (EXPLAIN) das consultas filtradas por fonte e o uso dos índices.
+
+        Args:
+            vector_store_service: Serviço de armazenamento vetorial.
+            source: Fonte usada no filtro. Usa a primeira fonte do catálogo se não informada.
+
+        Returns:
+            IndexDiagnosticsResponse: Planos de execução e contagem de scans por índice.
+        """
+        if not source:
+            files = await vector_store_service.list_files()
+            source = files[0] if files else None
+
+        logger.info("Index diagnostics requested | source=%s", source)
+
+        plans = await vector_store_service.explain_source_queries(source or "")
+        index_scans = await vector_store_service.index_usage()
+
+        return IndexDiagnosticsResponse(
+            source=source,
+            plans=[QueryPlan(**plan) for plan in plans],
+            index_scans=index_scans,
+        )
+
+    @get(path="/ingestion")
+    async def handle_ingestion_metrics(
+        self,
+        vector_store_service: VectorStoreService,
+    ) -> IngestionMetricsResponse:
+        """
+        Retorna métricas de throughput da vetorização (chunks/s) desde o startup.
+
+        Args:
+            vector_store_service: Serviço de armazenamento vetorial.
+
+        Returns:
+            IngestionMetricsResponse: Contadores e tempos acumulados de embedding e INSERT.
+        """
+        return IngestionMetricsResponse(**vector_store_service.ingestion_metrics())
+
+    @get(path="/semantic-cache")
+    async def handle_semantic_cache_stats(
+        self,
+        semantic_cache: SemanticAnswerCache,
+    ) -> SemanticCacheStatsResponse:
+        """
+        Retorna estatísticas de acerto do cache semântico de respostas.
+
+        Args:
+            semantic_cache: Cache semântico compartilhado.
+
+        Returns:
+            SemanticCacheStatsResponse: Hits, misses, hit ratio e número de entradas.
+        """
+        return SemanticCacheStatsResponse(**semantic_cache.stats())
+
+    @get(path="/retrieval-cache")
+    async def handle_retrieval_cache_stats(
+        self,
+        vector_store_service: VectorStoreService,
+    ) -> RetrievalCacheStatsResponse:
+        """
+        Retorna estatísticas do cache de resultados de busca.
+
+        Args:
+            vector_store_service: Serviço de armazenamento vetorial.
+
+        Returns:
+            RetrievalCacheStatsResponse: Hits, misses, hit ratio e latência economizada.
+        """
+        return RetrievalCacheStatsResponse(**vector_store_service.retrieval_cache.stats())
+
+    @get(path="/reranker")
+    async def handle_reranker_stats(
+        self,
+        vector_store_service: VectorStoreService,
+    ) -> RerankerStatsResponse:
+        """
+        Retorna o custo do rerank por cross-encoder (latência média e por par).
+
+        Args:
+            vector_store_service: Serviço de armazenamento vetorial.
+
+        Returns:
+            RerankerStatsResponse: Reranks executados/ignorados pelo orçamento e latências.
+        """
+        reranker = vector_store_service.reranker
+        if not reranker:
+            return RerankerStatsResponse(enabled=False)
+        return RerankerStatsResponse(enabled=True, **reranker.stats())
+
+    @get(path="/embeddings")
+    async def handle_embedding_backend_stats(
+        self,
+        vector_store_service: VectorStoreService,
+    ) -> EmbeddingBackendStatsResponse:
+        """
+        Retorna o backend de embeddings em uso e o resultado da paridade/benchmark do startup.
+
+        Args:
+            vector_store_service: Serviço de armazenamento vetorial.
+
+        Returns:
+            EmbeddingBackendStatsResponse: Backend pedido e em uso, menor cosseno e latências.
+        """
+        return EmbeddingBackendStatsResponse(
+            **vector_store_service.embedding_backend.stats()
+        )
+
+    @get(path="/ocr")
+    async def handle_ocr_stats(
+        self,
+        ingestion_service: IngestionService,
+    ) -> OcrStatsResponse:
+        """
+        Retorna métricas de throughput do pool de OCR (imagens/s, faixas, hits do cache).
+
+        Args:
+            ingestion_service: Serviço de ingestão, dono do pool de OCR.
+
+        Returns:
+            OcrStatsResponse: Contadores e tempo acumulado do OCR desde o startup.
+        """
+        return OcrStatsResponse(**ingestion_service.ocr.stats())
@@ -1,7 +1,12 @@
 from litestar import Controller, post
 from src.services.scraper_service import ScraperService
 from src.services.pgvector_service import VectorStoreService
-from src.models.scrape_model import ScrapeRequest, ScrapeResponse
+from src.models.scrape_model import (
+    CrawlRequest,
+    CrawlResponse,
+    ScrapeRequest,
+    ScrapeResponse,
+)
 from src.logging_config import get_logger
 
 logger = get_logger("scrape_controller")
@@ -22,7 +27,10 @@ class ScrapeController(Controller):
         """
         Realiza scraping de uma URL e armazena o conteúdo no vector store.
 
-        Verifica se a URL já foi processada anteriormente para evitar duplicação.
+        Páginas já processadas são buscadas com requisição condicional (ETag /
+        Last-Modified): uma resposta 304 ou um conteúdo idêntico não gera
+        nenhum embedding; se a página mudou, apenas os chunks alterados são
+        re-vetorizados e os que deixaram de existir são removidos.
         Atualmente otimizado para páginas da Wikipedia.
 
         Args:
@@ -36,23 +44,111 @@ class ScrapeController(Controller):
         target_url = data.url or scraper_service.default_url
         logger.info("Scrape request received | url=%s", target_url)
 
-        if vector_store_service.document_exists(target_url):
-            logger.info("Scrape skipped (already exists) | url=%s", target_url)
+        state = await vector_store_service.page_fetch_state(target_url) or {}
+        page = await scraper_service.fetch_page(
+            target_url, etag=state.get("etag"), last_modified=state.get("last_modified")
+        )
+
+        if page.not_modified or (state and page.page_hash == state.get("page_hash")):
+            await vector_store_service.save_page_fetch_state(
+                target_url, page.etag, page.last_modified, page.page_hash
+            )
+            logger.info("Scrape skipped (not modified) | url=%s", target_url)
             return ScrapeResponse(
                 status="success",
-                message="O scraping deste site já foi realizado anteriormente.",
+                message="A página não mudou desde o último scraping.",
+                chunks_added=0,
+                chunks_removed=0,
                 source=target_url,
             )
 
-        chunks = await scraper_service.scrape_and_chunk(url=target_url)
-        logger.info("Scrape completed | url=%s | chunks=%d", target_url, len(chunks))
-
-        vector_store_service.add_documents(chunks)
-        logger.info("Documents added to vector store | chunks=%d", len(chunks))
+        result = await vector_store_service.replace_source_documents(
+            target_url,
+            page.chunks,
+            etag=page.etag,
+            last_modified=page.last_modified,
+            page_hash=page.page_hash,
+        )
+        logger.info(
+            "Scrape completed | url=%s | chunks=%d | added=%d | removed=%d",
+            target_url,
+            len(page.chunks),
+            result["added"],
+            result["removed"],
+        )
 
         return ScrapeResponse(
             status="success",
             message="Scraping realizado com sucesso!",
-            chunks_added=len(chunks),
+            chunks_added=result["added"],
+            chunks_removed=result["removed"],
             source=target_url,
         )
+
+    @post(path="/crawl")
+    async def handle_crawl(
+        self,
+        data: CrawlRequest,
+        scraper_service: ScraperService,
+        vector_store_service: VectorStoreService,
+    ) -> CrawlResponse:
+        """
+        Faz o crawl de várias URLs (e, opcionalmente, dos links até `depth`) e armazena o conteúdo.
+
+        As páginas são buscadas em paralelo e os chunks de cada uma são
+        enviados ao vector store assim que ela termina. Páginas já presentes
+        na base só têm os chunks alterados re-vetorizados.
+
+        Args:
+            data: URLs iniciais, profundidade e limite de páginas.
+            scraper_service: Serviço de scraping e chunking.
+            vector_store_service: Serviço de armazenamento vetorial.
+
+        Returns:
+            CrawlResponse: Páginas processadas, chunks adicionados e falhas por URL.
+        """
+        logger.info(
+            "Crawl request received | urls=%d | depth=%d", len(data.urls), data.depth
+        )
+
+        pages_crawled = 0
+        pages_skipped = 0
+        chunks_added = 0
+        failed: dict[str, str] = {}
+        async for url, page, error in scraper_service.crawl(
+            data.urls, depth=data.depth, max_pages=data.max_pages
+        ):
+            if error:
+                failed[url] = error
+                continue
+            if not page.chunks:
+                pages_skipped += 1
+                continue
+
+            result = await vector_store_service.replace_source_documents(
+                url,
+                page.chunks,
+                etag=page.etag,
+                last_modified=page.last_modified,
+                page_hash=page.page_hash,
+            )
+            if not result["added"] and not result["removed"]:
+                pages_skipped += 1
+                continue
+            pages_crawled += 1
+            chunks_added += result["added"]
+
+        logger.info(
+            "Crawl request completed | pages=%d | skipped=%d | failed=%d | chunks=%d",
+            pages_crawled,
+            pages_skipped,
+            len(failed),
+            chunks_added,
+        )
+        return CrawlResponse(
+            status="success" if pages_crawled or not failed else "error",
+            pages_crawled=pages_crawled,
+            pages_skipped=pages_skipped,
+            chunks_added=chunks_added,
+            failed=failed,
+        )
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class VectorIndexResponse(BaseModel):
+    status: str
+    index_type: str
+    params: dict[str, int]
+    duration_ms: float
@@ -7,6 +7,6 @@ class UserMessage(BaseModel):
 
 
 class UploadResponse(BaseModel):
+    job_id: str
     filename: str
-    chunks_generated: int
     status: str
@@ -0,0 +1,72 @@
+from pydantic import BaseModel
+
+
+class QueryPlan(BaseModel):
+    name: str
+    uses_index: bool
+    indexes: list[str]
+    node_types: list[str]
+    total_cost: float | None = None
+
+
+class IndexDiagnosticsResponse(BaseModel):
+    source: str | None
+    plans: list[QueryPlan]
+    index_scans: dict[str, int]
+
+
+class SemanticCacheStatsResponse(BaseModel):
+    enabled: bool
+    hits: int
+    misses: int
+    hit_ratio: float
+    entries: int
+
+
+class RetrievalCacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    hit_ratio: float
+    saved_ms: float
+    entries: int
+
+
+class RerankerStatsResponse(BaseModel):
+    enabled: bool
+    model: str | None = None
+    candidates: int | None = None
+    budget_ms: float | None = None
+    reranked: int = 0
+    skipped: int = 0
+    pairs_scored: int = 0
+    avg_rerank_ms: float = 0.0
+    ms_per_pair: float = 0.0
+
+
+class EmbeddingBackendStatsResponse(BaseModel):
+    model: str
+    requested_backend: str
+    backend: str
+    parity_min_cosine: float | None = None
+    parity_threshold: float
+    benchmark: dict[str, dict[str, float]] = {}
+
+
+class OcrStatsResponse(BaseModel):
+    workers: int
+    omp_threads: int
+    images: int
+    tiles: int
+    cache_hits: int
+    ocr_seconds: float
+    images_per_sec: float
+
+
+class IngestionMetricsResponse(BaseModel):
+    embedded_chunks: int
+    embedding_seconds: float
+    insert_seconds: float
+    embedding_chunks_per_sec: float
+    batch_size: int
+    duplicates_skipped: int
+    embedding_cache: dict[str, float]
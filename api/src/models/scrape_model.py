@@ -1,4 +1,9 @@
-from pydantic import BaseModel
+import os
+from pydantic import BaseModel, Field
+
+# Limites aplicados no servidor a cada requisição de crawl.
+CRAWL_MAX_DEPTH = int(os.getenv("SCRAPER_MAX_DEPTH", "2"))
+CRAWL_MAX_PAGES = int(os.getenv("SCRAPER_MAX_PAGES_LIMIT", "500"))
 
 
 class ScrapeRequest(BaseModel):
@@ -9,4 +14,19 @@ class ScrapeResponse(BaseModel):
     status: str
     message: str
     chunks_added: int | None = None
+    chunks_removed: int | None = None
     source: str | None = None
+
+
+class CrawlRequest(BaseModel):
+    urls: list[str] = Field(min_length=1, max_length=CRAWL_MAX_PAGES)
+    depth: int = Field(default=0, ge=0, le=CRAWL_MAX_DEPTH)
+    max_pages: int | None = Field(default=None, ge=1, le=CRAWL_MAX_PAGES)
+
+
+class CrawlResponse(BaseModel):
+    status: str
+    pages_crawled: int
+    pages_skipped: int
+    chunks_added: int
+    failed: dict[str, str]
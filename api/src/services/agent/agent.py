@@ -1,11 +1,14 @@
 from langchain_ollama import ChatOllama
-from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.prebuilt import create_react_agent
 from langchain_core.messages import SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from litestar import Litestar
 import os
 
+from .checkpointer import TieredCheckpointSaver
+from .context import ContextBuilder
 from .prompt import SYSTEM_PROMPT_BASE
-from .tools import search_documents
+from .tools import search_documents, search_documents_batch
 
 
 model = ChatOllama(
@@ -14,38 +17,58 @@ model = ChatOllama(
     base_url=os.getenv("OLLAMA_HOST"),
     reasoning=True,
 )
-checkpointer = InMemorySaver()
+checkpointer = TieredCheckpointSaver()
+context_builder = ContextBuilder()
 
 
-def dynamic_prompt(state, config):
+async def dynamic_prompt(state, config):
     """
     Constrói o prompt do sistema dinamicamente com a lista de arquivos disponíveis.
 
     Injeta a lista de fontes da base de conhecimento no prompt base,
     permitindo que o agente saiba quais documentos estão disponíveis para consulta.
+    O histórico passa pelo ContextBuilder para respeitar o orçamento de tokens.
 
     Args:
         state: Estado atual do agente contendo mensagens.
         config: Configuração com acesso ao vector_store via configurable.
 
     Returns:
-        list: Lista de mensagens começando com SystemMessage seguido das mensagens do usuário.
+        list: Lista de mensagens começando com SystemMessage seguido do histórico (janelado).
     """
     vector_store = config.get("configurable").get("vector_store")
 
-    files = vector_store.list_files()
+    files = await vector_store.list_files()
     files_section = (
         "\n".join(f"- {f}" for f in files) if files else "Nenhuma fonte disponível."
     )
 
-    dynamic_prompt_text = SYSTEM_PROMPT_BASE.format(available_files=files_section)
+    system_message = SystemMessage(
+        content=SYSTEM_PROMPT_BASE.format(available_files=files_section)
+    )
+    messages = context_builder.build(
+        state["messages"],
+        reserved_tokens=count_tokens_approximately([system_message]),
+    )
 
-    return [SystemMessage(content=dynamic_prompt_text)] + state["messages"]
+    return [system_message] + messages
 
 
 agent = create_react_agent(
     model=model,
-    tools=[search_documents],
+    tools=[search_documents, search_documents_batch],
     prompt=dynamic_prompt,
     checkpointer=checkpointer,
 )
+
+
+def init_checkpointer(app: Litestar) -> None:
+    """
+    Conecta o checkpointer do agente ao Postgres no startup.
+
+    Deve rodar após a criação do VectorStoreService, cuja engine é reutilizada.
+
+    Args:
+        app: Aplicação Litestar com o VectorStoreService no state.
+    """
+    checkpointer.bind(app.state.vector_store_service.engine)
@@ -0,0 +1,303 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from src.logging_config import get_logger
+
+logger = get_logger("agent.checkpointer")
+
+
+class CheckpointConflictError(RuntimeError):
+    """Outro worker gravou um checkpoint mais novo da thread antes deste."""
+
+
+class TieredCheckpointSaver(BaseCheckpointSaver):
+    """
+    Checkpointer com camada em memória limitada e persistência no Postgres.
+
+    As threads ativas ficam num InMemorySaver com despejo LRU/TTL
+    (CHECKPOINT_MAX_THREADS, CHECKPOINT_TTL_SECONDS). Cada checkpoint salvo
+    também grava o estado mais recente da thread em `agent_checkpoints`, de onde
+    threads despejadas (ou criadas em outro worker) são recarregadas sob demanda.
+    Ao ler uma thread que já está em memória, o `checkpoint_id` gravado é
+    comparado com o da cópia local; se outro worker avançou a thread, ela é
+    recarregada. A gravação é um compare-and-set sobre o checkpoint pai: se o
+    banco já tem outro checkpoint, a thread sai da memória e o aput falha com
+    CheckpointConflictError em vez de sobrescrever o histórico.
+    A cada CHECKPOINT_COMPACT_EVERY checkpoints a thread é compactada, mantendo
+    apenas o checkpoint mais recente de cada namespace.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.memory = InMemorySaver(serde=self.serde)
+        self.engine: AsyncEngine | None = None
+        self.max_threads = int(os.getenv("CHECKPOINT_MAX_THREADS", "1000"))
+        self.ttl_seconds = float(os.getenv("CHECKPOINT_TTL_SECONDS", "3600"))
+        self.compact_every = int(os.getenv("CHECKPOINT_COMPACT_EVERY", "10"))
+        self._threads: OrderedDict[str, float] = OrderedDict()
+        self._puts_since_compaction: dict[str, int] = {}
+        self._load_locks: dict[str, asyncio.Lock] = {}
+        # checkpoint_id gravado no banco por namespace, das threads em memória.
+        self._persisted_ids: dict[str, dict[str, str | None]] = {}
+
+    def bind(self, engine: AsyncEngine) -> None:
+        """
+        Habilita a persistência no Postgres.
+
+        Args:
+            engine: Engine assíncrona compartilhada com o VectorStoreService.
+        """
+        self.engine = engine
+        logger.info(
+            "Checkpointer bound to Postgres | max_threads=%d | ttl_seconds=%.0f",
+            self.max_threads,
+            self.ttl_seconds,
+        )
+
+    def get_next_version(self, current: Any, channel: None = None) -> Any:
+        return self.memory.get_next_version(current, channel)
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        await self._ensure_loaded(config["configurable"]["thread_id"], verify=True)
+        return self.memory.get_tuple(config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        if config:
+            await self._ensure_loaded(config["configurable"]["thread_id"], verify=True)
+        for checkpoint_tuple in self.memory.list(
+            config, filter=filter, before=before, limit=limit
+        ):
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        await self._ensure_loaded(thread_id)
+
+        next_config = self.memory.put(config, checkpoint, metadata, new_versions)
+        await self._persist(next_config, config["configurable"].get("checkpoint_id"))
+
+        puts = self._puts_since_compaction.get(thread_id, 0) + 1
+        if puts >= self.compact_every:
+            self._compact(thread_id)
+            puts = 0
+        self._puts_since_compaction[thread_id] = puts
+
+        self._evict()
+        return next_config
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.memory.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self._drop_from_memory(thread_id)
+        if self.engine:
+            async with self.engine.begin() as conn:
+                await conn.execute(
+                    text("DELETE FROM agent_checkpoints WHERE thread_id = :thread_id"),
+                    {"thread_id": thread_id},
+                )
+
+    async def _ensure_loaded(self, thread_id: str, verify: bool = False) -> None:
+        if self._touch(thread_id):
+            if not verify or not self.engine:
+                return
+            persisted_ids = await self._fetch_persisted_ids(thread_id)
+            if persisted_ids == self._persisted_ids.get(thread_id, {}):
+                return
+            # Outro worker avançou a thread desde que ela entrou em memória.
+            logger.debug("Stale thread dropped from memory | thread_id=%s", thread_id)
+            self._drop_from_memory(thread_id)
+
+        # Uma única carga por thread; a thread só é registrada depois que o
+        # estado persistido está em memória, senão o próximo aput sobrescreveria
+        # o histórico do banco com um checkpoint vazio.
+        lock = self._load_locks.setdefault(thread_id, asyncio.Lock())
+        async with lock:
+            if self._touch(thread_id):
+                return
+            try:
+                await self._load_thread(thread_id)
+            except Exception:
+                self.memory.delete_thread(thread_id)
+                self._load_locks.pop(thread_id, None)
+                raise
+            self._threads[thread_id] = time.monotonic()
+
+    def _touch(self, thread_id: str) -> bool:
+        if thread_id not in self._threads:
+            return False
+        self._threads[thread_id] = time.monotonic()
+        self._threads.move_to_end(thread_id)
+        return True
+
+    async def _fetch_persisted_ids(self, thread_id: str) -> dict[str, str | None]:
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT checkpoint_ns, checkpoint_id
+                    FROM agent_checkpoints
+                    WHERE thread_id = :thread_id
+                """),
+                {"thread_id": thread_id},
+            )
+            return {row.checkpoint_ns: row.checkpoint_id for row in result.fetchall()}
+
+    async def _load_thread(self, thread_id: str) -> None:
+        if not self.engine:
+            return
+
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT checkpoint_ns, checkpoint_id, checkpoint_type, checkpoint,
+                           metadata_type, metadata
+                    FROM agent_checkpoints
+                    WHERE thread_id = :thread_id
+                """),
+                {"thread_id": thread_id},
+            )
+            rows = result.fetchall()
+
+        for row in rows:
+            checkpoint = self.serde.loads_typed((row.checkpoint_type, row.checkpoint))
+            metadata = self.serde.loads_typed((row.metadata_type, row.metadata))
+            self.memory.put(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": row.checkpoint_ns}},
+                checkpoint,
+                metadata,
+                checkpoint["channel_versions"],
+            )
+        self._persisted_ids[thread_id] = {
+            row.checkpoint_ns: row.checkpoint_id for row in rows
+        }
+        if rows:
+            logger.debug("Thread paged in | thread_id=%s", thread_id)
+
+    async def _persist(self, config: RunnableConfig, parent_id: str | None) -> None:
+        if not self.engine:
+            return
+
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_tuple = self.memory.get_tuple(config)
+        checkpoint_type, checkpoint = self.serde.dumps_typed(checkpoint_tuple.checkpoint)
+        metadata_type, metadata = self.serde.dumps_typed(checkpoint_tuple.metadata)
+
+        # Compare-and-set: só substitui a linha se ela ainda guarda o checkpoint
+        # pai deste (linhas anteriores à coluna checkpoint_id são aceitas).
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                text("""
+                    INSERT INTO agent_checkpoints (
+                        thread_id, checkpoint_ns, checkpoint_id, checkpoint_type,
+                        checkpoint, metadata_type, metadata
+                    )
+                    VALUES (
+                        :thread_id, :checkpoint_ns, :checkpoint_id, :checkpoint_type,
+                        :checkpoint, :metadata_type, :metadata
+                    )
+                    ON CONFLICT (thread_id, checkpoint_ns) DO UPDATE
+                    SET checkpoint_id = EXCLUDED.checkpoint_id,
+                        checkpoint_type = EXCLUDED.checkpoint_type,
+                        checkpoint = EXCLUDED.checkpoint,
+                        metadata_type = EXCLUDED.metadata_type,
+                        metadata = EXCLUDED.metadata,
+                        updated_at = now()
+                    WHERE agent_checkpoints.checkpoint_id IS NULL
+                       OR agent_checkpoints.checkpoint_id = :parent_id
+                """),
+                {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_tuple.checkpoint["id"],
+                    "parent_id": parent_id,
+                    "checkpoint_type": checkpoint_type,
+                    "checkpoint": checkpoint,
+                    "metadata_type": metadata_type,
+                    "metadata": metadata,
+                },
+            )
+
+        if result.rowcount == 0:
+            self._drop_from_memory(thread_id)
+            logger.warning(
+                "Checkpoint conflict, thread dropped from memory | thread_id=%s | "
+                "checkpoint_ns=%s | parent_id=%s",
+                thread_id,
+                checkpoint_ns,
+                parent_id,
+            )
+            raise CheckpointConflictError(
+                f"A thread {thread_id} foi atualizada por outra requisição; tente novamente."
+            )
+        persisted_ids = self._persisted_ids.setdefault(thread_id, {})
+        persisted_ids[checkpoint_ns] = checkpoint_tuple.checkpoint["id"]
+
+    def _compact(self, thread_id: str) -> None:
+        latest: dict[str, CheckpointTuple] = {}
+        for checkpoint_tuple in self.memory.list(
+            {"configurable": {"thread_id": thread_id}}
+        ):
+            checkpoint_ns = checkpoint_tuple.config["configurable"].get("checkpoint_ns", "")
+            latest.setdefault(checkpoint_ns, checkpoint_tuple)
+
+        self.memory.delete_thread(thread_id)
+        for checkpoint_ns, checkpoint_tuple in latest.items():
+            self.memory.put(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}},
+                checkpoint_tuple.checkpoint,
+                checkpoint_tuple.metadata,
+                checkpoint_tuple.checkpoint["channel_versions"],
+            )
+        logger.debug("Thread compacted | thread_id=%s", thread_id)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self._threads:
+            thread_id, last_access = next(iter(self._threads.items()))
+            expired = now - last_access > self.ttl_seconds
+            if len(self._threads) <= self.max_threads and not expired:
+                break
+            self._drop_from_memory(thread_id)
+            logger.debug("Thread evicted from memory | thread_id=%s", thread_id)
+
+    def _drop_from_memory(self, thread_id: str) -> None:
+        self.memory.delete_thread(thread_id)
+        self._threads.pop(thread_id, None)
+        self._puts_since_compaction.pop(thread_id, None)
+        self._load_locks.pop(thread_id, None)
+        self._persisted_ids.pop(thread_id, None)
+
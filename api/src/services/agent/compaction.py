@@ -0,0 +1,144 @@
+import os
+import re
+from typing import Any
+from langchain_core.documents import Document
+from langchain_core.messages.utils import count_tokens_approximately
+from src.logging_config import get_logger
+
+logger = get_logger("agent.compaction")
+
+TRUNCATION_MARKER = "\n[... resultados truncados para caber no orçamento de contexto]"
+MAX_OVERLAP_CHARS = 400
+SOURCE_HEADER_PATTERN = re.compile(r"^--- Documento: (.+?) \| Localização:", re.MULTILINE)
+
+
+class _Section:
+    def __init__(self, text: str, location: str) -> None:
+        self.text = text
+        self.locations = [location]
+
+    def add_location(self, location: str) -> None:
+        if location not in self.locations:
+            self.locations.append(location)
+
+
+class ContextCompactor:
+    """
+    Formata os chunks retornados pelas ferramentas de busca de forma compacta.
+
+    Os chunks são agrupados por fonte; dentro de uma fonte, trechos contidos em
+    outro são descartados e trechos que se sobrepõem (o overlap do splitter)
+    são unidos sem repetir o texto em comum. A saída é limitada a
+    TOOL_OUTPUT_MAX_CHARS caracteres, mantendo seções inteiras sempre que possível.
+    """
+
+    def __init__(self) -> None:
+        self.max_chars = int(os.getenv("TOOL_OUTPUT_MAX_CHARS", "6000"))
+        self.min_overlap = int(os.getenv("TOOL_OUTPUT_MIN_OVERLAP_CHARS", "20"))
+
+    def format(self, docs: list[Document]) -> str:
+        """
+        Monta o bloco de contexto com um cabeçalho por trecho (ou trechos unidos).
+
+        Args:
+            docs: Documentos na ordem de relevância.
+
+        Returns:
+            str: Seções "--- Documento: {fonte} | Localização: {locais} ---" seguidas do conteúdo.
+        """
+        groups: dict[str, list[_Section]] = {}
+        for doc in docs:
+            source = doc.metadata.get("source")
+            location = doc.metadata.get("location") or "Contexto Geral"
+            self._merge(groups.setdefault(source, []), doc.page_content, location)
+
+        sections = [
+            f"--- Documento: {source} | Localização: {', '.join(section.locations)} ---\n"
+            f"{section.text}"
+            for source, source_sections in groups.items()
+            for section in source_sections
+        ]
+        output = self._fit_budget(sections)
+
+        original = "\n\n".join(
+            f"--- Documento: {doc.metadata.get('source')} | "
+            f"Localização: {doc.metadata.get('location') or 'Contexto Geral'} ---\n"
+            f"{doc.page_content}"
+            for doc in docs
+        )
+        if len(output) < len(original):
+            logger.info(
+                "Tool output compacted | chunks=%d | sections=%d | chars=%d->%d | saved_tokens=%d",
+                len(docs),
+                len(sections),
+                len(original),
+                len(output),
+                count_tokens_approximately([original])
+                - count_tokens_approximately([output]),
+            )
+        return output
+
+    def _merge(self, sections: list[_Section], text: str, location: str) -> None:
+        for section in sections:
+            if text in section.text:
+                section.add_location(location)
+                return
+            if section.text in text:
+                section.text = text
+                section.add_location(location)
+                return
+
+            overlap = self._overlap(section.text, text)
+            if overlap:
+                section.text += text[overlap:]
+                section.add_location(location)
+                return
+
+            overlap = self._overlap(text, section.text)
+            if overlap:
+                section.text = text + section.text[overlap:]
+                section.add_location(location)
+                return
+
+        sections.append(_Section(text, location))
+
+    def _overlap(self, left: str, right: str) -> int:
+        longest = min(len(left), len(right), MAX_OVERLAP_CHARS)
+        for size in range(longest, self.min_overlap - 1, -1):
+            if left.endswith(right[:size]):
+                return size
+        return 0
+
+    def _fit_budget(self, sections: list[str]) -> str:
+        kept: list[str] = []
+        used = 0
+        for section in sections:
+            needed = len(section) + (2 if kept else 0)
+            if used + needed > self.max_chars:
+                if not kept:
+                    kept.append(section[: self.max_chars] + TRUNCATION_MARKER)
+                else:
+                    kept.append(TRUNCATION_MARKER.strip())
+                break
+            kept.append(section)
+            used += needed
+        return "\n\n".join(kept)
+
+
+def tool_output_sources(output: Any) -> set[str]:
+    """
+    Extrai as fontes citadas nos cabeçalhos da saída de uma ferramenta de busca.
+
+    Args:
+        output: ToolMessage devolvida pela ferramenta (ou o texto da saída).
+
+    Returns:
+        set[str]: Fontes dos cabeçalhos "--- Documento: {fonte} | Localização: ... ---".
+    """
+    content = getattr(output, "content", output)
+    if isinstance(content, list):
+        content = "\n".join(
+            block if isinstance(block, str) else block.get("text", "")
+            for block in content
+        )
+    return set(SOURCE_HEADER_PATTERN.findall(str(content)))
@@ -0,0 +1,132 @@
+import os
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from src.logging_config import get_logger
+
+logger = get_logger("agent.context")
+
+TRUNCATION_MARKER = "\n[... saída da ferramenta resumida para economizar contexto]"
+
+
+class ContextBuilder:
+    """
+    Monta o histórico enviado ao LLM dentro de um orçamento de tokens.
+
+    Os últimos CONTEXT_KEEP_TURNS turnos (a partir de cada mensagem do usuário)
+    são mantidos na íntegra enquanto couberem. Em turnos anteriores, saídas de
+    ferramentas são truncadas em CONTEXT_OLD_TOOL_OUTPUT_CHARS caracteres e,
+    se o total exceder CONTEXT_MAX_TOKENS, os turnos mais antigos são
+    descartados inteiros. Se nem os turnos mantidos couberem, as saídas de
+    ferramentas deles também são truncadas, depois os mais antigos são
+    descartados e, por fim, as saídas do turno atual são cortadas até caber.
+    """
+
+    def __init__(self) -> None:
+        self.max_tokens = int(os.getenv("CONTEXT_MAX_TOKENS", "6000"))
+        self.keep_turns = int(os.getenv("CONTEXT_KEEP_TURNS", "2"))
+        self.old_tool_output_chars = int(
+            os.getenv("CONTEXT_OLD_TOOL_OUTPUT_CHARS", "300")
+        )
+
+    def build(
+        self, messages: list[BaseMessage], reserved_tokens: int = 0
+    ) -> list[BaseMessage]:
+        """
+        Aplica truncamento e janelamento ao histórico da conversa.
+
+        Args:
+            messages: Mensagens do estado do agente.
+            reserved_tokens: Tokens já ocupados (ex: prompt do sistema).
+
+        Returns:
+            list[BaseMessage]: Histórico que cabe no orçamento configurado.
+        """
+        turns = _split_turns(messages)
+        recent = turns[-self.keep_turns :] if self.keep_turns else []
+        older = [
+            [self._truncate_tool_output(message) for message in turn]
+            for turn in turns[: len(turns) - len(recent)]
+        ]
+
+        budget = self.max_tokens - reserved_tokens
+        kept = older + recent
+        tokens = [count_tokens_approximately(turn) for turn in kept]
+
+        while len(kept) > len(recent) and sum(tokens) > budget:
+            kept.pop(0)
+            tokens.pop(0)
+
+        if sum(tokens) > budget:
+            kept = [[self._truncate_tool_output(message) for message in turn] for turn in kept]
+            tokens = [count_tokens_approximately(turn) for turn in kept]
+
+        while len(kept) > 1 and sum(tokens) > budget:
+            kept.pop(0)
+            tokens.pop(0)
+
+        if kept and sum(tokens) > budget:
+            kept[-1] = self._shrink_tool_outputs(kept[-1], budget)
+            tokens[-1] = count_tokens_approximately(kept[-1])
+
+        context = [message for turn in kept for message in turn]
+
+        original_tokens = count_tokens_approximately(messages)
+        final_tokens = sum(tokens)
+        if final_tokens < original_tokens:
+            logger.info(
+                "Context trimmed | turns=%d->%d | tokens=%d->%d | saved=%d",
+                len(turns),
+                len(kept),
+                original_tokens,
+                final_tokens,
+                original_tokens - final_tokens,
+            )
+        if final_tokens > budget:
+            logger.warning(
+                "Context exceeds budget without tool outputs | tokens=%d | budget=%d",
+                final_tokens,
+                budget,
+            )
+        return context
+
+    def _truncate_tool_output(self, message: BaseMessage) -> BaseMessage:
+        if not isinstance(message, ToolMessage):
+            return message
+
+        content = str(message.content)
+        if len(content) <= self.old_tool_output_chars:
+            return message
+
+        return message.model_copy(
+            update={"content": content[: self.old_tool_output_chars] + TRUNCATION_MARKER}
+        )
+
+    def _shrink_tool_outputs(
+        self, turn: list[BaseMessage], budget: int
+    ) -> list[BaseMessage]:
+        # Corta as saídas de ferramentas do turno (a partir da primeira) até o
+        # turno caber; as mensagens continuam lá para manter o par tool_call/ToolMessage.
+        turn = list(turn)
+        for index, message in enumerate(turn):
+            excess = count_tokens_approximately(turn) - budget
+            if excess <= 0:
+                break
+            if not isinstance(message, ToolMessage):
+                continue
+
+            content = str(message.content)
+            keep = max(0, len(content) - excess * 4 - len(TRUNCATION_MARKER))
+            turn[index] = message.model_copy(
+                update={"content": content[:keep] + TRUNCATION_MARKER}
+            )
+        return turn
+
+
+def _split_turns(messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+    turns: list[list[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
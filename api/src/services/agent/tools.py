@@ -1,17 +1,34 @@
 from typing import TYPE_CHECKING
 from langchain.tools import tool
+from langchain_core.documents import Document
 from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel
 from src.logging_config import get_logger
+from .compaction import ContextCompactor
 
 if TYPE_CHECKING:
     from src.services.pgvector_service import VectorStoreService
 
 logger = get_logger("agent.tools")
+compactor = ContextCompactor()
+
+
+class SearchQuery(BaseModel):
+    """Uma busca do `search_documents_batch`."""
+
+    query: str
+    file_name: str | None = None
+    sheet: str | None = None
 
 
 @tool
-def search_documents(
-    query: str, k: int, config: RunnableConfig, file_name: str | None = None
+async def search_documents(
+    query: str,
+    k: int,
+    config: RunnableConfig,
+    file_name: str | None = None,
+    mode: str = "vector",
+    sheet: str | None = None,
 ) -> str:
     """
     Busca informações relevantes na base de conhecimento do usuário (RAG).
@@ -25,6 +42,10 @@ def search_documents(
     - k (int): O número de trechos (chunks) a serem recuperados.
                Recomendado: 4 a 6.
     - file_name (str | None): Opcional. Nome da fonte para restringir a busca.
+    - mode (str): "vector" (padrão, busca semântica) ou "hybrid" (semântica + texto exato).
+                  Use "hybrid" para identificadores exatos: CNPJs, números de contrato, códigos, valores.
+    - sheet (str | None): Opcional. Nome da aba de uma planilha Excel para restringir a busca.
+                  Use junto com `file_name`.
 
     **Retorno:**
     - str: Uma string contendo os trechos encontrados, formatados com metadados:
@@ -37,15 +58,21 @@ def search_documents(
         -> `search_documents("lucro líquido 2023", k=4)`
     - **Busca Filtrada:** O usuário quer buscar em uma fonte específica.
         -> `search_documents("cláusulas rescisão", k=4, file_name="contrato.pdf")`
+    - **Busca por Identificador:** O usuário cita um código ou número exato.
+        -> `search_documents("CNPJ 12.345.678/0001-90", k=4, mode="hybrid")`
+    - **Busca em uma Aba:** O usuário cita uma aba de uma planilha.
+        -> `search_documents("receita por trimestre", k=4, file_name="balanco.xlsx", sheet="DRE")`
 
     **Notas Importantes:**
     - O conteúdo retornado é o "contexto" que você deve usar para formular sua resposta ao usuário.
     """
     logger.debug(
-        "search_documents called | query=%s | k=%d | file_name=%s",
+        "search_documents called | query=%s | k=%d | file_name=%s | sheet=%s | mode=%s",
         query[:50],
         k,
         file_name,
+        sheet,
+        mode,
     )
 
     try:
@@ -54,8 +81,8 @@ def search_documents(
             logger.error("VectorStoreService not available in config")
             return "Serviço de busca indisponível."
 
-        if file_name and not vector_store.document_exists(file_name):
-            available_files = vector_store.list_files()
+        if file_name and not await vector_store.document_exists(file_name):
+            available_files = await vector_store.list_files()
             files_list = (
                 ", ".join(available_files)
                 if available_files
@@ -70,7 +97,9 @@ def search_documents(
                 f"Fontes disponíveis: {files_list}"
             )
 
-        docs = vector_store.search(query, k=k, filter_by_file=file_name)
+        docs = await vector_store.search(
+            query, k=k, filter_by_file=file_name, mode=mode, filter_by_sheet=sheet
+        )
 
         if not docs:
             logger.info("No documents found | query=%s | file_name=%s", query[:50], file_name)
@@ -80,20 +109,107 @@ def search_documents(
             "Documents found | query=%s | results=%d", query[:50], len(docs)
         )
 
-        results = []
-        for doc in docs:
-            source = doc.metadata.get("source")
-            page = doc.metadata.get("location")
+        return compactor.format(docs)
+
+    except Exception as e:
+        logger.error("search_documents failed | query=%s | error=%s", query[:50], str(e))
+        return f"Erro ao buscar documentos: {str(e)}"
 
-            location = f"{page}" if page else "Contexto Geral"
 
-            results.append(
-                f"--- Documento: {source} | Localização: {location} ---\n{doc.page_content}"
-            )
+@tool
+async def search_documents_batch(
+    queries: list[SearchQuery],
+    k: int,
+    config: RunnableConfig,
+    mode: str = "vector",
+) -> str:
+    """
+    Executa várias buscas na base de conhecimento numa única chamada.
+
+    **Propósito Principal:**
+    Evita chamar `search_documents` repetidamente quando a pergunta envolve
+    mais de um tema ou mais de uma fonte (comparações, perguntas compostas).
+    Os trechos repetidos entre as buscas aparecem uma única vez.
+
+    **Argumentos:**
+    - queries (list[SearchQuery]): Buscas a executar. Cada item tem `query` e,
+                  opcionalmente, `file_name` (e `sheet`, para planilhas) para
+                  restringir aquela busca a uma fonte.
+    - k (int): O número de trechos por busca. Recomendado: 3 a 4.
+    - mode (str): "vector" (padrão) ou "hybrid" (semântica + texto exato).
 
-        return "\n\n".join(results)
+    **Retorno:**
+    - str: Um único bloco com os trechos encontrados, no mesmo formato de `search_documents`.
+
+    **Cenários de Uso:**
+    - **Comparação entre fontes:**
+        -> `search_documents_batch([{"query": "receita 2023", "file_name": "relatorio_2023.pdf"}, {"query": "receita 2024", "file_name": "relatorio_2024.pdf"}], k=3)`
+    - **Pergunta com vários temas:**
+        -> `search_documents_batch([{"query": "prazo de entrega"}, {"query": "multa por atraso"}], k=4)`
+    """
+    logger.debug(
+        "search_documents_batch called | queries=%d | k=%d | mode=%s",
+        len(queries),
+        k,
+        mode,
+    )
+
+    try:
+        vector_store: "VectorStoreService" = config["configurable"].get("vector_store")
+        if not vector_store:
+            logger.error("VectorStoreService not available in config")
+            return "Serviço de busca indisponível."
+
+        queries = [
+            SearchQuery.model_validate(item) if isinstance(item, dict) else item
+            for item in queries
+        ]
+        valid: list[SearchQuery] = []
+        missing: list[str] = []
+        for item in queries:
+            if item.file_name and not await vector_store.document_exists(item.file_name):
+                missing.append(item.file_name)
+            else:
+                valid.append(item)
+
+        results = await vector_store.search_many(
+            [(item.query, item.file_name, item.sheet) for item in valid],
+            k=k,
+            mode=mode,
+        )
+
+        docs: list[Document] = []
+        seen: set[str] = set()
+        for result in results:
+            for doc in result:
+                if doc.id not in seen:
+                    seen.add(doc.id)
+                    docs.append(doc)
+
+        total = sum(len(result) for result in results)
+        logger.info(
+            "Batched documents found | queries=%d | results=%d | duplicates=%d | missing_sources=%d",
+            len(valid),
+            len(docs),
+            total - len(docs),
+            len(missing),
+        )
+
+        sections = []
+        if missing:
+            available_files = await vector_store.list_files()
+            sections.append(
+                f"❌ Fontes não encontradas: {', '.join(sorted(set(missing)))}. "
+                f"Fontes disponíveis: {', '.join(available_files) or 'nenhuma fonte disponível'}"
+            )
+        sections.append(
+            compactor.format(docs)
+            if docs
+            else "Nenhuma informação relevante encontrada nos documentos."
+        )
+        return "\n\n".join(sections)
 
     except Exception as e:
-        logger.error("search_documents failed | query=%s | error=%s", query[:50], str(e))
+        logger.error("search_documents_batch failed | error=%s", str(e))
         return f"Erro ao buscar documentos: {str(e)}"
 
@@ -1,7 +1,10 @@
 from typing import TYPE_CHECKING
 import json
+from langchain_core.messages import AIMessage, HumanMessage
 from src.models.chat_model import UserMessage
 from src.services.agent.agent import agent
+from src.services.agent.compaction import tool_output_sources
+from src.services.semantic_cache import SemanticAnswerCache
 from src.logging_config import get_logger
 
 if TYPE_CHECKING:
@@ -9,10 +12,15 @@ if TYPE_CHECKING:
 
 logger = get_logger("chat_service")
 
+REPLAYABLE_EVENTS = {"content", "tool_call", "tool_response"}
+
 
 class ChatService:
     """Serviço de processamento de mensagens do chat com agente IA."""
 
+    def __init__(self, semantic_cache: SemanticAnswerCache) -> None:
+        self.semantic_cache = semantic_cache
+
     async def process_message(
         self, data: UserMessage, vector_store_service: "VectorStoreService"
     ):
@@ -20,7 +28,9 @@ class ChatService:
         Processa mensagem do usuário e gera resposta via streaming.
 
         Utiliza o agente ReAct para processar a mensagem, executar ferramentas
-        quando necessário e retornar a resposta em chunks via SSE.
+        quando necessário e retornar a resposta em chunks via SSE. Com o cache
+        semântico habilitado, a primeira pergunta de uma thread equivalente a
+        uma já respondida reproduz a resposta armazenada sem executar o agente.
 
         Args:
             data: Mensagem do usuário com content e thread_id.
@@ -29,6 +39,77 @@ class ChatService:
         Yields:
             str: Chunks JSON com tipos: 'thinking', 'content', 'tool_call', 'tool_response', 'error'.
         """
+        if not self.semantic_cache.enabled or not await self._is_first_turn(data):
+            async for chunk in self._stream_agent(data, vector_store_service):
+                yield chunk
+            return
+
+        await vector_store_service.catalog.refresh_if_stale()
+        embedding = await self.semantic_cache.embed(data.content)
+        cached = self.semantic_cache.lookup(embedding)
+        if cached:
+            for chunk in cached.events:
+                yield chunk
+            await self._append_to_thread(data, cached.answer, vector_store_service)
+            return
+
+        version = vector_store_service.catalog.version
+        events, answer_parts, sources = [], [], set()
+        failed = False
+        async for chunk in self._stream_agent(data, vector_store_service, sources):
+            event = json.loads(chunk)
+            if event["type"] in REPLAYABLE_EVENTS:
+                events.append(chunk)
+            if event["type"] == "content":
+                answer_parts.append(event["text"])
+            elif event["type"] == "error":
+                failed = True
+            yield chunk
+
+        if not failed and answer_parts:
+            self.semantic_cache.store(
+                data.content, embedding, events, "".join(answer_parts), sources, version
+            )
+
+    async def _is_first_turn(self, data: UserMessage) -> bool:
+        state = await agent.aget_state({"configurable": {"thread_id": data.thread_id}})
+        return not state.values.get("messages")
+
+    async def _append_to_thread(
+        self,
+        data: UserMessage,
+        answer: str,
+        vector_store_service: "VectorStoreService",
+    ) -> None:
+        try:
+            await agent.aupdate_state(
+                {
+                    "configurable": {
+                        "thread_id": data.thread_id,
+                        "vector_store": vector_store_service,
+                    }
+                },
+                {
+                    "messages": [
+                        HumanMessage(content=data.content),
+                        AIMessage(content=answer),
+                    ]
+                },
+                as_node="agent",
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to append cached answer to thread | thread_id=%s | error=%s",
+                data.thread_id,
+                str(e),
+            )
+
+    async def _stream_agent(
+        self,
+        data: UserMessage,
+        vector_store_service: "VectorStoreService",
+        sources: set[str] | None = None,
+    ):
         logger.debug("Agent stream started | thread_id=%s", data.thread_id)
 
         try:
@@ -90,6 +171,8 @@ class ChatService:
                 elif kind == "on_tool_end":
                     tool_name = event["name"]
                     tool_output = event["data"].get("output", "")
+                    if sources is not None:
+                        sources.update(tool_output_sources(tool_output))
                     logger.debug(
                         "Tool response | thread_id=%s | tool=%s | output_length=%d",
                         data.thread_id,
@@ -0,0 +1,135 @@
+import os
+import re
+import sys
+from functools import cache
+from langchain_core.documents import Document
+from langchain_text_splitters import (
+    MarkdownHeaderTextSplitter,
+    RecursiveCharacterTextSplitter,
+)
+from transformers import AutoTokenizer
+from src.logging_config import get_logger
+
+logger = get_logger("chunking")
+
+HEADING_PATTERN = re.compile(r"^#{1,4} \S", re.MULTILINE)
+HEADERS_TO_SPLIT_ON = [("#", "h1"), ("##", "h2"), ("###", "h3"), ("####", "h4")]
+
+
+class ChunkingEngine:
+    """
+    Divide documentos em chunks medidos em tokens do modelo de embeddings.
+
+    Textos com títulos Markdown (saída do MarkItDown, páginas web) são
+    primeiro separados por seção, e o caminho de títulos vai para o metadado
+    `section`. Cada chunk tem no máximo CHUNK_MAX_TOKENS tokens contando os
+    tokens especiais (o `max_seq_length` do modelo), então nenhum chunk é
+    truncado em silêncio na vetorização. A contagem de tokens de cada chunk
+    fica no metadado `token_count`.
+    """
+
+    def __init__(self) -> None:
+        model_name = os.getenv("HUGGINGFACE_MODEL_NAME")
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        # Só contamos tokens; evita o aviso de sequência maior que o modelo.
+        self.tokenizer.model_max_length = sys.maxsize
+        self.max_tokens = int(os.getenv("CHUNK_MAX_TOKENS", "128"))
+        self.overlap_tokens = int(os.getenv("CHUNK_OVERLAP_TOKENS", "16"))
+        self.content_tokens = self.max_tokens - self.tokenizer.num_special_tokens_to_add()
+        self.max_chars = self.content_tokens * 4
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.content_tokens,
+            chunk_overlap=self.overlap_tokens,
+            length_function=self.count_tokens,
+            separators=["\n\n", "\n", ". ", " ", ""],
+        )
+        self.header_splitter = MarkdownHeaderTextSplitter(
+            HEADERS_TO_SPLIT_ON, strip_headers=False
+        )
+        logger.info(
+            "Chunking engine ready | model=%s | max_tokens=%d | overlap_tokens=%d",
+            model_name,
+            self.max_tokens,
+            self.overlap_tokens,
+        )
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Conta os tokens de um texto (sem tokens especiais).
+
+        Args:
+            text: Texto a ser medido.
+
+        Returns:
+            int: Número de tokens.
+        """
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
+    def split_documents(self, documents: list[Document]) -> list[Document]:
+        """
+        Divide documentos em chunks que cabem na janela do modelo de embeddings.
+
+        Args:
+            documents: Documentos extraídos (páginas, linhas, documentos completos).
+
+        Returns:
+            list[Document]: Chunks com `token_count` (e `section`, quando há títulos) no metadado.
+        """
+        sections: list[Document] = []
+        for doc in documents:
+            if HEADING_PATTERN.search(doc.page_content):
+                sections.extend(self._split_headings(doc))
+            else:
+                sections.append(doc)
+
+        counts = self._count_batch([doc.page_content for doc in sections])
+        chunks: list[Document] = []
+        for doc, count in zip(sections, counts):
+            if count <= self.content_tokens:
+                chunks.append(
+                    Document(
+                        page_content=doc.page_content,
+                        metadata={**doc.metadata, "token_count": count},
+                    )
+                )
+                continue
+
+            for chunk in self.text_splitter.split_documents([doc]):
+                chunk.metadata["token_count"] = self.count_tokens(chunk.page_content)
+                chunks.append(chunk)
+
+        return chunks
+
+    def _split_headings(self, doc: Document) -> list[Document]:
+        sections = []
+        for section in self.header_splitter.split_text(doc.page_content):
+            metadata = dict(doc.metadata)
+            headings = [
+                section.metadata[key]
+                for _, key in HEADERS_TO_SPLIT_ON
+                if key in section.metadata
+            ]
+            if headings:
+                path = " > ".join(headings)
+                metadata["section"] = path
+                location = doc.metadata.get("location")
+                metadata["location"] = f"{location} - {path}" if location else path
+            sections.append(Document(page_content=section.page_content, metadata=metadata))
+        return sections
+
+    def _count_batch(self, texts: list[str]) -> list[int]:
+        if not texts:
+            return []
+        encoded = self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+
+@cache
+def get_chunking_engine() -> ChunkingEngine:
+    """
+    Retorna o ChunkingEngine do processo, criando-o (e carregando o tokenizer) na primeira chamada.
+
+    Returns:
+        ChunkingEngine: Instância compartilhada pelos serviços do processo.
+    """
+    return ChunkingEngine()
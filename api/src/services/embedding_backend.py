@@ -0,0 +1,173 @@
+import os
+import statistics
+import time
+import numpy as np
+import torch
+from langchain_huggingface import HuggingFaceEmbeddings
+from src.logging_config import get_logger
+
+logger = get_logger("embedding_backend")
+
+EMBEDDING_BACKENDS = {"torch", "onnx", "int8"}
+
+PARITY_SAMPLES = [
+    "Qual é o prazo de entrega previsto no contrato?",
+    "Relatório financeiro do terceiro trimestre com receita e despesas por região.",
+    "A fotossíntese converte energia luminosa em energia química nas plantas.",
+    "linha 42: produto=Notebook, quantidade=3, valor_unitario=4599.90",
+    "How do I reset my account password?",
+    "The committee approved the budget after a long discussion about priorities.",
+    "Em 1822, Dom Pedro I proclamou a independência do Brasil.",
+    "Error 504: the upstream server did not respond in time.",
+]
+BENCHMARK_ROUNDS = 5
+
+
+class EmbeddingBackend:
+    """
+    Carrega o modelo de embeddings no backend escolhido por EMBEDDING_BACKEND.
+
+    - `torch`: sentence-transformers em PyTorch (padrão).
+    - `onnx`: o mesmo modelo exportado e executado pelo ONNX Runtime
+      (requer o extra `onnx` do projeto, instalado na imagem Docker).
+    - `int8`: PyTorch com quantização dinâmica int8 das camadas lineares.
+
+    Para backends diferentes de `torch`, o startup compara os vetores com os do
+    PyTorch (EMBEDDING_PARITY_CHECK) e mede a latência de query e o throughput
+    dos dois. Se o backend não carregar ou a menor similaridade de cosseno
+    ficar abaixo de EMBEDDING_PARITY_MIN_COSINE, o PyTorch é usado.
+    """
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+        self.requested = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+        if self.requested not in EMBEDDING_BACKENDS:
+            raise ValueError(
+                f"EMBEDDING_BACKEND inválido: {self.requested}. "
+                f"Use um de: {', '.join(sorted(EMBEDDING_BACKENDS))}"
+            )
+        self.parity_check = os.getenv("EMBEDDING_PARITY_CHECK", "true").lower() == "true"
+        self.min_cosine = float(os.getenv("EMBEDDING_PARITY_MIN_COSINE", "0.99"))
+        self.backend = "torch"
+        self.parity_cosine: float | None = None
+        self.benchmark: dict[str, dict[str, float]] = {}
+        self.embeddings = self._select()
+
+    @property
+    def namespace(self) -> str:
+        """Namespace do cache de embeddings; backends não-PyTorch não reaproveitam vetores do PyTorch."""
+        if self.backend == "torch":
+            return self.model_name
+        return f"{self.model_name}@{self.backend}"
+
+    def stats(self) -> dict[str, object]:
+        """
+        Retorna o backend em uso e o resultado da checagem de paridade e do benchmark.
+
+        Returns:
+            dict[str, object]: Backend pedido/em uso, menor cosseno e latências por backend.
+        """
+        return {
+            "model": self.model_name,
+            "requested_backend": self.requested,
+            "backend": self.backend,
+            "parity_min_cosine": self.parity_cosine,
+            "parity_threshold": self.min_cosine,
+            "benchmark": self.benchmark,
+        }
+
+    def _select(self) -> HuggingFaceEmbeddings:
+        if self.requested == "torch":
+            return _load_embeddings(self.model_name, "torch")
+
+        try:
+            candidate = _load_embeddings(self.model_name, self.requested)
+        except Exception as e:
+            logger.error(
+                "Embedding backend failed to load, using torch | backend=%s | error=%s",
+                self.requested,
+                str(e),
+            )
+            return _load_embeddings(self.model_name, "torch")
+
+        if not self.parity_check:
+            self.backend = self.requested
+            logger.info("Embedding backend selected | backend=%s | parity_check=off", self.backend)
+            return candidate
+
+        reference = _load_embeddings(self.model_name, "torch")
+        self.parity_cosine = _min_cosine(
+            reference.embed_documents(PARITY_SAMPLES),
+            candidate.embed_documents(PARITY_SAMPLES),
+        )
+        self.benchmark = {
+            "torch": _benchmark(reference),
+            self.requested: _benchmark(candidate),
+        }
+        logger.info(
+            "Embedding parity check | backend=%s | min_cosine=%.5f | threshold=%.4f | "
+            "query_ms=%.2f->%.2f | docs_per_sec=%.1f->%.1f",
+            self.requested,
+            self.parity_cosine,
+            self.min_cosine,
+            self.benchmark["torch"]["query_ms"],
+            self.benchmark[self.requested]["query_ms"],
+            self.benchmark["torch"]["docs_per_sec"],
+            self.benchmark[self.requested]["docs_per_sec"],
+        )
+
+        if self.parity_cosine < self.min_cosine:
+            logger.error(
+                "Embedding backend below parity threshold, using torch | backend=%s | "
+                "min_cosine=%.5f | threshold=%.4f",
+                self.requested,
+                self.parity_cosine,
+                self.min_cosine,
+            )
+            return reference
+
+        self.backend = self.requested
+        return candidate
+
+
+def _load_embeddings(model_name: str, backend: str) -> HuggingFaceEmbeddings:
+    if backend == "onnx":
+        return HuggingFaceEmbeddings(
+            model_name=model_name, model_kwargs={"backend": "onnx"}
+        )
+
+    embeddings = HuggingFaceEmbeddings(model_name=model_name)
+    if backend == "int8":
+        torch.ao.quantization.quantize_dynamic(
+            embeddings._client, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+    return embeddings
+
+
+def _min_cosine(reference: list[list[float]], candidate: list[list[float]]) -> float:
+    a = np.asarray(reference, dtype=np.float32)
+    b = np.asarray(candidate, dtype=np.float32)
+    cosines = (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    return float(cosines.min())
+
+
+def _benchmark(embeddings: HuggingFaceEmbeddings) -> dict[str, float]:
+    embeddings.embed_query("warmup")
+
+    latencies = []
+    for _ in range(BENCHMARK_ROUNDS):
+        for sample in PARITY_SAMPLES:
+            started_at = time.perf_counter()
+            embeddings.embed_query(sample)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+    batch = PARITY_SAMPLES * 8
+    started_at = time.perf_counter()
+    embeddings.embed_documents(batch)
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "query_ms": round(statistics.median(latencies), 2),
+        "query_p95_ms": round(statistics.quantiles(latencies, n=20)[-1], 2),
+        "docs_per_sec": round(len(batch) / elapsed, 1),
+    }
@@ -0,0 +1,229 @@
+import hashlib
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterator
+from langchain_core.embeddings import Embeddings
+from src.logging_config import get_logger
+
+logger = get_logger("embedding_cache")
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wrapper de Embeddings com cache endereçado por conteúdo.
+
+    A chave é o SHA-256 de `namespace` (nome do modelo) + texto. O primeiro
+    nível é um LRU em memória; o segundo, opcional, grava os vetores dos
+    documentos em disco para sobreviver a reinícios, limitado a
+    `disk_max_entries` arquivos (os menos usados, pelo mtime, são removidos).
+    Embeddings de queries ficam só em memória. Só os textos ausentes nos dois
+    níveis são enviados ao modelo.
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        namespace: str,
+        max_size: int = 10_000,
+        cache_dir: str | None = None,
+        disk_max_entries: int = 200_000,
+    ) -> None:
+        self.underlying = underlying
+        self.namespace = namespace
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        self.disk_max_entries = disk_max_entries
+        self.disk_evictions = 0
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._disk_entries = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_entries = sum(1 for _ in self._disk_files())
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """
+        Retorna os embeddings dos textos, calculando apenas os que não estão em cache.
+
+        Args:
+            texts: Textos a serem vetorizados.
+
+        Returns:
+            list[list[float]]: Um vetor por texto, na mesma ordem.
+        """
+        keys = [self.key(text) for text in texts]
+        vectors: list[list[float] | None] = [self._get(key) for key in keys]
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = self.underlying.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+                self._put(keys[i], vector)
+
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        """
+        Retorna o embedding da query, usando o mesmo cache dos documentos.
+
+        Args:
+            text: Texto da query.
+
+        Returns:
+            list[float]: Vetor da query.
+        """
+        key = self.key(text)
+        vector = self._get(key)
+        if vector is None:
+            vector = self.underlying.embed_query(text)
+            self._put(key, vector, persist=False)
+        return vector
+
+    def key(self, text: str) -> str:
+        """
+        Calcula a chave de cache de um texto.
+
+        Args:
+            text: Texto a ser vetorizado.
+
+        Returns:
+            str: SHA-256 hexadecimal de namespace + texto.
+        """
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def stats(self) -> dict[str, float]:
+        """
+        Retorna contadores de acerto do cache.
+
+        Returns:
+            dict[str, float]: Hits por nível, misses, hit ratio e tamanho do LRU.
+        """
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((lookups - self.misses) / lookups, 3) if lookups else 0.0,
+            "memory_size": len(self._memory),
+            "disk_size": self._disk_entries,
+            "disk_evictions": self.disk_evictions,
+        }
+
+    def _get(self, key: str) -> list[float] | None:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+
+        vector = self._read_disk(key)
+        with self._lock:
+            if vector is not None:
+                self.disk_hits += 1
+                self._remember(key, vector)
+            else:
+                self.misses += 1
+        return vector
+
+    def _put(self, key: str, vector: list[float], persist: bool = True) -> None:
+        with self._lock:
+            self._remember(key, vector)
+        if persist:
+            self._write_disk(key, vector)
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _read_disk(self, key: str) -> list[float] | None:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                vector = array("f", f.read()).tolist()
+            # O mtime marca o último uso, usado na remoção dos menos usados.
+            os.utime(path)
+            return vector
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Embedding cache read failed | key=%s | error=%s", key, str(e))
+            return None
+
+    def _write_disk(self, key: str, vector: list[float]) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            is_new = not os.path.exists(path)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(array("f", vector).tobytes())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Embedding cache write failed | key=%s | error=%s", key, str(e))
+            return
+
+        if is_new:
+            with self._lock:
+                self._disk_entries += 1
+                over_limit = self._disk_entries > self.disk_max_entries
+            if over_limit:
+                self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        # Remove os arquivos menos usados até 90% do limite, para não varrer o
+        # diretório a cada escrita.
+        if not self._evict_lock.acquire(blocking=False):
+            return
+        try:
+            files = []
+            for path in self._disk_files():
+                try:
+                    files.append((os.stat(path).st_mtime, path))
+                except FileNotFoundError:
+                    continue
+            files.sort()
+            excess = len(files) - int(self.disk_max_entries * 0.9)
+            removed = 0
+            for _, path in files[: max(excess, 0)]:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    continue
+            with self._lock:
+                self._disk_entries = len(files) - removed
+                self.disk_evictions += removed
+            logger.info(
+                "Embedding disk cache evicted | removed=%d | size=%d",
+                removed,
+                self._disk_entries,
+            )
+        except OSError as e:
+            logger.warning("Embedding disk cache eviction failed | error=%s", str(e))
+        finally:
+            self._evict_lock.release()
+
+    def _disk_files(self) -> Iterator[str]:
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_dir():
+                continue
+            for file_entry in os.scandir(entry.path):
+                if file_entry.is_file() and not file_entry.name.endswith(".tmp"):
+                    yield file_entry.path
@@ -0,0 +1,421 @@
+import asyncio
+import json
+import os
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from anyio import to_thread
+from litestar import Litestar
+from litestar.datastructures import State, UploadFile
+from sqlalchemy import text
+from src.logging_config import get_logger
+from src.services.ingestion_service import IngestionService
+from src.services.pgvector_service import VectorStoreService
+
+logger = get_logger("ingestion_jobs")
+
+TERMINAL_EVENTS = {"completed", "failed"}
+
+
+class SpooledFile:
+    """Arquivo de upload gravado em disco, lido pelo job de ingestão."""
+
+    def __init__(self, filename: str, path: str) -> None:
+        self.filename = filename
+        self.path = path
+
+    async def read(self) -> bytes:
+        return await to_thread.run_sync(self._read)
+
+    def _read(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+class IngestionJob:
+    """Estado e eventos de progresso de um job de ingestão."""
+
+    def __init__(self, job_id: str, files: list[SpooledFile]) -> None:
+        self.job_id = job_id
+        self.files = files
+        self.status = "queued"
+        self.chunks_generated = 0
+        self.error: str | None = None
+        self.events: list[dict] = []
+        self.changed = asyncio.Condition()
+
+    @property
+    def filenames(self) -> list[str]:
+        return [f.filename for f in self.files]
+
+    async def publish(self, event: dict) -> None:
+        async with self.changed:
+            self.events.append(event)
+            self.changed.notify_all()
+
+
+class IngestionJobManager:
+    """
+    Fila de jobs de ingestão processados em background.
+
+    O upload é gravado em disco e enfileirado; um número limitado de workers
+    (INGESTION_JOB_WORKERS) extrai, vetoriza e armazena os arquivos, publicando
+    eventos de progresso. Com INGESTION_JOBS_DURABLE=true o estado dos jobs é
+    persistido no Postgres e jobs pendentes são retomados no startup.
+    """
+
+    def __init__(
+        self,
+        ingestion_service: IngestionService,
+        vector_store_service: VectorStoreService,
+    ) -> None:
+        self.ingestion_service = ingestion_service
+        self.vector_store_service = vector_store_service
+        self.worker_count = int(os.getenv("INGESTION_JOB_WORKERS", "2"))
+        self.queue: asyncio.Queue[IngestionJob] = asyncio.Queue(
+            maxsize=int(os.getenv("INGESTION_QUEUE_SIZE", "100"))
+        )
+        self.spool_dir = os.getenv("INGESTION_SPOOL_DIR", ".cache/uploads")
+        self.durable = os.getenv("INGESTION_JOBS_DURABLE", "false").lower() == "true"
+        self.history_size = int(os.getenv("INGESTION_JOBS_HISTORY", "200"))
+        self.jobs: OrderedDict[str, IngestionJob] = OrderedDict()
+        self._workers: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Inicia os workers e, no modo durável, reenfileira jobs pendentes."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        if self.durable:
+            await self._recover_jobs()
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.worker_count)
+        ]
+        logger.info(
+            "Ingestion job workers started | workers=%d | durable=%s",
+            self.worker_count,
+            self.durable,
+        )
+
+    async def close(self) -> None:
+        """Cancela os workers; no modo durável os jobs em andamento são retomados no próximo startup."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        logger.info("Ingestion job workers stopped")
+
+    async def submit(self, files_data: list[UploadFile]) -> IngestionJob:
+        """
+        Grava os arquivos em disco e enfileira um novo job.
+
+        Args:
+            files_data: Arquivos recebidos no upload.
+
+        Returns:
+            IngestionJob: Job criado, com status 'queued'.
+
+        Raises:
+            ValueError: Se algum formato não é suportado.
+            asyncio.QueueFull: Se a fila de ingestão está cheia.
+        """
+        self.ingestion_service.validate([f.filename for f in files_data])
+        if self.queue.full():
+            raise asyncio.QueueFull
+
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.spool_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+
+        files = []
+        for i, file_data in enumerate(files_data):
+            path = os.path.join(job_dir, f"{i}_{os.path.basename(file_data.filename)}")
+            content = await file_data.read()
+            await to_thread.run_sync(_write_file, path, content)
+            files.append(SpooledFile(file_data.filename, path))
+
+        job = IngestionJob(job_id, files)
+        self._remember(job)
+        await self._persist(job)
+        await job.publish({"type": "queued", "job_id": job_id, "files": job.filenames})
+        self.queue.put_nowait(job)
+        logger.info("Ingestion job queued | job_id=%s | files=%d", job_id, len(files))
+        return job
+
+    async def get_job_status(self, job_id: str) -> dict | None:
+        """
+        Retorna o status de um job, consultando o Postgres se ele não está em memória.
+
+        Args:
+            job_id: Identificador do job.
+
+        Returns:
+            dict | None: Status do job ou None se não existe.
+        """
+        job = self.jobs.get(job_id)
+        if job:
+            return {
+                "job_id": job.job_id,
+                "status": job.status,
+                "files": job.filenames,
+                "chunks_generated": job.chunks_generated,
+                "error": job.error,
+            }
+        if not self.durable:
+            return None
+
+        async with self.vector_store_service.engine.connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT id, status, files, chunks_generated, error
+                    FROM ingestion_jobs WHERE id = :id
+                """),
+                {"id": job_id},
+            )
+            row = result.fetchone()
+        if not row:
+            return None
+        return {
+            "job_id": row.id,
+            "status": row.status,
+            "files": [f["filename"] for f in row.files],
+            "chunks_generated": row.chunks_generated,
+            "error": row.error,
+        }
+
+    async def stream_events(self, job_id: str) -> AsyncIterator[dict]:
+        """
+        Produz os eventos de progresso do job, do início até o evento final.
+
+        Para jobs que não estão em memória (outro worker ou reinício), emite
+        apenas o status persistido.
+
+        Args:
+            job_id: Identificador do job.
+
+        Yields:
+            dict: Eventos 'queued', 'started', 'file_completed', 'completed' ou 'failed'.
+        """
+        job = self.jobs.get(job_id)
+        if not job:
+            status = await self.get_job_status(job_id)
+            if status:
+                yield {"type": "status", **status}
+            return
+
+        index = 0
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda: len(job.events) > index)
+                events = job.events[index:]
+            index += len(events)
+            for event in events:
+                yield event
+                if event["type"] in TERMINAL_EVENTS:
+                    return
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    "Ingestion job crashed | job_id=%s | error=%s", job.job_id, str(e)
+                )
+                if job.status not in TERMINAL_EVENTS:
+                    job.status = "failed"
+                    job.error = str(e)
+                    await job.publish(
+                        {"type": "failed", "job_id": job.job_id, "error": str(e)}
+                    )
+                await self._discard_spool(job)
+            finally:
+                self.queue.task_done()
+
+    async def _run(self, job: IngestionJob) -> None:
+        started_at = time.perf_counter()
+        files_done = 0
+        try:
+            job.status = "running"
+            await self._persist(job)
+            await job.publish({"type": "started", "job_id": job.job_id})
+            logger.info("Ingestion job started | job_id=%s", job.job_id)
+
+            file_chunks: dict[str, int] = {}
+            stream = self.ingestion_service.process_files(files_data=job.files)
+            async for filename, chunks, file_done in stream:
+                await self.vector_store_service.add_documents(chunks)
+                job.chunks_generated += len(chunks)
+                file_chunks[filename] = file_chunks.get(filename, 0) + len(chunks)
+                if not file_done:
+                    await job.publish(
+                        {
+                            "type": "file_progress",
+                            "file": filename,
+                            "chunks": file_chunks[filename],
+                        }
+                    )
+                    continue
+
+                files_done += 1
+                await job.publish(
+                    {
+                        "type": "file_completed",
+                        "file": filename,
+                        "chunks": file_chunks[filename],
+                        "files_done": files_done,
+                        "files_total": len(job.files),
+                    }
+                )
+
+            job.status = "completed"
+            await self._persist_terminal(job)
+            await job.publish(
+                {
+                    "type": "completed",
+                    "job_id": job.job_id,
+                    "chunks_generated": job.chunks_generated,
+                }
+            )
+            logger.info(
+                "Ingestion job completed | job_id=%s | chunks=%d | elapsed_ms=%.1f",
+                job.job_id,
+                job.chunks_generated,
+                (time.perf_counter() - started_at) * 1000,
+            )
+        except asyncio.CancelledError:
+            # No modo durável os arquivos ficam em disco para o job ser
+            # retomado no próximo startup.
+            if not self.durable:
+                await self._discard_spool(job)
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            await self._persist_terminal(job)
+            await job.publish({"type": "failed", "job_id": job.job_id, "error": str(e)})
+            logger.error("Ingestion job failed | job_id=%s | error=%s", job.job_id, str(e))
+
+        await self._discard_spool(job)
+
+    async def _discard_spool(self, job: IngestionJob) -> None:
+        await to_thread.run_sync(
+            shutil.rmtree, os.path.join(self.spool_dir, job.job_id), True
+        )
+
+    def _remember(self, job: IngestionJob) -> None:
+        self.jobs[job.job_id] = job
+        while len(self.jobs) > self.history_size:
+            oldest_id, oldest = next(iter(self.jobs.items()))
+            if oldest.status not in TERMINAL_EVENTS:
+                break
+            del self.jobs[oldest_id]
+
+    async def _persist_terminal(self, job: IngestionJob) -> None:
+        # Uma falha ao gravar o status final não pode impedir o evento terminal.
+        try:
+            await self._persist(job)
+        except Exception as e:
+            logger.error(
+                "Failed to persist job status | job_id=%s | status=%s | error=%s",
+                job.job_id,
+                job.status,
+                str(e),
+            )
+
+    async def _persist(self, job: IngestionJob) -> None:
+        if not self.durable:
+            return
+        files = [{"filename": f.filename, "path": f.path} for f in job.files]
+        async with self.vector_store_service.engine.begin() as conn:
+            await conn.execute(
+                text("""
+                    INSERT INTO ingestion_jobs (id, status, files, chunks_generated, error)
+                    VALUES (:id, :status, CAST(:files AS jsonb), :chunks_generated, :error)
+                    ON CONFLICT (id) DO UPDATE
+                    SET status = EXCLUDED.status,
+                        chunks_generated = EXCLUDED.chunks_generated,
+                        error = EXCLUDED.error,
+                        updated_at = now()
+                """),
+                {
+                    "id": job.job_id,
+                    "status": job.status,
+                    "files": json.dumps(files, ensure_ascii=False),
+                    "chunks_generated": job.chunks_generated,
+                    "error": job.error,
+                },
+            )
+
+    async def _recover_jobs(self) -> None:
+        async with self.vector_store_service.engine.connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT id, files FROM ingestion_jobs
+                    WHERE status IN ('queued', 'running')
+                    ORDER BY created_at
+                """)
+            )
+            rows = result.fetchall()
+
+        for row in rows:
+            files = [SpooledFile(f["filename"], f["path"]) for f in row.files]
+            job = IngestionJob(row.id, files)
+            if not all(os.path.exists(f.path) for f in files) or self.queue.full():
+                job.status = "failed"
+                job.error = "Job não pôde ser retomado após reinício."
+                await self._persist(job)
+                continue
+
+            self._remember(job)
+            await job.publish({"type": "queued", "job_id": job.job_id, "files": job.filenames})
+            self.queue.put_nowait(job)
+            logger.info("Ingestion job recovered | job_id=%s", job.job_id)
+
+
+def _write_file(path: str, content: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+async def init_ingestion_job_manager(app: Litestar) -> None:
+    """
+    Cria o IngestionJobManager e inicia seus workers no startup.
+
+    Deve rodar após a criação do VectorStoreService e do IngestionService.
+
+    Args:
+        app: Aplicação Litestar cujo state receberá o gerenciador.
+    """
+    manager = IngestionJobManager(
+        app.state.ingestion_service, app.state.vector_store_service
+    )
+    await manager.start()
+    app.state.ingestion_job_manager = manager
+
+
+async def close_ingestion_job_manager(app: Litestar) -> None:
+    """
+    Encerra os workers do IngestionJobManager no shutdown.
+
+    Args:
+        app: Aplicação Litestar que contém o gerenciador no state.
+    """
+    manager = app.state.get("ingestion_job_manager")
+    if manager:
+        await manager.close()
+
+
+def provide_ingestion_job_manager(state: State) -> IngestionJobManager:
+    """
+    Provider de dependência que retorna o IngestionJobManager compartilhado.
+
+    Args:
+        state: State da aplicação Litestar.
+
+    Returns:
+        IngestionJobManager: Instância criada no startup.
+    """
+    return state.ingestion_job_manager
@@ -1,14 +1,29 @@
+import asyncio
+import csv
 import io
+import multiprocessing
+import openpyxl
+import os
 import pdfplumber
-import platform
-import pytesseract
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image
 import pandas as pd
-from litestar.datastructures import UploadFile
+from litestar import Litestar
+from litestar.datastructures import State, UploadFile
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from markitdown import MarkItDown
 from src.logging_config import get_logger
+from src.services.chunking import get_chunking_engine
+from src.services.ocr_service import (
+    OcrService,
+    configure_tesseract,
+    init_ocr_process,
+    ocr_image,
+    preprocess_image,
+)
 
 logger = get_logger("ingestion_service")
 
@@ -23,91 +38,326 @@ MARKITDOWN_EXTENSIONS = {
     ".markdown",
 }
 
+SPREADSHEET_EXTENSIONS = {".xlsx", ".xls"}
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tiff", ".bmp"}
+SUPPORTED_EXTENSIONS = (
+    {".pdf", ".csv"} | SPREADSHEET_EXTENSIONS | IMAGE_EXTENSIONS | MARKITDOWN_EXTENSIONS
+)
+
+PDF_OCR_RESOLUTION = 300
+
 
 class IngestionService:
     """Serviço de ingestão e extração de conteúdo de arquivos."""
 
-    def __init__(self) -> None:
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000, chunk_overlap=200, separators=["\n\n", "\n", " ", ""]
-        )
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.chunking = get_chunking_engine()
         self.markitdown = MarkItDown()
-        if platform.system() == "Windows":
-            logger.info("Setting Tesseract path for Windows")
-            pytesseract.pytesseract.tesseract_cmd = (
-                r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-            )
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pdf_pages_per_shard = int(os.getenv("PDF_PAGES_PER_SHARD", "25"))
+        self.spreadsheet_block_bytes = int(
+            os.getenv("SPREADSHEET_BLOCK_BYTES", str(4 * 1024 * 1024))
+        )
+        self.rows_per_document = int(os.getenv("SPREADSHEET_ROWS_PER_DOCUMENT", "1"))
+        self.pool: ProcessPoolExecutor | None = None
+        self.ocr = OcrService()
+        configure_tesseract()
+
+    def start(self) -> None:
+        """Cria o pool de processos usado na extração dos arquivos."""
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        logger.info("Ingestion pool started | workers=%d", self.max_workers)
+        self.ocr.start()
+
+    def close(self) -> None:
+        """Encerra os pools de processos (ingestão e OCR)."""
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+            logger.info("Ingestion pool closed")
+        self.ocr.close()
+
+    def validate(self, filenames: list[str]) -> None:
+        """
+        Verifica se todos os arquivos possuem formato suportado.
 
-    async def process_file(self, files_data: list[UploadFile]) -> list[Document]:
+        Args:
+            filenames: Nomes dos arquivos.
+
+        Raises:
+            ValueError: Se formato de arquivo não é suportado.
+        """
+        for filename in filenames:
+            if _extension(filename.lower()) not in SUPPORTED_EXTENSIONS:
+                logger.error("Unsupported file format | filename=%s", filename)
+                raise ValueError(f"Formato de arquivo não suportado: {filename}")
+
+    async def process_files(
+        self, files_data: list[UploadFile]
+    ) -> AsyncIterator[tuple[str, list[Document], bool]]:
         """
-        Processa lista de arquivos e extrai conteúdo como Documents.
+        Processa arquivos em paralelo e produz os chunks de cada um assim que ficam prontos.
+
+        A extração e o chunking rodam no pool de processos, com no máximo
+        `max_workers` arquivos em memória ao mesmo tempo. Arquivos CSV são
+        lidos em blocos de SPREADSHEET_BLOCK_BYTES e seus chunks são produzidos
+        bloco a bloco, sem montar o arquivo inteiro como DataFrame. Cada aba de
+        uma planilha .xlsx é convertida para CSV no pool e segue o mesmo caminho.
 
         Suporta: PDF, CSV, Excel, Word, PowerPoint, HTML, JSON, TXT, Markdown e Imagens (OCR).
 
         Args:
-            files_data: Lista de arquivos UploadFile.
+            files_data: Arquivos com `filename` e `read()` assíncrono (UploadFile ou SpooledFile).
 
-        Returns:
-            list[Document]: Lista de chunks prontos para vetorização.
+        Yields:
+            tuple[str, list[Document], bool]: Nome do arquivo, chunks prontos para
+            vetorização e se o arquivo foi concluído (False para blocos parciais).
 
         Raises:
             ValueError: Se formato de arquivo não é suportado.
         """
-        all_raw_documents = []
-
-        for file_data in files_data:
-            content = await file_data.read()
-            filename = file_data.filename.lower()
-            logger.info("Processing file | filename=%s", filename)
-
-            try:
-                if filename.endswith(".pdf"):
-                    all_raw_documents.extend(self._extract_from_pdf(content, filename))
-                elif filename.endswith(".csv"):
-                    all_raw_documents.extend(self._extract_from_csv(content, filename))
-                elif filename.endswith(".xlsx") or filename.endswith(".xls"):
-                    all_raw_documents.extend(
-                        self._extract_from_excel(content, filename)
+        self.validate([file_data.filename for file_data in files_data])
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        results: asyncio.Queue[
+            tuple[str, list[Document], bool, Exception | None]
+        ] = asyncio.Queue(maxsize=self.max_workers)
+
+        async def extract(file_data: UploadFile) -> None:
+            async with semaphore:
+                content = await file_data.read()
+                filename = file_data.filename.lower()
+                logger.info("Processing file | filename=%s", filename)
+                try:
+                    ext = _extension(filename)
+                    if ext == ".pdf":
+                        chunks = await self._extract_pdf_sharded(content, filename)
+                    elif ext == ".csv":
+                        async for chunks in self._extract_csv_streaming(content, filename):
+                            await results.put((filename, chunks, False, None))
+                        chunks = []
+                    elif ext in SPREADSHEET_EXTENSIONS:
+                        async for chunks in self._extract_excel_streaming(content, filename):
+                            await results.put((filename, chunks, False, None))
+                        chunks = []
+                    elif ext in IMAGE_EXTENSIONS:
+                        chunks = await self._extract_image(content, filename)
+                    else:
+                        chunks = await loop.run_in_executor(
+                            self.pool, _extract_and_split, content, filename
+                        )
+                    await results.put((filename, chunks, True, None))
+                except Exception as e:
+                    logger.error(
+                        "Failed to process file | filename=%s | error=%s",
+                        filename,
+                        str(e),
                     )
-                elif filename.endswith((".png", ".jpg", ".jpeg", ".tiff", ".bmp")):
-                    all_raw_documents.extend(
-                        self._extract_from_image(content, filename)
+                    await results.put((filename, [], True, e))
+
+        tasks = [asyncio.create_task(extract(file_data)) for file_data in files_data]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                filename, chunks, file_done, error = await results.get()
+                if error:
+                    raise error
+                if file_done:
+                    remaining -= 1
+                    logger.info("Chunking completed | filename=%s", filename)
+                yield filename, chunks, file_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _extract_excel_streaming(
+        self, file_bytes: bytes, filename: str
+    ) -> AsyncIterator[list[Document]]:
+        loop = asyncio.get_running_loop()
+        if _extension(filename) == ".xls":
+            # O formato .xls não tem leitura incremental: a pasta inteira é lida
+            # uma única vez e as abas são processadas no mesmo worker.
+            sheets = await loop.run_in_executor(
+                self.pool, _extract_xls_and_split, file_bytes, filename
+            )
+            for chunks in sheets:
+                yield chunks
+            return
+
+        # Cada aba do .xlsx é lida (openpyxl em modo read-only) e convertida para
+        # CSV num worker do pool; o CSV segue pelo mesmo caminho em blocos dos
+        # arquivos .csv. A conversão da próxima aba começa enquanto a atual é dividida.
+        sheets = await loop.run_in_executor(self.pool, _list_excel_sheets, file_bytes)
+        converting = None
+        try:
+            for index, sheet in enumerate(sheets):
+                if converting is None:
+                    converting = loop.run_in_executor(
+                        self.pool, _excel_sheet_to_csv, file_bytes, sheet
                     )
-                elif any(filename.endswith(ext) for ext in MARKITDOWN_EXTENSIONS):
-                    all_raw_documents.extend(
-                        self._extract_with_markitdown(content, filename)
+                csv_bytes = await converting
+                converting = None
+                if index + 1 < len(sheets):
+                    converting = loop.run_in_executor(
+                        self.pool, _excel_sheet_to_csv, file_bytes, sheets[index + 1]
                     )
-                else:
-                    logger.error("Unsupported file format | filename=%s", filename)
-                    raise ValueError(f"Formato de arquivo não suportado: {filename}")
-            except Exception as e:
-                logger.error(
-                    "Failed to process file | filename=%s | error=%s", filename, str(e)
+                async for chunks in self._extract_csv_streaming(
+                    csv_bytes, filename, "excel", sheet
+                ):
+                    yield chunks
+        finally:
+            if converting is not None:
+                converting.cancel()
+
+    async def _extract_image(self, file_bytes: bytes, filename: str) -> list[Document]:
+        # Uma imagem ilegível não deve derrubar o job inteiro: o arquivo fica sem chunks.
+        try:
+            text = await self.ocr.image_to_text(file_bytes)
+        except Exception as e:
+            logger.error("Image OCR failed | filename=%s | error=%s", filename, str(e))
+            return []
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.pool, _split_image_text, text, filename
+        )
+
+    async def _extract_csv_streaming(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        file_type: str = "csv",
+        sheet: str | None = None,
+    ) -> AsyncIterator[list[Document]]:
+        loop = asyncio.get_running_loop()
+        header_end = _csv_record_end(file_bytes, 0, 0)
+        header = file_bytes[:header_end]
+        started_at = time.perf_counter()
+
+        pending: deque[asyncio.Future] = deque()
+        start = header_end
+        rows_done = 0
+        while start < len(file_bytes) or pending:
+            while start < len(file_bytes) and len(pending) < self.max_workers:
+                end = _csv_record_end(
+                    file_bytes, start, start + self.spreadsheet_block_bytes
                 )
-                raise
+                pending.append(
+                    loop.run_in_executor(
+                        self.pool,
+                        _extract_csv_block_and_split,
+                        header,
+                        file_bytes[start:end],
+                        filename,
+                        file_type,
+                        sheet,
+                    )
+                )
+                start = end
+
+            chunks, rows = await pending.popleft()
+            for chunk in chunks:
+                _shift_rows(chunk, rows_done)
+            rows_done += rows
+            yield chunks
 
-        chunks = self.text_splitter.split_documents(all_raw_documents)
+        elapsed = time.perf_counter() - started_at
         logger.info(
-            "Chunking completed | documents=%d | chunks=%d",
-            len(all_raw_documents),
-            len(chunks),
+            "CSV streamed | filename=%s | sheet=%s | rows=%d | rows_per_sec=%.1f",
+            filename,
+            sheet,
+            rows_done,
+            rows_done / elapsed if elapsed else 0.0,
         )
 
-        return chunks
+    async def _extract_pdf_sharded(
+        self, file_bytes: bytes, filename: str
+    ) -> list[Document]:
+        loop = asyncio.get_running_loop()
+        page_count = await loop.run_in_executor(self.pool, _count_pdf_pages, file_bytes)
+        ranges = [
+            (start, min(start + self.pdf_pages_per_shard, page_count))
+            for start in range(0, page_count, self.pdf_pages_per_shard)
+        ]
+        logger.debug(
+            "PDF sharded | filename=%s | pages=%d | shards=%d",
+            filename,
+            page_count,
+            len(ranges),
+        )
+
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self.pool, _extract_pdf_pages_and_split, file_bytes, filename, start, end
+                )
+                for start, end in ranges
+            )
+        )
+        return [chunk for shard_chunks in results for chunk in shard_chunks]
 
-    def _extract_from_pdf(self, file_bytes: bytes, filename: str) -> list[Document]:
+    def extract_and_split(self, file_bytes: bytes, filename: str) -> list[Document]:
+        """
+        Extrai o conteúdo de um arquivo e o divide em chunks.
+
+        Args:
+            file_bytes: Conteúdo bruto do arquivo.
+            filename: Nome do arquivo (em minúsculas).
+
+        Returns:
+            list[Document]: Chunks do arquivo.
+        """
+        ext = _extension(filename)
+
+        if ext == ".pdf":
+            raw_documents = self._extract_from_pdf(file_bytes, filename)
+        elif ext in MARKITDOWN_EXTENSIONS:
+            raw_documents = self._extract_with_markitdown(file_bytes, filename)
+        else:
+            raise ValueError(f"Formato de arquivo não suportado: {filename}")
+
+        return self.chunking.split_documents(raw_documents)
+
+    def _extract_from_pdf(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        start: int = 0,
+        end: int | None = None,
+    ) -> list[Document]:
         try:
             docs = []
             with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-                for i, page in enumerate(pdf.pages):
+                for i, page in enumerate(pdf.pages[start:end], start=start):
+                    started_at = time.perf_counter()
                     page_text = page.extract_text()
-                    if page_text:
+                    doc_type = "pdf"
+
+                    if not page_text or not page_text.strip():
+                        image = page.to_image(resolution=PDF_OCR_RESOLUTION).original
+                        page_text = self._ocr_image(image)
+                        doc_type = "pdf_ocr"
+
+                    logger.debug(
+                        "PDF page extracted | filename=%s | page=%d | type=%s | elapsed_ms=%.1f",
+                        filename,
+                        i + 1,
+                        doc_type,
+                        (time.perf_counter() - started_at) * 1000,
+                    )
+
+                    if page_text.strip():
                         doc = Document(
                             page_content=page_text,
                             metadata={
                                 "source": filename,
                                 "location": "página " + str(i + 1),
-                                "type": "pdf",
+                                "type": doc_type,
                             },
                         )
                         docs.append(doc)
@@ -117,89 +367,76 @@ class IngestionService:
             logger.error("PDF extraction failed | filename=%s | error=%s", filename, str(e))
             raise
 
-    def _extract_from_csv(self, file_bytes: bytes, filename: str) -> list[Document]:
-        try:
-            df = pd.read_csv(io.BytesIO(file_bytes))
-            docs = self._process_dataframe(df, filename, "csv")
-            logger.debug("CSV extracted | filename=%s | rows=%d", filename, len(docs))
-            return docs
-        except Exception as e:
-            logger.error("CSV extraction failed | filename=%s | error=%s", filename, str(e))
-            raise
-
-    def _extract_from_excel(self, file_bytes: bytes, filename: str) -> list[Document]:
-        try:
-            df = pd.read_excel(io.BytesIO(file_bytes))
-            docs = self._process_dataframe(df, filename, "excel")
-            logger.debug("Excel extracted | filename=%s | rows=%d", filename, len(docs))
-            return docs
-        except Exception as e:
-            logger.error("Excel extraction failed | filename=%s | error=%s", filename, str(e))
-            raise
-
     def _process_dataframe(
-        self, df: pd.DataFrame, filename: str, file_type: str
+        self,
+        df: pd.DataFrame,
+        filename: str,
+        file_type: str,
+        first_row: int = 1,
+        sheet: str | None = None,
     ) -> list[Document]:
-        df = df.fillna("")
+        texts = _format_rows(df).tolist()
 
         docs = []
-
-        rows = df.to_dict(orient="records")
-
-        for i, row in enumerate(rows):
-            content_parts = []
-            for col, val in row.items():
-                if val != "":
-                    content_parts.append(f"{col}: {val}")
-
-            page_content = "\n".join(content_parts)
-
+        start = 0
+        while start < len(texts):
+            end = start + 1
+            size = len(texts[start])
+            while (
+                end < len(texts)
+                and end - start < self.rows_per_document
+                and size + len(texts[end]) <= self.chunking.max_chars
+            ):
+                size += len(texts[end]) + 2
+                end += 1
+
+            page_content = "\n\n".join(text for text in texts[start:end] if text)
             if page_content.strip():
-                doc = Document(
-                    page_content=page_content,
-                    metadata={
-                        "source": filename,
-                        "location": "linha " + str(i + 1),
-                        "type": file_type,
-                    },
-                )
-                docs.append(doc)
+                row = first_row + start
+                row_end = first_row + end - 1
+                metadata = {
+                    "source": filename,
+                    "location": _row_location(row, row_end, sheet),
+                    "type": file_type,
+                    "row": row,
+                    "row_end": row_end,
+                }
+                if sheet is not None:
+                    metadata["sheet"] = sheet
+                docs.append(Document(page_content=page_content, metadata=metadata))
+            start = end
 
         return docs
 
-    def _extract_from_image(self, file_bytes: bytes, filename: str) -> list[Document]:
-        try:
-            image = Image.open(io.BytesIO(file_bytes))
-            text = pytesseract.image_to_string(image, lang="por+eng")
-
-            if not text.strip():
-                logger.warning("OCR returned empty text | filename=%s", filename)
-                return []
+    def _image_documents(self, text: str, filename: str) -> list[Document]:
+        if not text.strip():
+            logger.warning("OCR returned empty text | filename=%s", filename)
+            return []
 
-            logger.debug(
-                "Image OCR completed | filename=%s | text_length=%d",
-                filename,
-                len(text),
+        logger.debug(
+            "Image OCR completed | filename=%s | text_length=%d",
+            filename,
+            len(text),
+        )
+        return [
+            Document(
+                page_content=text,
+                metadata={
+                    "source": filename,
+                    "location": "imagem completa",
+                    "type": "image_ocr",
+                },
             )
-            return [
-                Document(
-                    page_content=text,
-                    metadata={
-                        "source": filename,
-                        "location": "imagem completa",
-                        "type": "image_ocr",
-                    },
-                )
-            ]
-        except Exception as e:
-            logger.error("Image OCR failed | filename=%s | error=%s", filename, str(e))
-            return []
+        ]
+
+    def _ocr_image(self, image: Image.Image) -> str:
+        return ocr_image(preprocess_image(image, self.ocr.max_width, self.ocr.binarize))
 
     def _extract_with_markitdown(
         self, file_bytes: bytes, filename: str
     ) -> list[Document]:
         try:
-            ext = "." + filename.rsplit(".", 1)[-1] if "." in filename else ""
+            ext = _extension(filename)
 
             stream = io.BytesIO(file_bytes)
             result = self.markitdown.convert_stream(stream, file_extension=ext)
@@ -231,3 +468,166 @@ class IngestionService:
             )
             raise
 
+
+
+_worker_service: IngestionService | None = None
+
+
+def _init_worker() -> None:
+    global _worker_service
+    init_ocr_process(int(os.getenv("OCR_OMP_THREADS", "1")))
+    _worker_service = IngestionService()
+
+
+def _extract_and_split(file_bytes: bytes, filename: str) -> list[Document]:
+    return _worker_service.extract_and_split(file_bytes, filename)
+
+
+def _extract_csv_block_and_split(
+    header: bytes,
+    block: bytes,
+    filename: str,
+    file_type: str = "csv",
+    sheet: str | None = None,
+) -> tuple[list[Document], int]:
+    df = pd.read_csv(io.BytesIO(header + block), dtype=str, keep_default_na=False)
+    docs = _worker_service._process_dataframe(df, filename, file_type, sheet=sheet)
+    return _worker_service.chunking.split_documents(docs), len(df)
+
+
+def _csv_record_end(data: bytes, start: int, target: int) -> int:
+    # Próxima quebra de linha a partir de `target` que não esteja dentro de um campo entre aspas.
+    end = data.find(b"\n", target)
+    while end != -1 and data.count(b'"', start, end) % 2:
+        end = data.find(b"\n", end + 1)
+    return len(data) if end == -1 else end + 1
+
+
+def _format_rows(df: pd.DataFrame) -> pd.Series:
+    text = pd.Series("", index=df.index, dtype=object)
+    for col in df.columns:
+        values = df[col].fillna("").astype(str)
+        line = (f"{col}: " + values).where(values != "", "")
+        text = text.str.cat(line, sep="\n")
+    return text.str.replace(r"\n+", "\n", regex=True).str.strip()
+
+
+def _row_location(row: int, row_end: int, sheet: str | None = None) -> str:
+    rows = f"linha {row}" if row == row_end else f"linhas {row}-{row_end}"
+    return f"planilha {sheet}, {rows}" if sheet is not None else rows
+
+
+def _shift_rows(doc: Document, offset: int) -> None:
+    doc.metadata["row"] += offset
+    doc.metadata["row_end"] += offset
+    doc.metadata["location"] = _row_location(
+        doc.metadata["row"], doc.metadata["row_end"], doc.metadata.get("sheet")
+    )
+
+
+def _split_image_text(text: str, filename: str) -> list[Document]:
+    docs = _worker_service._image_documents(text, filename)
+    return _worker_service.chunking.split_documents(docs)
+
+
+def _extract_xls_and_split(file_bytes: bytes, filename: str) -> list[list[Document]]:
+    sheets = pd.read_excel(io.BytesIO(file_bytes), sheet_name=None)
+    return [
+        _worker_service.chunking.split_documents(
+            _worker_service._process_dataframe(df, filename, "excel", sheet=sheet)
+        )
+        for sheet, df in sheets.items()
+    ]
+
+
+def _list_excel_sheets(file_bytes: bytes) -> list[str]:
+    workbook = openpyxl.load_workbook(io.BytesIO(file_bytes), read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def _excel_sheet_to_csv(file_bytes: bytes, sheet: str) -> bytes:
+    workbook = openpyxl.load_workbook(
+        io.BytesIO(file_bytes), read_only=True, data_only=True
+    )
+    try:
+        worksheet = workbook[sheet]
+        # Em modo read-only o openpyxl confia no <dimension> gravado no arquivo,
+        # que pode estar desatualizado (ex: "A1"); sem ele, as linhas vêm com o
+        # tamanho real de cada uma.
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return b""
+
+        columns = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+        width = len(columns)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columns)
+        # Linhas mais curtas que o cabeçalho são completadas; as mais longas, cortadas.
+        for row in rows:
+            writer.writerow(
+                "" if value is None else value
+                for value in (tuple(row) + (None,) * width)[:width]
+            )
+        return buffer.getvalue().encode("utf-8")
+    finally:
+        workbook.close()
+
+
+def _count_pdf_pages(file_bytes: bytes) -> int:
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_pdf_pages_and_split(
+    file_bytes: bytes, filename: str, start: int, end: int
+) -> list[Document]:
+    docs = _worker_service._extract_from_pdf(file_bytes, filename, start, end)
+    return _worker_service.chunking.split_documents(docs)
+
+
+def _extension(filename: str) -> str:
+    return "." + filename.rsplit(".", 1)[-1] if "." in filename else ""
+
+
+def init_ingestion_service(app: Litestar) -> None:
+    """
+    Cria o IngestionService compartilhado e seu pool de processos no startup.
+
+    Args:
+        app: Aplicação Litestar cujo state receberá o serviço.
+    """
+    max_workers = os.getenv("INGESTION_MAX_WORKERS")
+    service = IngestionService(max_workers=int(max_workers) if max_workers else None)
+    service.start()
+    app.state.ingestion_service = service
+
+
+def close_ingestion_service(app: Litestar) -> None:
+    """
+    Encerra o pool de processos do IngestionService no shutdown.
+
+    Args:
+        app: Aplicação Litestar que contém o serviço no state.
+    """
+    service = app.state.get("ingestion_service")
+    if service:
+        service.close()
+
+
+def provide_ingestion_service(state: State) -> IngestionService:
+    """
+    Provider de dependência que retorna o IngestionService compartilhado.
+
+    Args:
+        state: State da aplicação Litestar.
+
+    Returns:
+        IngestionService: Instância criada no startup.
+    """
+    return state.ingestion_service
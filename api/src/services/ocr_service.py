@@ -0,0 +1,291 @@
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import platform
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytesseract
+from PIL import Image, ImageOps
+from src.logging_config import get_logger, setup_logging
+
+logger = get_logger("ocr_service")
+
+OCR_LANG = "por+eng"
+
+
+class OcrService:
+    """
+    OCR de imagens num pool de processos dedicado.
+
+    Cada worker limita o Tesseract a OCR_OMP_THREADS threads (OMP_THREAD_LIMIT),
+    de modo que OCR_MAX_WORKERS imagens são processadas em paralelo sem
+    disputar os mesmos núcleos. Imagens mais largas que OCR_MAX_WIDTH são
+    reduzidas, opcionalmente binarizadas (OCR_BINARIZE), e imagens mais altas
+    que OCR_TILE_HEIGHT são divididas em faixas horizontais processadas em
+    paralelo. Os cortes caem na linha de pixels mais clara dos últimos
+    OCR_TILE_SEARCH_HEIGHT pixels de cada faixa, sem sobreposição, para não
+    cortar nem repetir linhas de texto. O texto é cacheado pelo hash do conteúdo da imagem (LRU em
+    memória e, opcionalmente, em disco via OCR_CACHE_DIR).
+    """
+
+    def __init__(self) -> None:
+        self.max_workers = int(os.getenv("OCR_MAX_WORKERS", "2"))
+        self.omp_threads = int(os.getenv("OCR_OMP_THREADS", "1"))
+        self.max_width = int(os.getenv("OCR_MAX_WIDTH", "2500"))
+        self.binarize = os.getenv("OCR_BINARIZE", "false").lower() == "true"
+        self.tile_height = int(os.getenv("OCR_TILE_HEIGHT", "3000"))
+        self.tile_search_height = int(os.getenv("OCR_TILE_SEARCH_HEIGHT", "200"))
+        self.cache_size = int(os.getenv("OCR_CACHE_SIZE", "500"))
+        self.cache_dir = os.getenv("OCR_CACHE_DIR") or None
+        self.pool: ProcessPoolExecutor | None = None
+        self.images = 0
+        self.tiles = 0
+        self.cache_hits = 0
+        self.ocr_seconds = 0.0
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def start(self) -> None:
+        """Cria o pool de processos do OCR."""
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_ocr_process,
+            initargs=(self.omp_threads,),
+        )
+        logger.info(
+            "OCR pool started | workers=%d | omp_threads=%d",
+            self.max_workers,
+            self.omp_threads,
+        )
+
+    def close(self) -> None:
+        """Encerra o pool de processos."""
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+            logger.info("OCR pool closed")
+
+    async def image_to_text(self, image_bytes: bytes) -> str:
+        """
+        Extrai o texto de uma imagem, usando o cache quando a mesma imagem já foi processada.
+
+        Args:
+            image_bytes: Conteúdo bruto da imagem.
+
+        Returns:
+            str: Texto reconhecido (vazio se nada foi encontrado).
+        """
+        key = self.key(image_bytes)
+        text = self._get(key)
+        if text is not None:
+            self.cache_hits += 1
+            logger.debug("OCR cache hit | key=%s", key[:12])
+            return text
+
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        tiles = await loop.run_in_executor(
+            self.pool,
+            prepare_tiles,
+            image_bytes,
+            self.max_width,
+            self.binarize,
+            self.tile_height,
+            self.tile_search_height,
+        )
+        texts = await asyncio.gather(
+            *(loop.run_in_executor(self.pool, ocr_image, tile) for tile in tiles)
+        )
+        text = "\n".join(part.strip() for part in texts if part.strip())
+
+        elapsed = time.perf_counter() - started_at
+        self.images += 1
+        self.tiles += len(tiles)
+        self.ocr_seconds += elapsed
+        self._put(key, text)
+        logger.info(
+            "Image OCR completed | tiles=%d | text_length=%d | elapsed_ms=%.1f",
+            len(tiles),
+            len(text),
+            elapsed * 1000,
+        )
+        return text
+
+    def key(self, image_bytes: bytes) -> str:
+        """
+        Calcula a chave de cache de uma imagem.
+
+        Args:
+            image_bytes: Conteúdo bruto da imagem.
+
+        Returns:
+            str: SHA-256 hexadecimal do idioma, parâmetros de pré-processamento e conteúdo.
+        """
+        digest = hashlib.sha256(
+            f"{OCR_LANG}\0{self.max_width}\0{self.binarize}\0".encode("utf-8")
+        )
+        digest.update(image_bytes)
+        return digest.hexdigest()
+
+    def stats(self) -> dict[str, float]:
+        """
+        Retorna métricas de throughput e acerto do cache do OCR.
+
+        Returns:
+            dict[str, float]: Imagens e faixas processadas, hits do cache e imagens/s.
+        """
+        return {
+            "workers": self.max_workers,
+            "omp_threads": self.omp_threads,
+            "images": self.images,
+            "tiles": self.tiles,
+            "cache_hits": self.cache_hits,
+            "ocr_seconds": round(self.ocr_seconds, 3),
+            "images_per_sec": round(self.images / self.ocr_seconds, 2)
+            if self.ocr_seconds
+            else 0.0,
+        }
+
+    def _get(self, key: str) -> str | None:
+        text = self._cache.get(key)
+        if text is not None:
+            self._cache.move_to_end(key)
+            return text
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("OCR cache read failed | key=%s | error=%s", key, str(e))
+            return None
+        self._remember(key, text)
+        return text
+
+    def _put(self, key: str, text: str) -> None:
+        self._remember(key, text)
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("OCR cache write failed | key=%s | error=%s", key, str(e))
+
+    def _remember(self, key: str, text: str) -> None:
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+
+def configure_tesseract() -> None:
+    """Aponta o pytesseract para o executável do Tesseract no Windows."""
+    if platform.system() == "Windows":
+        pytesseract.pytesseract.tesseract_cmd = (
+            r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+        )
+
+
+def init_ocr_process(omp_threads: int) -> None:
+    """
+    Inicializa um processo que executa OCR.
+
+    Args:
+        omp_threads: Número máximo de threads OpenMP de cada chamada ao Tesseract.
+    """
+    os.environ["OMP_THREAD_LIMIT"] = str(omp_threads)
+    setup_logging()
+    configure_tesseract()
+
+
+def preprocess_image(
+    image: Image.Image, max_width: int, binarize: bool = False
+) -> Image.Image:
+    """
+    Prepara uma imagem para o OCR: tons de cinza, largura limitada e binarização opcional.
+
+    Args:
+        image: Imagem original.
+        max_width: Largura máxima; imagens maiores são reduzidas proporcionalmente.
+        binarize: Converte para preto e branco (limiar automático por autocontraste).
+
+    Returns:
+        Image.Image: Imagem pré-processada.
+    """
+    image = ImageOps.exif_transpose(image).convert("L")
+    if image.width > max_width:
+        height = round(image.height * max_width / image.width)
+        image = image.resize((max_width, height), Image.Resampling.LANCZOS)
+    if binarize:
+        image = ImageOps.autocontrast(image).point(lambda value: 255 if value > 128 else 0)
+    return image
+
+
+def prepare_tiles(
+    image_bytes: bytes,
+    max_width: int,
+    binarize: bool,
+    tile_height: int,
+    tile_search_height: int,
+) -> list[Image.Image]:
+    """
+    Pré-processa a imagem e a divide em faixas horizontais se for muito alta.
+
+    Args:
+        image_bytes: Conteúdo bruto da imagem.
+        max_width: Largura máxima após o redimensionamento.
+        binarize: Se a imagem deve ser binarizada.
+        tile_height: Altura máxima de cada faixa.
+        tile_search_height: Altura, no fim de cada faixa, onde se procura a linha
+            de pixels mais clara (espaço entre linhas de texto) para o corte.
+
+    Returns:
+        list[Image.Image]: Faixas da imagem, de cima para baixo, sem sobreposição.
+    """
+    image = preprocess_image(Image.open(io.BytesIO(image_bytes)), max_width, binarize)
+    if image.height <= tile_height:
+        return [image]
+
+    # Tinta por linha de pixels (imagem em tons de cinza: 0 = preto).
+    ink = (255 - np.asarray(image, dtype=np.int32)).sum(axis=1)
+    search = max(1, min(tile_search_height, tile_height - 1))
+
+    tiles = []
+    top = 0
+    while image.height - top > tile_height:
+        window_start = top + tile_height - search
+        window = ink[window_start : top + tile_height]
+        cut = window_start + int(np.flatnonzero(window == window.min())[-1]) + 1
+        tiles.append(image.crop((0, top, image.width, cut)))
+        top = cut
+    tiles.append(image.crop((0, top, image.width, image.height)))
+    return tiles
+
+
+def ocr_image(image: Image.Image) -> str:
+    """
+    Executa o Tesseract sobre uma imagem já pré-processada.
+
+    Args:
+        image: Imagem (ou faixa) a ser reconhecida.
+
+    Returns:
+        str: Texto reconhecido.
+    """
+    return pytesseract.image_to_string(image, lang=OCR_LANG)
@@ -1,15 +1,34 @@
+import asyncio
+import hashlib
+import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.documents import Document
 from langchain_postgres import PGVector
-from langchain_huggingface import HuggingFaceEmbeddings
+from litestar import Litestar
+from litestar.datastructures import State
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
 from src.logging_config import get_logger
+from src.services.embedding_backend import EmbeddingBackend
+from src.services.embedding_cache import CachedEmbeddings
+from src.services.reranker import CrossEncoderReranker
+from src.services.retrieval_cache import RetrievalCache
+from src.services.schema_migrations import run_migrations
+from src.services.source_catalog import SourceCatalog
+from src.services.vector_index import VectorIndexManager
 
 logger = get_logger("pgvector_service")
 
+SEARCH_MODES = {"vector", "hybrid"}
+RRF_K = 60
+FULL_TEXT_TOKEN_PATTERN = re.compile(r"\w[\w./-]*")
+
 
 class VectorStoreService:
-    """Serviço de armazenamento e busca vetorial usando PGVector."""
+    """Serviço de armazenamento e busca vetorial usando PGVector (async)."""
 
     def __init__(self):
         self.connection_string = os.getenv("PGVECTOR_DATABASE_URL")
@@ -18,67 +37,514 @@ class VectorStoreService:
         logger.info(
             "Initializing VectorStoreService | collection=%s", self.collection_name
         )
+        started_at = time.perf_counter()
+
+        self.embedding_backend = EmbeddingBackend(os.getenv("HUGGINGFACE_MODEL_NAME"))
+        self.embeddings = CachedEmbeddings(
+            self.embedding_backend.embeddings,
+            namespace=self.embedding_backend.namespace,
+            max_size=int(os.getenv("EMBEDDING_CACHE_SIZE", "10000")),
+            cache_dir=os.getenv("EMBEDDING_CACHE_DIR") or None,
+            disk_max_entries=int(os.getenv("EMBEDDING_CACHE_DISK_MAX_ENTRIES", "200000")),
+        )
+        self.embedding_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("EMBEDDING_MAX_WORKERS", "2")),
+            thread_name_prefix="embedding",
+        )
+        self.embedding_dimensions = len(self.embeddings.embed_query("warmup"))
+        self.embedding_batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+        self.embedded_chunks = 0
+        self.duplicates_skipped = 0
+        self.embedding_seconds = 0.0
+        self.insert_seconds = 0.0
 
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=os.getenv("HUGGINGFACE_MODEL_NAME")
+        self.engine = create_async_engine(
+            self.connection_string,
+            pool_size=int(os.getenv("PGVECTOR_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("PGVECTOR_POOL_MAX_OVERFLOW", "10")),
+            pool_pre_ping=True,
         )
 
         self.store = PGVector(
             embeddings=self.embeddings,
             collection_name=self.collection_name,
-            connection=self.connection_string,
+            connection=self.engine,
             use_jsonb=True,
             create_extension=False,
+            async_mode=True,
+            embedding_length=self.embedding_dimensions,
+        )
+        self.vector_index = VectorIndexManager(self.engine, self.embedding_dimensions)
+        self.hybrid_candidate_multiplier = int(
+            os.getenv("HYBRID_CANDIDATE_MULTIPLIER", "4")
+        )
+        self.retrieval_cache = RetrievalCache(
+            max_size=int(os.getenv("RETRIEVAL_CACHE_SIZE", "1000")),
+            ttl_seconds=float(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "300")),
+        )
+        self.reranker = (
+            CrossEncoderReranker()
+            if os.getenv("RERANK_ENABLED", "false").lower() == "true"
+            else None
+        )
+        self.collection_id = None
+
+        self.catalog = SourceCatalog(
+            engine=self.engine,
+            collection_name=self.collection_name,
+            ttl_seconds=float(os.getenv("SOURCE_CATALOG_TTL_SECONDS", "30")),
+            use_table=os.getenv("SOURCE_CATALOG_TABLE", "false").lower() == "true",
+        )
+
+        logger.info(
+            "VectorStoreService ready | collection=%s | startup_ms=%.1f",
+            self.collection_name,
+            (time.perf_counter() - started_at) * 1000,
+        )
+
+    async def initialize(self) -> None:
+        """
+        Prepara o banco no startup: tabelas e coleção do PGVector, migrações,
+        índice ANN e catálogo de fontes.
+        """
+        await self.store.acreate_tables_if_not_exists()
+        await self.store.acreate_collection()
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text("SELECT uuid FROM langchain_pg_collection WHERE name = :name"),
+                {"name": self.collection_name},
+            )
+            self.collection_id = result.scalar()
+
+        await run_migrations(self.engine)
+        await self.vector_index.ensure_index()
+        await self.catalog.load()
+
+    async def close(self) -> None:
+        """Libera o pool de conexões e o executor de embeddings."""
+        await self.engine.dispose()
+        self.embedding_executor.shutdown(wait=False)
+        if self.reranker:
+            self.reranker.close()
+        logger.info("VectorStoreService closed | collection=%s", self.collection_name)
+
+    async def embed_query(self, query: str) -> list[float]:
+        """
+        Calcula o embedding de uma query no executor dedicado.
+
+        Args:
+            query: Texto da query.
+
+        Returns:
+            list[float]: Vetor da query.
+        """
+        return await self._embed_query(query)
+
+    async def _embed_query(self, query: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.embedding_executor, self.embeddings.embed_query, query
+        )
+
+    async def _embed_documents(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.embedding_executor, self.embeddings.embed_documents, texts
         )
 
-    def add_documents(self, documents: list[Document]):
+    async def add_documents(self, documents: list[Document]):
         """
         Adiciona documentos ao vector store.
 
+        Os embeddings são calculados em lotes de EMBEDDING_BATCH_SIZE no executor
+        dedicado; o INSERT de um lote ocorre enquanto o próximo é codificado.
+        Como a chamada só retorna após o último INSERT, quem produz os chunks
+        aguarda (backpressure) antes de enviar o próximo arquivo.
+
+        Chunks com mesmo hash de fonte + conteúdo de um chunk já armazenado são
+        ignorados, de modo que reenviar um arquivo não gera novos embeddings.
+
         Args:
             documents: Lista de documentos a serem adicionados.
 
         Raises:
-            ValueError: Se a lista de documentos estiver vazia.
             Exception: Se falhar ao adicionar documentos.
         """
         if not documents:
             logger.debug("add_documents called with empty list, skipping")
             return
 
+        started_at = time.perf_counter()
+        insert_task: asyncio.Task | None = None
         try:
-            self.store.add_documents(documents)
-            logger.info("Documents added to vector store | count=%d", len(documents))
+            received = len(documents)
+            documents = await self._drop_existing(documents)
+            self.duplicates_skipped += received - len(documents)
+            if not documents:
+                logger.info("All documents already stored | count=%d", received)
+                return
+
+            for start in range(0, len(documents), self.embedding_batch_size):
+                batch = documents[start : start + self.embedding_batch_size]
+                texts = [doc.page_content for doc in batch]
+
+                embed_started_at = time.perf_counter()
+                embeddings = await self._embed_documents(texts)
+                self.embedding_seconds += time.perf_counter() - embed_started_at
+
+                if insert_task:
+                    await insert_task
+                insert_task = asyncio.create_task(self._insert_batch(batch, embeddings))
+
+            await insert_task
+            await self.catalog.add_sources(
+                {doc.metadata["source"] for doc in documents if doc.metadata.get("source")}
+            )
         except Exception as e:
+            if insert_task and not insert_task.done():
+                insert_task.cancel()
             logger.error("Failed to add documents | error=%s", str(e))
             raise
 
-    def search(
-        self, query: str, k: int = 4, filter_by_file: str | None = None
+        elapsed = time.perf_counter() - started_at
+        self.embedded_chunks += len(documents)
+        logger.info(
+            "Documents added to vector store | count=%d | duplicates=%d | batch_size=%d | chunks_per_sec=%.1f | cache_hit_ratio=%.3f",
+            len(documents),
+            received - len(documents),
+            self.embedding_batch_size,
+            len(documents) / elapsed if elapsed else 0.0,
+            self.embeddings.stats()["hit_ratio"],
+        )
+
+    async def _drop_existing(self, documents: list[Document]) -> list[Document]:
+        unique: dict[str, Document] = {}
+        for doc in documents:
+            content_hash = _content_hash(doc, self.collection_name)
+            doc.metadata["content_hash"] = content_hash
+            unique.setdefault(content_hash, doc)
+
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT cmetadata ->> 'content_hash'
+                    FROM langchain_pg_embedding
+                    WHERE collection_id = :collection_id
+                      AND cmetadata ->> 'content_hash' = ANY(:hashes)
+                """),
+                {"collection_id": self.collection_id, "hashes": list(unique)},
+            )
+            existing = {row[0] for row in result.fetchall()}
+
+        return [doc for content_hash, doc in unique.items() if content_hash not in existing]
+
+    async def _insert_batch(
+        self, batch: list[Document], embeddings: list[list[float]]
+    ) -> None:
+        started_at = time.perf_counter()
+        await self.store.aadd_embeddings(
+            texts=[doc.page_content for doc in batch],
+            embeddings=embeddings,
+            metadatas=[doc.metadata for doc in batch],
+            ids=[doc.metadata["content_hash"] for doc in batch],
+        )
+        self.insert_seconds += time.perf_counter() - started_at
+
+    async def page_fetch_state(self, url: str) -> dict[str, str | None] | None:
+        """
+        Retorna os metadados do último scraping de uma página.
+
+        Args:
+            url: URL da página.
+
+        Returns:
+            dict[str, str | None] | None: `etag`, `last_modified` e `page_hash`, ou None se nunca foi registrada.
+        """
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT etag, last_modified, page_hash
+                    FROM scrape_pages
+                    WHERE collection_name = :collection_name AND url = :url
+                """),
+                {"collection_name": self.collection_name, "url": url},
+            )
+            row = result.first()
+        return dict(row._mapping) if row else None
+
+    async def save_page_fetch_state(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        page_hash: str | None,
+        conn=None,
+    ) -> None:
+        """
+        Registra os metadados (ETag, Last-Modified, hash do conteúdo) de um scraping.
+
+        Args:
+            url: URL da página.
+            etag: ETag retornado pelo servidor.
+            last_modified: Last-Modified retornado pelo servidor.
+            page_hash: Hash do conteúdo extraído.
+            conn: Conexão de uma transação em andamento (opcional).
+        """
+        statement = text("""
+            INSERT INTO scrape_pages (collection_name, url, etag, last_modified, page_hash)
+            VALUES (:collection_name, :url, :etag, :last_modified, :page_hash)
+            ON CONFLICT (collection_name, url) DO UPDATE
+            SET etag = EXCLUDED.etag,
+                last_modified = EXCLUDED.last_modified,
+                page_hash = COALESCE(EXCLUDED.page_hash, scrape_pages.page_hash),
+                fetched_at = now()
+        """)
+        params = {
+            "collection_name": self.collection_name,
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "page_hash": page_hash,
+        }
+        if conn is not None:
+            await conn.execute(statement, params)
+            return
+        async with self.engine.begin() as conn:
+            await conn.execute(statement, params)
+
+    async def replace_source_documents(
+        self,
+        source: str,
+        documents: list[Document],
+        etag: str | None = None,
+        last_modified: str | None = None,
+        page_hash: str | None = None,
+    ) -> dict[str, int]:
+        """
+        Substitui os chunks de uma fonte, re-vetorizando apenas os que mudaram.
+
+        Chunks cujo hash de conteúdo já está armazenado são mantidos; os novos
+        são vetorizados e inseridos, e os que não existem mais são removidos.
+        Inserção, remoção e os metadados do scraping são gravados na mesma transação.
+
+        Args:
+            source: Fonte (URL) cujos chunks serão substituídos.
+            documents: Chunks atuais da fonte.
+            etag: ETag da resposta, registrado em `scrape_pages`.
+            last_modified: Last-Modified da resposta, registrado em `scrape_pages`.
+            page_hash: Hash do conteúdo extraído, registrado em `scrape_pages`.
+
+        Returns:
+            dict[str, int]: Chunks adicionados, removidos e inalterados.
+        """
+        unique: dict[str, Document] = {}
+        for doc in documents:
+            content_hash = _content_hash(doc, self.collection_name)
+            doc.metadata["content_hash"] = content_hash
+            unique.setdefault(content_hash, doc)
+
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT id, cmetadata ->> 'content_hash' AS content_hash
+                    FROM langchain_pg_embedding
+                    WHERE collection_id = :collection_id
+                      AND cmetadata ->> 'source' = :source
+                """),
+                {"collection_id": self.collection_id, "source": source},
+            )
+            existing = {row.content_hash or row.id: row.id for row in result.fetchall()}
+
+        added = [
+            doc for content_hash, doc in unique.items() if content_hash not in existing
+        ]
+        stale = [
+            row_id
+            for content_hash, row_id in existing.items()
+            if content_hash not in unique
+        ]
+
+        started_at = time.perf_counter()
+        embeddings: list[list[float]] = []
+        for start in range(0, len(added), self.embedding_batch_size):
+            batch = added[start : start + self.embedding_batch_size]
+            embeddings.extend(
+                await self._embed_documents([doc.page_content for doc in batch])
+            )
+        self.embedding_seconds += time.perf_counter() - started_at
+        self.embedded_chunks += len(added)
+
+        async with self.engine.begin() as conn:
+            if stale:
+                await conn.execute(
+                    text("DELETE FROM langchain_pg_embedding WHERE id = ANY(:ids)"),
+                    {"ids": stale},
+                )
+            if added:
+                await conn.execute(
+                    text("""
+                        INSERT INTO langchain_pg_embedding
+                            (id, collection_id, embedding, document, cmetadata)
+                        VALUES (
+                            :id, :collection_id, CAST(:embedding AS vector),
+                            :document, CAST(:cmetadata AS jsonb)
+                        )
+                        ON CONFLICT (id) DO NOTHING
+                    """),
+                    [
+                        {
+                            "id": doc.metadata["content_hash"],
+                            "collection_id": self.collection_id,
+                            "embedding": _to_pgvector(embedding),
+                            "document": doc.page_content,
+                            "cmetadata": json.dumps(doc.metadata),
+                        }
+                        for doc, embedding in zip(added, embeddings)
+                    ],
+                )
+            await self.save_page_fetch_state(
+                source, etag, last_modified, page_hash, conn=conn
+            )
+
+        if added or stale:
+            await self.catalog.add_sources({source})
+
+        logger.info(
+            "Source documents replaced | source=%s | added=%d | removed=%d | unchanged=%d",
+            source,
+            len(added),
+            len(stale),
+            len(unique) - len(added),
+        )
+        return {
+            "added": len(added),
+            "removed": len(stale),
+            "unchanged": len(unique) - len(added),
+        }
+
+    def ingestion_metrics(self) -> dict[str, float]:
+        """
+        Retorna métricas acumuladas de ingestão desde o startup.
+
+        Returns:
+            dict[str, float]: Chunks vetorizados, tempos de embedding/INSERT e throughput.
+        """
+        return {
+            "embedded_chunks": self.embedded_chunks,
+            "embedding_seconds": round(self.embedding_seconds, 3),
+            "insert_seconds": round(self.insert_seconds, 3),
+            "embedding_chunks_per_sec": round(
+                self.embedded_chunks / self.embedding_seconds, 1
+            )
+            if self.embedding_seconds
+            else 0.0,
+            "batch_size": self.embedding_batch_size,
+            "duplicates_skipped": self.duplicates_skipped,
+            "embedding_cache": self.embeddings.stats(),
+        }
+
+    async def search(
+        self,
+        query: str,
+        k: int = 4,
+        filter_by_file: str | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        mode: str = "vector",
+        embedding: list[float] | None = None,
+        filter_by_sheet: str | None = None,
     ) -> list[Document]:
         """
-        Realiza busca por similaridade no vector store.
+        Realiza busca por similaridade (distância cosseno) no vector store.
+
+        No modo "hybrid", a busca vetorial e a busca full-text (tsvector em
+        português/inglês) rodam em paralelo e são combinadas por Reciprocal
+        Rank Fusion, o que recupera identificadores exatos (CNPJs, números de
+        contrato, valores de colunas) que a busca densa costuma perder.
+
+        Com RERANK_ENABLED, são buscados RERANK_CANDIDATES candidatos e o
+        top-k é escolhido pelo cross-encoder (ver CrossEncoderReranker).
+
+        Resultados ficam no RetrievalCache, com chave pela query normalizada,
+        parâmetros e versão do catálogo; o embedding da query é cacheado à parte
+        pelo CachedEmbeddings.
 
         Args:
             query: Texto de busca.
             k: Número de resultados a retornar.
             filter_by_file: Filtrar por fonte específica.
+            ef_search: `hnsw.ef_search` desta consulta (maior = mais recall, mais lento).
+            probes: `ivfflat.probes` desta consulta (maior = mais recall, mais lento).
+            mode: "vector" (padrão) ou "hybrid".
+            embedding: Embedding da query já calculado (evita um novo encode).
+            filter_by_sheet: Filtrar por aba de planilha (metadado `sheet`).
 
         Returns:
             list[Document]: Documentos mais similares à query.
+
+        Raises:
+            ValueError: Se o modo de busca é inválido.
         """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Modo de busca inválido: {mode}")
+
         try:
-            filter_dict = None
-            if filter_by_file:
-                filter_dict = {"source": filter_by_file}
+            normalized_query = " ".join(query.split())
+            filters = {
+                key: value
+                for key, value in (
+                    ("source", filter_by_file),
+                    ("sheet", filter_by_sheet),
+                )
+                if value
+            }
+            cache_key = (
+                normalized_query.casefold(),
+                k,
+                filter_by_file,
+                filter_by_sheet,
+                ef_search,
+                probes,
+                mode,
+                self.catalog.version,
+            )
+
+            async def compute() -> list[Document]:
+                fetch_k = max(k, self.reranker.candidates) if self.reranker else k
+                query_embedding = embedding
+                if mode == "hybrid":
+                    docs = await self._search_hybrid(
+                        normalized_query,
+                        fetch_k,
+                        filters,
+                        ef_search,
+                        probes,
+                        query_embedding,
+                    )
+                else:
+                    if query_embedding is None:
+                        query_embedding = await self._embed_query(normalized_query)
+                    docs = await self._search_by_vector(
+                        query_embedding,
+                        fetch_k,
+                        filters,
+                        ef_search=ef_search,
+                        probes=probes,
+                    )
+                if self.reranker:
+                    return await self.reranker.rerank(normalized_query, docs, k)
+                return docs
 
-            docs = self.store.similarity_search(query, k=k, filter=filter_dict)
+            docs = await self.retrieval_cache.get_or_compute(cache_key, compute)
             logger.debug(
-                "Search completed | query=%s | k=%d | filter=%s | results=%d",
+                "Search completed | query=%s | k=%d | filter=%s | mode=%s | results=%d | cache_hit_ratio=%.3f | cache_saved_ms=%.1f",
                 query[:50],
                 k,
-                filter_by_file,
+                filters,
+                mode,
                 len(docs),
+                self.retrieval_cache.stats()["hit_ratio"],
+                self.retrieval_cache.stats()["saved_ms"],
             )
             return docs
         except Exception as e:
@@ -87,37 +553,184 @@ class VectorStoreService:
             )
             raise
 
-    def list_files(self) -> list[str]:
+    async def search_many(
+        self,
+        queries: list[tuple[str, str | None, str | None]],
+        k: int = 4,
+        mode: str = "vector",
+    ) -> list[list[Document]]:
         """
-        Lista todas as fontes (arquivos/URLs) armazenadas.
+        Executa várias buscas de uma vez.
+
+        Os embeddings de todas as queries são calculados numa única chamada ao
+        modelo e as consultas ao banco rodam em paralelo.
+
+        Args:
+            queries: Triplas (query, filtro de fonte opcional, filtro de aba opcional).
+            k: Número de resultados por query.
+            mode: "vector" (padrão) ou "hybrid".
 
         Returns:
-            list[str]: Lista de nomes de fontes únicas.
+            list[list[Document]]: Resultados de cada query, na mesma ordem.
         """
-        try:
-            with self.store.session_maker() as session:
-                collection = self.store.get_collection(session)
+        if not queries:
+            return []
 
-                if not collection:
-                    logger.warning("No collection found")
-                    return []
+        normalized = [" ".join(query.split()) for query, _, _ in queries]
+        started_at = time.perf_counter()
+        embeddings = await self._embed_documents(normalized)
+        embed_ms = (time.perf_counter() - started_at) * 1000
 
-                query = text("""
-                    SELECT DISTINCT cmetadata ->> 'source' as source
-                    FROM langchain_pg_embedding
-                    WHERE collection_id = :collection_id
-                      AND cmetadata ->> 'source' IS NOT NULL
-                """)
+        results = await asyncio.gather(
+            *(
+                self.search(
+                    query,
+                    k=k,
+                    filter_by_file=file_name,
+                    mode=mode,
+                    embedding=embedding,
+                    filter_by_sheet=sheet,
+                )
+                for query, (_, file_name, sheet), embedding in zip(
+                    normalized, queries, embeddings
+                )
+            )
+        )
+        logger.info(
+            "Batched search completed | queries=%d | k=%d | mode=%s | embed_ms=%.1f | total_ms=%.1f",
+            len(queries),
+            k,
+            mode,
+            embed_ms,
+            (time.perf_counter() - started_at) * 1000,
+        )
+        return list(results)
 
-                result = session.execute(query, {"collection_id": collection.uuid})
-                files = [row[0] for row in result.fetchall()]
-                logger.debug("Listed files | count=%d", len(files))
-                return files
+    async def _search_hybrid(
+        self,
+        query: str,
+        k: int,
+        filters: dict[str, str],
+        ef_search: int | None,
+        probes: int | None,
+        embedding: list[float] | None = None,
+    ) -> list[Document]:
+        candidates = max(k * self.hybrid_candidate_multiplier, k)
+
+        async def vector_candidates() -> list[Document]:
+            nonlocal embedding
+            if embedding is None:
+                embedding = await self._embed_query(query)
+            return await self._search_by_vector(
+                embedding, candidates, filters, ef_search=ef_search, probes=probes
+            )
+
+        vector_docs, text_docs = await asyncio.gather(
+            vector_candidates(),
+            self._search_full_text(query, candidates, filters),
+        )
+
+        scores: dict[str, float] = {}
+        docs_by_id: dict[str, Document] = {}
+        for ranking in (vector_docs, text_docs):
+            for rank, doc in enumerate(ranking, start=1):
+                scores[doc.id] = scores.get(doc.id, 0.0) + 1.0 / (RRF_K + rank)
+                docs_by_id.setdefault(doc.id, doc)
+
+        fused = sorted(scores, key=scores.get, reverse=True)[:k]
+        logger.debug(
+            "Hybrid search fused | vector=%d | full_text=%d | results=%d",
+            len(vector_docs),
+            len(text_docs),
+            len(fused),
+        )
+        return [docs_by_id[doc_id] for doc_id in fused]
+
+    async def _search_full_text(
+        self, query: str, k: int, filters: dict[str, str] | None = None
+    ) -> list[Document]:
+        tokens = FULL_TEXT_TOKEN_PATTERN.findall(query)
+        if not tokens:
+            return []
+
+        sql = """
+            WITH q AS (
+                SELECT websearch_to_tsquery('portuguese', :query)
+                    || websearch_to_tsquery('english', :query) AS tsq
+            )
+            SELECT id, document, cmetadata,
+                   ts_rank_cd(document_tsv, q.tsq) AS rank
+            FROM langchain_pg_embedding, q
+            WHERE collection_id = :collection_id
+              AND document_tsv @@ q.tsq
+        """
+        params = {
+            "query": " or ".join(tokens),
+            "collection_id": self.collection_id,
+            "k": k,
+        }
+        sql += _metadata_filter_sql(filters, params)
+        sql += " ORDER BY rank DESC LIMIT :k"
+
+        async with self.engine.connect() as conn:
+            result = await conn.execute(text(sql), params)
+            return [
+                Document(id=row.id, page_content=row.document, metadata=row.cmetadata)
+                for row in result.fetchall()
+            ]
+
+    async def _search_by_vector(
+        self,
+        embedding: list[float],
+        k: int,
+        filters: dict[str, str] | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[Document]:
+        sql = """
+            SELECT id, document, cmetadata,
+                   embedding <=> CAST(:embedding AS vector) AS distance
+            FROM langchain_pg_embedding
+            WHERE collection_id = :collection_id
+        """
+        params = {
+            "embedding": _to_pgvector(embedding),
+            "collection_id": self.collection_id,
+            "k": k,
+        }
+        sql += _metadata_filter_sql(filters, params)
+        sql += " ORDER BY distance LIMIT :k"
+        # Com iterative scan em relaxed_order o índice pode devolver as linhas
+        # fora de ordem; o CTE materializado garante a ordenação final.
+        sql = (
+            f"WITH candidates AS MATERIALIZED ({sql}) "
+            "SELECT * FROM candidates ORDER BY distance"
+        )
+
+        async with self.engine.begin() as conn:
+            await self.vector_index.apply_search_params(conn, ef_search, probes)
+            result = await conn.execute(text(sql), params)
+            return [
+                Document(id=row.id, page_content=row.document, metadata=row.cmetadata)
+                for row in result.fetchall()
+            ]
+
+    async def list_files(self) -> list[str]:
+        """
+        Lista todas as fontes (arquivos/URLs) armazenadas.
+
+        Returns:
+            list[str]: Lista de nomes de fontes únicas.
+        """
+        try:
+            files = await self.catalog.list_sources()
+            logger.debug("Listed files | count=%d", len(files))
+            return files
         except Exception as e:
             logger.error("Failed to list files | error=%s", str(e))
             raise
 
-    def document_exists(self, source: str) -> bool:
+    async def document_exists(self, source: str) -> bool:
         """
         Verifica se uma fonte já existe no vector store.
 
@@ -128,26 +741,157 @@ class VectorStoreService:
             bool: True se existe, False caso contrário.
         """
         try:
-            with self.store.session_maker() as session:
-                collection = self.store.get_collection(session)
-                if not collection:
-                    return False
-
-                query = text("""
-                    SELECT 1
-                    FROM langchain_pg_embedding
-                    WHERE collection_id = :collection_id
-                      AND cmetadata ->> 'source' = :source
-                    LIMIT 1
-                """)
-
-                result = session.execute(
-                    query, {"collection_id": collection.uuid, "source": source}
-                )
-                exists = bool(result.scalar())
-                logger.debug("Document exists check | source=%s | exists=%s", source, exists)
-                return exists
+            exists = await self.catalog.contains(source)
+            logger.debug("Document exists check | source=%s | exists=%s", source, exists)
+            return exists
         except Exception as e:
             logger.error("Failed to check document exists | source=%s | error=%s", source, str(e))
             raise
 
+    async def explain_source_queries(self, source: str) -> list[dict]:
+        """
+        Executa EXPLAIN nas consultas filtradas por `cmetadata ->> 'source'`.
+
+        Usado pelo endpoint de diagnóstico para verificar se os índices de
+        metadados estão sendo utilizados.
+
+        Args:
+            source: Fonte usada como valor do filtro.
+
+        Returns:
+            list[dict]: Para cada consulta, nome, índices usados e tipos de nó do plano.
+        """
+        queries = {
+            "document_exists": """
+                SELECT 1 FROM langchain_pg_embedding
+                WHERE collection_id = :collection_id
+                  AND cmetadata ->> 'source' = :source
+                LIMIT 1
+            """,
+            "filter_by_file": """
+                SELECT id FROM langchain_pg_embedding
+                WHERE collection_id = :collection_id
+                  AND cmetadata ->> 'source' = :source
+            """,
+            "metadata_containment": """
+                SELECT id FROM langchain_pg_embedding
+                WHERE cmetadata @> jsonb_build_object('source', CAST(:source AS text))
+            """,
+            "list_files": """
+                SELECT DISTINCT cmetadata ->> 'source' FROM langchain_pg_embedding
+                WHERE collection_id = :collection_id
+                  AND cmetadata ->> 'source' IS NOT NULL
+            """,
+        }
+
+        async with self.engine.connect() as conn:
+            plans = []
+            for name, query in queries.items():
+                result = await conn.execute(
+                    text(f"EXPLAIN (FORMAT JSON) {query}"),
+                    {"collection_id": self.collection_id, "source": source},
+                )
+                plan = result.scalar()[0]["Plan"]
+                indexes, node_types = _collect_plan_nodes(plan)
+                plans.append(
+                    {
+                        "name": name,
+                        "uses_index": bool(indexes),
+                        "indexes": sorted(indexes),
+                        "node_types": node_types,
+                        "total_cost": plan.get("Total Cost"),
+                    }
+                )
+
+        logger.debug("Explained source queries | source=%s | plans=%d", source, len(plans))
+        return plans
+
+    async def index_usage(self) -> dict[str, int]:
+        """
+        Retorna o número de scans por índice da tabela de embeddings.
+
+        Returns:
+            dict[str, int]: Nome do índice -> `idx_scan` de `pg_stat_user_indexes`.
+        """
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT indexrelname, idx_scan
+                    FROM pg_stat_user_indexes
+                    WHERE relname = 'langchain_pg_embedding'
+                """)
+            )
+            return {row[0]: row[1] for row in result.fetchall()}
+
+
+def _content_hash(doc: Document, collection_name: str) -> str:
+    # O hash também é o id (chave primária de toda a tabela): sem a coleção, o
+    # mesmo arquivo ingerido em outra coleção moveria as linhas da primeira.
+    source = doc.metadata.get("source") or ""
+    return hashlib.sha256(
+        f"{collection_name}\0{source}\0{doc.page_content}".encode("utf-8")
+    ).hexdigest()
+
+
+def _metadata_filter_sql(filters: dict[str, str] | None, params: dict) -> str:
+    sql = ""
+    for key, value in (filters or {}).items():
+        sql += f" AND cmetadata ->> '{key}' = :filter_{key}"
+        params[f"filter_{key}"] = value
+    return sql
+
+
+def _to_pgvector(embedding: list[float]) -> str:
+    return "[" + ",".join(str(value) for value in embedding) + "]"
+
+
+def _collect_plan_nodes(plan: dict) -> tuple[set[str], list[str]]:
+    indexes = set()
+    node_types = [plan["Node Type"]]
+    if plan.get("Index Name"):
+        indexes.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        child_indexes, child_nodes = _collect_plan_nodes(child)
+        indexes |= child_indexes
+        node_types.extend(child_nodes)
+    return indexes, node_types
+
+
+async def init_vector_store_service(app: Litestar) -> None:
+    """
+    Cria a instância compartilhada do VectorStoreService no startup da aplicação.
+
+    O modelo de embeddings e o pool de conexões são carregados uma única vez
+    e reutilizados por todos os handlers via injeção de dependência.
+
+    Args:
+        app: Aplicação Litestar cujo state receberá o serviço.
+    """
+    service = VectorStoreService()
+    await service.initialize()
+    app.state.vector_store_service = service
+
+
+async def close_vector_store_service(app: Litestar) -> None:
+    """
+    Encerra a instância compartilhada do VectorStoreService no shutdown.
+
+    Args:
+        app: Aplicação Litestar que contém o serviço no state.
+    """
+    service = app.state.get("vector_store_service")
+    if service:
+        await service.close()
+
+
+def provide_vector_store_service(state: State) -> VectorStoreService:
+    """
+    Provider de dependência que retorna o VectorStoreService compartilhado.
+
+    Args:
+        state: State da aplicação Litestar.
+
+    Returns:
+        VectorStoreService: Instância criada no startup.
+    """
+    return state.vector_store_service
@@ -0,0 +1,146 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.documents import Document
+from sentence_transformers import CrossEncoder
+from src.logging_config import get_logger
+
+logger = get_logger("reranker")
+
+SKIP_COST_DECAY = 0.8
+
+
+class CrossEncoderReranker:
+    """
+    Reordena candidatos da busca vetorial com um cross-encoder local.
+
+    O modelo (RERANK_MODEL_NAME) é carregado uma única vez no startup. Os pares
+    (query, chunk) são pontuados em lotes de RERANK_BATCH_SIZE num executor
+    dedicado. Se o custo estimado (média móvel de ms por par) ou o tempo já
+    gasto ultrapassar RERANK_BUDGET_MS, o rerank é abandonado e a ordem
+    original da busca é mantida. A cada rerank ignorado a estimativa decai,
+    de modo que o rerank volta a ser tentado e a estimativa é remedida.
+    """
+
+    def __init__(self) -> None:
+        self.model_name = os.getenv(
+            "RERANK_MODEL_NAME", "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+        )
+        self.candidates = int(os.getenv("RERANK_CANDIDATES", "20"))
+        self.batch_size = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+        self.budget_ms = float(os.getenv("RERANK_BUDGET_MS", "500"))
+        self.reranked = 0
+        self.skipped = 0
+        self.pairs_scored = 0
+        self.rerank_seconds = 0.0
+        self._ms_per_pair: float | None = None
+
+        started_at = time.perf_counter()
+        self.model = CrossEncoder(self.model_name)
+        self.model.predict([("warmup", "warmup")])
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+        logger.info(
+            "Reranker loaded | model=%s | candidates=%d | budget_ms=%.0f | load_ms=%.1f",
+            self.model_name,
+            self.candidates,
+            self.budget_ms,
+            (time.perf_counter() - started_at) * 1000,
+        )
+
+    async def rerank(self, query: str, docs: list[Document], k: int) -> list[Document]:
+        """
+        Retorna os `k` documentos mais relevantes segundo o cross-encoder.
+
+        Args:
+            query: Texto da busca.
+            docs: Candidatos na ordem da busca vetorial.
+            k: Número de documentos a retornar.
+
+        Returns:
+            list[Document]: Top-k reordenado, ou o top-k original se o orçamento estourar.
+        """
+        if len(docs) <= 1:
+            return docs[:k]
+
+        if self._ms_per_pair and self._ms_per_pair * len(docs) > self.budget_ms:
+            self.skipped += 1
+            logger.info(
+                "Rerank skipped | estimated_ms=%.1f | budget_ms=%.0f",
+                self._ms_per_pair * len(docs),
+                self.budget_ms,
+            )
+            # Um rerank ignorado não mede nada; sem o decaimento, uma única
+            # execução lenta (ex.: cold start) desligaria o rerank para sempre.
+            self._ms_per_pair *= SKIP_COST_DECAY
+            return docs[:k]
+
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        scores: list[float] = []
+        for start in range(0, len(docs), self.batch_size):
+            pairs = [
+                (query, doc.page_content) for doc in docs[start : start + self.batch_size]
+            ]
+            batch_scores = await loop.run_in_executor(
+                self.executor, self.model.predict, pairs
+            )
+            scores.extend(float(score) for score in batch_scores)
+
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            self._update_cost(elapsed_ms / len(scores))
+            if elapsed_ms > self.budget_ms and len(scores) < len(docs):
+                self.skipped += 1
+                logger.info(
+                    "Rerank aborted | scored=%d/%d | elapsed_ms=%.1f | budget_ms=%.0f",
+                    len(scores),
+                    len(docs),
+                    elapsed_ms,
+                    self.budget_ms,
+                )
+                return docs[:k]
+
+        elapsed = time.perf_counter() - started_at
+        self.reranked += 1
+        self.pairs_scored += len(docs)
+        self.rerank_seconds += elapsed
+
+        ranked = sorted(range(len(docs)), key=lambda i: scores[i], reverse=True)
+        logger.debug(
+            "Rerank completed | candidates=%d | k=%d | elapsed_ms=%.1f | moved=%d",
+            len(docs),
+            k,
+            elapsed * 1000,
+            sum(1 for position, i in enumerate(ranked[:k]) if i != position),
+        )
+        return [docs[i] for i in ranked[:k]]
+
+    def stats(self) -> dict[str, float]:
+        """
+        Retorna estatísticas de custo do rerank.
+
+        Returns:
+            dict[str, float]: Reranks executados/ignorados, pares pontuados e latência média.
+        """
+        return {
+            "model": self.model_name,
+            "candidates": self.candidates,
+            "budget_ms": self.budget_ms,
+            "reranked": self.reranked,
+            "skipped": self.skipped,
+            "pairs_scored": self.pairs_scored,
+            "avg_rerank_ms": round(self.rerank_seconds * 1000 / self.reranked, 1)
+            if self.reranked
+            else 0.0,
+            "ms_per_pair": round(self._ms_per_pair or 0.0, 2),
+        }
+
+    def close(self) -> None:
+        """Encerra o executor do cross-encoder."""
+        self.executor.shutdown(wait=False)
+
+    def _update_cost(self, ms_per_pair: float) -> None:
+        if self._ms_per_pair is None:
+            self._ms_per_pair = ms_per_pair
+        else:
+            self._ms_per_pair = 0.8 * self._ms_per_pair + 0.2 * ms_per_pair
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from langchain_core.documents import Document
+from src.logging_config import get_logger
+
+logger = get_logger("retrieval_cache")
+
+
+class RetrievalCache:
+    """
+    Cache LRU + TTL de resultados de busca do VectorStoreService.
+
+    Chamadas concorrentes com a mesma chave compartilham uma única execução
+    (single-flight). A chave inclui a versão do catálogo de fontes, então
+    qualquer ingestão torna as entradas anteriores inalcançáveis.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = 300.0) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._entries: OrderedDict[Hashable, tuple[float, float, list[Document]]] = (
+            OrderedDict()
+        )
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[list[Document]]],
+    ) -> list[Document]:
+        """
+        Retorna o resultado em cache ou executa `compute` e armazena o resultado.
+
+        Args:
+            key: Chave da busca.
+            compute: Função assíncrona que executa a busca.
+
+        Returns:
+            list[Document]: Documentos encontrados (nova lista a cada chamada).
+        """
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] <= self.ttl_seconds:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry[1]
+            logger.debug("Retrieval cache hit | saved_ms=%.1f", entry[1] * 1000)
+            return list(entry[2])
+
+        in_flight = self._in_flight.get(key)
+        if in_flight:
+            self.hits += 1
+            return list(await asyncio.shield(in_flight))
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        started_at = time.perf_counter()
+        try:
+            docs = await compute()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+        elapsed = time.perf_counter() - started_at
+        future.set_result(docs)
+        self._entries[key] = (time.monotonic(), elapsed, docs)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return list(docs)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Retorna estatísticas de acerto do cache.
+
+        Returns:
+            dict[str, float]: Hits, misses, hit ratio, tempo economizado e número de entradas.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "saved_ms": round(self.saved_seconds * 1000, 1),
+            "entries": len(self._entries),
+        }
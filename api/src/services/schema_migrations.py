@@ -0,0 +1,190 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from src.logging_config import get_logger
+
+logger = get_logger("schema_migrations")
+
+MIGRATIONS_LOCK_ID = 7_413_201
+
+# (versão, descrição, comandos SQL). Novas migrações devem ser apenas adicionadas ao fim.
+MIGRATIONS: list[tuple[int, str, list[str]]] = [
+    (
+        1,
+        "cmetadata source and gin indexes",
+        [
+            """
+            CREATE INDEX IF NOT EXISTS ix_langchain_pg_embedding_collection_source
+            ON langchain_pg_embedding (collection_id, (cmetadata ->> 'source'))
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_langchain_pg_embedding_cmetadata_gin
+            ON langchain_pg_embedding USING gin (cmetadata)
+            """,
+        ],
+    ),
+    (
+        2,
+        "content hash index for insert deduplication",
+        [
+            """
+            CREATE INDEX IF NOT EXISTS ix_langchain_pg_embedding_collection_content_hash
+            ON langchain_pg_embedding (collection_id, (cmetadata ->> 'content_hash'))
+            """,
+        ],
+    ),
+    (
+        3,
+        "ingestion jobs table",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS ingestion_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                files JSONB NOT NULL,
+                chunks_generated INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_ingestion_jobs_status
+            ON ingestion_jobs (status)
+            """,
+        ],
+    ),
+    (
+        4,
+        "agent checkpoints table",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS agent_checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_type TEXT NOT NULL,
+                checkpoint BYTEA NOT NULL,
+                metadata_type TEXT NOT NULL,
+                metadata BYTEA NOT NULL,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                PRIMARY KEY (thread_id, checkpoint_ns)
+            )
+            """,
+        ],
+    ),
+    (
+        5,
+        "full-text search column and gin index",
+        [
+            """
+            ALTER TABLE langchain_pg_embedding
+            ADD COLUMN IF NOT EXISTS document_tsv tsvector
+            GENERATED ALWAYS AS (
+                to_tsvector('portuguese', coalesce(document, ''))
+                || to_tsvector('english', coalesce(document, ''))
+            ) STORED
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS ix_langchain_pg_embedding_document_tsv
+            ON langchain_pg_embedding USING gin (document_tsv)
+            """,
+        ],
+    ),
+    (
+        6,
+        "scraped pages fetch metadata table",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS scrape_pages (
+                collection_name TEXT NOT NULL,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                page_hash TEXT,
+                fetched_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                PRIMARY KEY (collection_name, url)
+            )
+            """,
+        ],
+    ),
+    (
+        7,
+        "collection-scoped content hash ids",
+        [
+            # Mesmo hash de _content_hash: sha256(coleção \0 fonte \0 conteúdo).
+            """
+            WITH rehashed AS (
+                SELECT e.id AS old_id,
+                       encode(sha256(
+                           convert_to(c.name, 'UTF8') || '\\x00'::bytea
+                           || convert_to(coalesce(e.cmetadata ->> 'source', ''), 'UTF8')
+                           || '\\x00'::bytea
+                           || convert_to(e.document, 'UTF8')
+                       ), 'hex') AS new_id
+                FROM langchain_pg_embedding e
+                JOIN langchain_pg_collection c ON c.uuid = e.collection_id
+                WHERE e.id = e.cmetadata ->> 'content_hash'
+            )
+            UPDATE langchain_pg_embedding e
+            SET id = r.new_id,
+                cmetadata = jsonb_set(e.cmetadata, '{content_hash}', to_jsonb(r.new_id))
+            FROM rehashed r
+            WHERE e.id = r.old_id
+            """,
+        ],
+    ),
+    (
+        8,
+        "agent checkpoint id for compare-and-set writes",
+        [
+            """
+            ALTER TABLE agent_checkpoints
+            ADD COLUMN IF NOT EXISTS checkpoint_id TEXT
+            """,
+        ],
+    ),
+]
+
+
+async def run_migrations(engine: AsyncEngine) -> None:
+    """
+    Aplica as migrações de schema pendentes de forma idempotente.
+
+    As versões aplicadas ficam registradas em `impar_schema_migrations` e um
+    advisory lock impede que vários workers migrem ao mesmo tempo.
+
+    Args:
+        engine: Engine assíncrona do banco vetorial.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(:lock_id)"),
+            {"lock_id": MIGRATIONS_LOCK_ID},
+        )
+        await conn.execute(
+            text("""
+                CREATE TABLE IF NOT EXISTS impar_schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT NOT NULL,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+            """)
+        )
+        result = await conn.execute(text("SELECT version FROM impar_schema_migrations"))
+        applied = {row[0] for row in result.fetchall()}
+
+        for version, description, statements in MIGRATIONS:
+            if version in applied:
+                continue
+
+            logger.info("Applying migration | version=%d | %s", version, description)
+            for statement in statements:
+                await conn.execute(text(statement))
+            await conn.execute(
+                text("""
+                    INSERT INTO impar_schema_migrations (version, description)
+                    VALUES (:version, :description)
+                """),
+                {"version": version, "description": description},
+            )
+
+    logger.info("Schema migrations up to date | latest=%d", MIGRATIONS[-1][0])
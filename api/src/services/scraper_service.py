@@ -1,103 +1,361 @@
+import asyncio
+import hashlib
+import multiprocessing
 import os
-from anyio import to_thread
-import requests
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urldefrag, urljoin, urlparse
+import httpx
 from bs4 import BeautifulSoup
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from src.logging_config import get_logger
+from litestar import Litestar
+from litestar.datastructures import State
+from src.logging_config import get_logger, setup_logging
+from src.services.chunking import get_chunking_engine
 
 logger = get_logger("scraper_service")
 
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+HEADING_TAGS = ["h1", "h2", "h3", "h4"]
+
+
+class PageFetch:
+    """Resultado de uma busca condicional de página."""
+
+    def __init__(
+        self,
+        url: str,
+        chunks: list[Document],
+        etag: str | None,
+        last_modified: str | None,
+        page_hash: str | None,
+        not_modified: bool = False,
+    ) -> None:
+        self.url = url
+        self.chunks = chunks
+        self.etag = etag
+        self.last_modified = last_modified
+        self.page_hash = page_hash
+        self.not_modified = not_modified
+
 
 class ScraperService:
-    """Serviço de scraping de páginas web."""
+    """
+    Serviço de scraping de páginas web.
 
-    def __init__(self):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000, chunk_overlap=200, separators=["\n\n", "\n", " ", ""]
-        )
+    As requisições usam um único httpx.AsyncClient (pool de conexões
+    keep-alive), com no máximo SCRAPER_PER_HOST_LIMIT requisições simultâneas
+    por host e retentativas com backoff exponencial para erros de rede e
+    respostas 429/5xx. O parsing do HTML e o chunking rodam num pool de processos.
+    """
+
+    def __init__(self, client: httpx.AsyncClient | None = None) -> None:
         self.default_url = os.getenv("SCRAPE_URL")
+        self.max_concurrency = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "8"))
+        self.per_host_limit = int(os.getenv("SCRAPER_PER_HOST_LIMIT", "2"))
+        self.max_retries = int(os.getenv("SCRAPER_MAX_RETRIES", "3"))
+        self.retry_backoff = float(os.getenv("SCRAPER_RETRY_BACKOFF_SECONDS", "0.5"))
+        self.max_pages = int(os.getenv("SCRAPER_MAX_PAGES", "50"))
+        self.parse_workers = int(os.getenv("SCRAPER_PARSE_WORKERS", "2"))
+        self.client = client or httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=float(os.getenv("SCRAPER_TIMEOUT_SECONDS", "10")),
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+        self.pool: ProcessPoolExecutor | None = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
         logger.info("ScraperService initialized | default_url=%s", self.default_url)
 
-    async def scrape_and_chunk(self, url: str | None = None) -> list[Document]:
-        """
-        Realiza scraping de uma URL e retorna conteúdo em chunks.
+    def start(self) -> None:
+        """Cria o pool de processos usado no parsing do HTML."""
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_parse_worker,
+        )
+        logger.info("Scraper parse pool started | workers=%d", self.parse_workers)
 
-        Atualmente otimizado para páginas da Wikipedia.
+    async def close(self) -> None:
+        """Fecha o cliente HTTP e o pool de processos."""
+        await self.client.aclose()
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        logger.info("ScraperService closed")
+
+    async def fetch_page(
+        self,
+        url: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> PageFetch:
+        """
+        Busca uma página com requisição condicional (If-None-Match / If-Modified-Since).
 
         Args:
-            url: URL para scraping. Usa default_url se não informada.
+            url: URL da página.
+            etag: ETag da busca anterior.
+            last_modified: Last-Modified da busca anterior.
 
         Returns:
-            list[Document]: Lista de chunks prontos para vetorização.
+            PageFetch: Chunks e metadados de cache; `not_modified` se o servidor respondeu 304.
 
         Raises:
-            RequestException: Se falhar ao buscar a URL.
+            HTTPError: Se falhar ao buscar a URL.
             ValueError: Se não conseguir extrair conteúdo.
         """
-        target_url = url or self.default_url
-        logger.info("Starting scrape | url=%s", target_url)
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-        }
+        response = await self._fetch(url, headers=headers)
+        if response.status_code == 304:
+            logger.info("Page not modified | url=%s", url)
+            return PageFetch(url, [], etag, last_modified, None, not_modified=True)
 
-        def fetch_url():
-            resp = requests.get(target_url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            return resp.text
+        chunks, _ = await self._parse_and_chunk(url, response.text)
+        if not chunks:
+            logger.error("No content extracted | url=%s", url)
+            raise ValueError("Não foi possível extrair conteúdo da página.")
 
-        try:
-            html_content = await to_thread.run_sync(fetch_url)
-            logger.debug("Fetched HTML | url=%s | length=%d", target_url, len(html_content))
-        except requests.RequestException as e:
-            logger.error("Failed to fetch URL | url=%s | error=%s", target_url, str(e))
-            raise
+        return PageFetch(
+            url,
+            chunks,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            _page_hash(chunks),
+        )
+
+    async def crawl(
+        self, urls: list[str], depth: int = 0, max_pages: int | None = None
+    ) -> AsyncIterator[tuple[str, PageFetch | None, str | None]]:
+        """
+        Faz o crawl de várias URLs em paralelo e produz os chunks de cada página assim que fica pronta.
+
+        Com `depth > 0`, os links encontrados (apenas nos hosts das URLs
+        iniciais) são seguidos até essa profundidade. Até SCRAPER_MAX_CONCURRENCY
+        páginas são buscadas ao mesmo tempo.
+
+        Args:
+            urls: URLs iniciais.
+            depth: Profundidade máxima de links a seguir (0 = apenas as URLs informadas).
+            max_pages: Limite de páginas visitadas. Usa SCRAPER_MAX_PAGES se não informado.
+
+        Yields:
+            tuple[str, PageFetch | None, str | None]: URL, página (chunks e validadores
+            de cache) e erro (a página é None em caso de erro).
+        """
+        max_pages = max_pages or self.max_pages
+        allowed_hosts = {urlparse(url).netloc for url in urls}
+        frontier: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+        results: asyncio.Queue[tuple[str, PageFetch | None, str | None]] = asyncio.Queue(
+            maxsize=self.max_concurrency
+        )
+
+        seen: set[str] = set()
+        for url in urls:
+            url = urldefrag(url).url
+            if url not in seen and len(seen) < max_pages:
+                seen.add(url)
+                frontier.put_nowait((url, 0))
 
+        async def worker() -> None:
+            while True:
+                url, level = await frontier.get()
+                try:
+                    response = await self._fetch(url)
+                    chunks, links = await self._parse_and_chunk(url, response.text)
+                    if level < depth:
+                        for link in links:
+                            if len(seen) >= max_pages:
+                                break
+                            if link not in seen and urlparse(link).netloc in allowed_hosts:
+                                seen.add(link)
+                                frontier.put_nowait((link, level + 1))
+                    page = PageFetch(
+                        url,
+                        chunks,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        _page_hash(chunks) if chunks else None,
+                    )
+                    await results.put((url, page, None))
+                except Exception as e:
+                    logger.warning("Crawl page failed | url=%s | error=%s", url, str(e))
+                    await results.put((url, None, str(e)))
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.max_concurrency, max_pages))
+        ]
+        logger.info(
+            "Crawl started | seeds=%d | depth=%d | max_pages=%d | concurrency=%d",
+            len(seen),
+            depth,
+            max_pages,
+            len(workers),
+        )
         try:
-            text_content = self._parse_wikipedia(html_content)
+            completed = 0
+            while completed < len(seen):
+                yield await results.get()
+                completed += 1
+            logger.info("Crawl completed | pages=%d", completed)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _fetch(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.setdefault(
+            host, asyncio.Semaphore(self.per_host_limit)
+        )
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    response = await self.client.get(url, headers=headers)
+                    if response.status_code == 304:
+                        return response
+                    response.raise_for_status()
+                    return response
+            except httpx.HTTPError as e:
+                retryable = isinstance(e, httpx.TransportError) or (
+                    isinstance(e, httpx.HTTPStatusError)
+                    and e.response.status_code in RETRY_STATUS_CODES
+                )
+                if not retryable or attempt == self.max_retries:
+                    logger.error("Failed to fetch URL | url=%s | error=%s", url, str(e))
+                    raise
+
+                delay = self.retry_backoff * 2**attempt
+                logger.warning(
+                    "Fetch failed, retrying | url=%s | attempt=%d | delay=%.1fs | error=%s",
+                    url,
+                    attempt + 1,
+                    delay,
+                    str(e),
+                )
+                await asyncio.sleep(delay)
+
+    async def _parse_and_chunk(
+        self, url: str, html: str
+    ) -> tuple[list[Document], list[str]]:
+        loop = asyncio.get_running_loop()
+        chunks, links = await loop.run_in_executor(self.pool, _parse_and_split, url, html)
+        logger.debug("Parsed content | url=%s | chunks=%d", url, len(chunks))
+        return chunks, links
+
+
+def _init_parse_worker() -> None:
+    setup_logging()
+    get_chunking_engine()
+
+
+def _parse_and_split(url: str, html: str) -> tuple[list[Document], list[str]]:
+    text_content, location, links = _parse_page(url, html)
+    if not text_content:
+        return [], links
+
+    raw_doc = Document(
+        page_content=text_content,
+        metadata={
+            "source": url,
+            "location": location,
+            "type": "web_scrape",
+        },
+    )
+    return get_chunking_engine().split_documents([raw_doc]), links
+
+
+def _page_hash(chunks: list[Document]) -> str:
+    return hashlib.sha256(
+        "\0".join(chunk.page_content for chunk in chunks).encode("utf-8")
+    ).hexdigest()
+
+
+def _parse_page(url: str, html: str) -> tuple[str, str, list[str]]:
+    soup = BeautifulSoup(html, "html.parser")
+
+    links = []
+    for anchor in soup.find_all("a", href=True):
+        link = urldefrag(urljoin(url, anchor["href"])).url
+        if urlparse(link).scheme in ("http", "https"):
+            links.append(link)
+
+    title = soup.title.get_text(strip=True) if soup.title else ""
+
+    for element in soup(["script", "style", "nav", "footer", "header", "aside"]):
+        element.decompose()
+
+    content_div = soup.find("div", {"id": "bodyContent"})
+    location = "Wikipedia"
+    if not content_div:
+        logger.debug("bodyContent not found, using body as fallback | url=%s", url)
+        content_div = soup.body
+        location = title or "Página web"
+    if not content_div:
+        return "", location, links
+
+    for ref in content_div.find_all("sup", class_="reference"):
+        ref.decompose()
+    for edit_link in content_div.find_all("span", class_="mw-editsection"):
+        edit_link.decompose()
+    # Títulos viram Markdown para o chunking separar o texto por seção.
+    for heading in content_div.find_all(HEADING_TAGS):
+        level = int(heading.name[1])
+        heading.replace_with(f"{'#' * level} {heading.get_text(' ', strip=True)}")
+    text = content_div.get_text(separator="\n", strip=True)
 
-            if not text_content:
-                logger.error("No content extracted | url=%s", target_url)
-                raise ValueError("Não foi possível extrair conteúdo da página.")
+    return text, location, list(dict.fromkeys(links))
 
-            logger.debug(
-                "Parsed content | url=%s | text_length=%d", target_url, len(text_content)
-            )
 
-            raw_doc = Document(
-                page_content=text_content,
-                metadata={
-                    "source": target_url,
-                    "location": "Wikipedia",
-                    "type": "web_scrape",
-                },
-            )
+def init_scraper_service(app: Litestar) -> None:
+    """
+    Cria o ScraperService compartilhado (cliente HTTP e pool de parsing) no startup.
 
-            chunks = self.text_splitter.split_documents([raw_doc])
-            logger.info("Scrape completed | url=%s | chunks=%d", target_url, len(chunks))
+    Args:
+        app: Aplicação Litestar cujo state receberá o serviço.
+    """
+    service = ScraperService()
+    service.start()
+    app.state.scraper_service = service
 
-            return chunks
-        except Exception as e:
-            logger.error("Scraping failed | url=%s | error=%s", target_url, str(e))
-            raise
 
-    def _parse_wikipedia(self, html: str) -> str:
-        soup = BeautifulSoup(html, "html.parser")
+async def close_scraper_service(app: Litestar) -> None:
+    """
+    Encerra o cliente HTTP e o pool de processos do ScraperService no shutdown.
 
-        for element in soup(["script", "style", "nav", "footer", "header", "aside"]):
-            element.decompose()
+    Args:
+        app: Aplicação Litestar que contém o serviço no state.
+    """
+    service = app.state.get("scraper_service")
+    if service:
+        await service.close()
 
-        content_div = soup.find("div", {"id": "bodyContent"})
-        if not content_div:
-            logger.warning("bodyContent not found, using body as fallback")
-            content_div = soup.body
 
-        for ref in content_div.find_all("sup", class_="reference"):
-            ref.decompose()
-        text = content_div.get_text(separator="\n", strip=True)
+def provide_scraper_service(state: State) -> ScraperService:
+    """
+    Provider de dependência que retorna o ScraperService compartilhado.
 
-        return text
+    Args:
+        state: State da aplicação Litestar.
 
+    Returns:
+        ScraperService: Instância criada no startup.
+    """
+    return state.scraper_service
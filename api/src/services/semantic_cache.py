@@ -0,0 +1,184 @@
+import os
+import time
+from collections import OrderedDict
+import numpy as np
+from litestar import Litestar
+from litestar.datastructures import State
+from src.logging_config import get_logger
+from src.services.pgvector_service import VectorStoreService
+
+logger = get_logger("semantic_cache")
+
+
+class CachedAnswer:
+    """Resposta armazenada para replay: eventos SSE e fontes consultadas."""
+
+    def __init__(
+        self,
+        question: str,
+        embedding: np.ndarray,
+        events: list[str],
+        answer: str,
+        sources: set[str],
+        version: int,
+    ) -> None:
+        self.question = question
+        self.embedding = embedding
+        self.events = events
+        self.answer = answer
+        self.sources = sources
+        self.version = version
+        self.created_at = time.monotonic()
+
+
+class SemanticAnswerCache:
+    """
+    Cache semântico de respostas do agente, compartilhado entre threads.
+
+    Só o primeiro turno de uma thread consulta ou alimenta o cache: uma
+    pergunta de acompanhamento depende do histórico e não é equivalente à
+    mesma pergunta em outra conversa. Perguntas são comparadas pela similaridade de cosseno dos embeddings
+    (mesmo modelo do VectorStoreService). Um acerto exige similaridade
+    >= SEMANTIC_CACHE_THRESHOLD e que nenhuma fonte consultada pela resposta
+    (nem o conjunto de fontes) tenha mudado desde que ela foi gerada.
+    Desabilitado por padrão (SEMANTIC_CACHE_ENABLED).
+    """
+
+    def __init__(self, vector_store_service: VectorStoreService) -> None:
+        self.vector_store_service = vector_store_service
+        self.enabled = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+        self.threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        self.max_size = int(os.getenv("SEMANTIC_CACHE_SIZE", "500"))
+        self.ttl_seconds = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "86400"))
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, CachedAnswer] = OrderedDict()
+        self._next_id = 0
+
+    async def embed(self, question: str) -> np.ndarray:
+        """
+        Calcula o embedding normalizado da pergunta.
+
+        Args:
+            question: Texto da pergunta.
+
+        Returns:
+            np.ndarray: Vetor unitário da pergunta.
+        """
+        vector = np.asarray(
+            await self.vector_store_service.embed_query(question.strip().lower()),
+            dtype=np.float32,
+        )
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def lookup(self, embedding: np.ndarray) -> CachedAnswer | None:
+        """
+        Busca a resposta válida mais similar à pergunta.
+
+        Args:
+            embedding: Embedding normalizado da pergunta.
+
+        Returns:
+            CachedAnswer | None: Resposta em cache ou None em caso de miss.
+        """
+        self._drop_invalid()
+
+        best_id, best_score = None, self.threshold
+        for entry_id, entry in self._entries.items():
+            score = float(np.dot(entry.embedding, embedding))
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+
+        if best_id is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(best_id)
+        entry = self._entries[best_id]
+        logger.info(
+            "Semantic cache hit | similarity=%.3f | cached_question=%s",
+            best_score,
+            entry.question[:50],
+        )
+        return entry
+
+    def store(
+        self,
+        question: str,
+        embedding: np.ndarray,
+        events: list[str],
+        answer: str,
+        sources: set[str],
+        version: int,
+    ) -> None:
+        """
+        Armazena a resposta de uma pergunta.
+
+        Args:
+            question: Texto da pergunta.
+            embedding: Embedding normalizado da pergunta.
+            events: Eventos SSE ('content', 'tool_call', 'tool_response') na ordem emitida.
+            answer: Texto final da resposta.
+            sources: Fontes retornadas pelas ferramentas.
+            version: Versão do catálogo de fontes antes da execução do agente.
+        """
+        self._entries[self._next_id] = CachedAnswer(
+            question, embedding, events, answer, sources, version
+        )
+        self._next_id += 1
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Retorna estatísticas de acerto do cache.
+
+        Returns:
+            dict[str, float]: Hits, misses, hit ratio e número de entradas.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def _drop_invalid(self) -> None:
+        catalog = self.vector_store_service.catalog
+        now = time.monotonic()
+        invalid = [
+            entry_id
+            for entry_id, entry in self._entries.items()
+            if now - entry.created_at > self.ttl_seconds
+            or not catalog.is_current(entry.version, entry.sources)
+        ]
+        for entry_id in invalid:
+            del self._entries[entry_id]
+
+
+def init_semantic_cache(app: Litestar) -> None:
+    """
+    Cria o SemanticAnswerCache compartilhado no startup.
+
+    Deve rodar após a criação do VectorStoreService.
+
+    Args:
+        app: Aplicação Litestar cujo state receberá o cache.
+    """
+    app.state.semantic_cache = SemanticAnswerCache(app.state.vector_store_service)
+
+
+def provide_semantic_cache(state: State) -> SemanticAnswerCache:
+    """
+    Provider de dependência que retorna o SemanticAnswerCache compartilhado.
+
+    Args:
+        state: State da aplicação Litestar.
+
+    Returns:
+        SemanticAnswerCache: Instância criada no startup.
+    """
+    return state.semantic_cache
@@ -0,0 +1,233 @@
+import asyncio
+import time
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from src.logging_config import get_logger
+
+logger = get_logger("source_catalog")
+
+
+class SourceCatalog:
+    """
+    Catálogo em memória das fontes (arquivos/URLs) presentes no vector store.
+
+    Evita o `SELECT DISTINCT` sobre `langchain_pg_embedding` a cada chamada:
+    o catálogo é carregado uma vez, atualizado incrementalmente nas inserções
+    e recarregado após o TTL para captar alterações feitas por outros workers.
+    Opcionalmente persiste as fontes na tabela `sources`.
+
+    `version` é incrementada a cada inserção; `source_versions` guarda a versão
+    em que cada fonte mudou pela última vez, permitindo que caches derivados
+    (respostas, buscas) sejam invalidados apenas quando suas fontes mudam.
+    Cada fonte tem uma impressão digital do seu conteúdo no banco (contagem e
+    soma dos hashes dos chunks, ou `updated_at` na tabela `sources`), então a
+    recarga também detecta fontes reescritas ou removidas por outros workers.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        collection_name: str,
+        ttl_seconds: float = 30.0,
+        use_table: bool = False,
+    ) -> None:
+        self.engine = engine
+        self.collection_name = collection_name
+        self.ttl_seconds = ttl_seconds
+        self.use_table = use_table
+        self.version = 0
+        self.sources_added_version = 0
+        self.source_versions: dict[str, int] = {}
+        # fonte -> impressão digital do conteúdo; None quando a inserção foi
+        # local e o valor do banco ainda não foi lido.
+        self._sources: dict[str, str | None] = {}
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        """
+        Carrega (ou recarrega) o catálogo a partir do banco.
+
+        Incrementa `version` quando o conjunto de fontes ou o conteúdo de
+        alguma delas mudou.
+        """
+        async with self._lock:
+            if self.use_table:
+                sources = await self._load_from_table()
+            else:
+                sources = await self._load_from_embeddings()
+
+            added = sources.keys() - self._sources.keys()
+            changed = {
+                source
+                for source, fingerprint in self._sources.items()
+                if source not in sources
+                or (fingerprint is not None and sources[source] != fingerprint)
+            }
+            if added or changed:
+                self.version += 1
+                for source in changed:
+                    self.source_versions[source] = self.version
+                if added:
+                    self.sources_added_version = self.version
+            self._sources = sources
+            self._loaded_at = time.monotonic()
+            logger.debug(
+                "Source catalog loaded | sources=%d | version=%d",
+                len(self._sources),
+                self.version,
+            )
+
+    async def list_sources(self) -> list[str]:
+        """
+        Retorna as fontes conhecidas, recarregando se o TTL expirou.
+
+        Returns:
+            list[str]: Lista ordenada de fontes.
+        """
+        await self.refresh_if_stale()
+        return sorted(self._sources)
+
+    async def contains(self, source: str) -> bool:
+        """
+        Verifica se a fonte está no catálogo.
+
+        Args:
+            source: Nome da fonte (arquivo ou URL).
+
+        Returns:
+            bool: True se a fonte é conhecida.
+        """
+        await self.refresh_if_stale()
+        return source in self._sources
+
+    def is_current(self, version: int, sources: set[str]) -> bool:
+        """
+        Verifica se um resultado calculado na versão `version` continua válido.
+
+        O resultado é invalidado se alguma fonte nova foi adicionada ou se uma
+        das fontes usadas mudou depois dessa versão.
+
+        Args:
+            version: Versão do catálogo quando o resultado foi calculado.
+            sources: Fontes usadas para calcular o resultado.
+
+        Returns:
+            bool: True se nenhuma alteração relevante ocorreu desde `version`.
+        """
+        if self.sources_added_version > version:
+            return False
+        return all(self.source_versions.get(source, 0) <= version for source in sources)
+
+    async def add_sources(self, sources: set[str]) -> None:
+        """
+        Registra uma inserção no vector store, incrementando a versão do catálogo.
+
+        Args:
+            sources: Fontes presentes nos documentos inseridos.
+        """
+        if not sources:
+            return
+
+        new_sources = sources - self._sources.keys()
+        if self.use_table:
+            async with self.engine.begin() as conn:
+                await conn.execute(
+                    text("""
+                        INSERT INTO sources (collection_name, source)
+                        VALUES (:collection_name, :source)
+                        ON CONFLICT (collection_name, source) DO UPDATE
+                        SET updated_at = now()
+                    """),
+                    [
+                        {"collection_name": self.collection_name, "source": source}
+                        for source in sources
+                    ],
+                )
+
+        self.version += 1
+        for source in sources:
+            self._sources[source] = None
+            self.source_versions[source] = self.version
+        if new_sources:
+            self.sources_added_version = self.version
+        logger.debug(
+            "Source catalog updated | added=%d | version=%d",
+            len(new_sources),
+            self.version,
+        )
+
+    async def refresh_if_stale(self) -> None:
+        """Recarrega o catálogo se o TTL expirou (ou se ainda não foi carregado)."""
+        if (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self.ttl_seconds
+        ):
+            await self.load()
+
+    async def _load_from_embeddings(self) -> dict[str, str]:
+        # Os ids são hashes do conteúdo: qualquer reescrita muda a contagem ou a soma.
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT e.cmetadata ->> 'source' AS source,
+                           count(*) || ':' || sum(hashtext(e.id)) AS fingerprint
+                    FROM langchain_pg_embedding e
+                    JOIN langchain_pg_collection c ON c.uuid = e.collection_id
+                    WHERE c.name = :collection_name
+                      AND e.cmetadata ->> 'source' IS NOT NULL
+                    GROUP BY 1
+                """),
+                {"collection_name": self.collection_name},
+            )
+            return {row.source: row.fingerprint for row in result.fetchall()}
+
+    async def _load_from_table(self) -> dict[str, str | None]:
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                text("""
+                    CREATE TABLE IF NOT EXISTS sources (
+                        collection_name TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                        updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                        PRIMARY KEY (collection_name, source)
+                    )
+                """)
+            )
+            await conn.execute(
+                text("""
+                    ALTER TABLE sources
+                    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                """)
+            )
+            result = await conn.execute(
+                text("""
+                    SELECT source, updated_at::text AS fingerprint
+                    FROM sources
+                    WHERE collection_name = :collection_name
+                """),
+                {"collection_name": self.collection_name},
+            )
+            sources = {row.source: row.fingerprint for row in result.fetchall()}
+
+        if self._loaded_at is None and not sources:
+            sources = await self._load_from_embeddings()
+            if sources:
+                async with self.engine.begin() as conn:
+                    await conn.execute(
+                        text("""
+                            INSERT INTO sources (collection_name, source)
+                            VALUES (:collection_name, :source)
+                            ON CONFLICT DO NOTHING
+                        """),
+                        [
+                            {"collection_name": self.collection_name, "source": source}
+                            for source in sources
+                        ],
+                    )
+                logger.info("Sources table backfilled | sources=%d", len(sources))
+                # A próxima recarga lê o updated_at gravado agora.
+                sources = dict.fromkeys(sources)
+
+        return sources
@@ -0,0 +1,189 @@
+import os
+import time
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from src.logging_config import get_logger
+
+logger = get_logger("vector_index")
+
+INDEX_TYPES = {"hnsw", "ivfflat", "none"}
+ITERATIVE_SCAN_MODES = {"off", "relaxed_order", "strict_order"}
+
+
+class VectorIndexManager:
+    """
+    Gerencia o índice ANN (HNSW ou IVFFlat) da coluna de embeddings.
+
+    O tipo e os parâmetros de construção vêm de variáveis de ambiente;
+    `ef_search`/`probes` podem ser definidos por consulta. Buscas com filtro
+    (coleção, fonte, planilha) usam o iterative scan do pgvector >= 0.8
+    (VECTOR_ITERATIVE_SCAN), que continua varrendo o índice até encontrar
+    `k` linhas que passem no filtro em vez de devolver menos resultados.
+    """
+
+    def __init__(self, engine: AsyncEngine, dimensions: int) -> None:
+        self.engine = engine
+        self.dimensions = dimensions
+        self.index_type = os.getenv("VECTOR_INDEX_TYPE", "hnsw").lower()
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(f"VECTOR_INDEX_TYPE inválido: {self.index_type}")
+
+        self.hnsw_m = int(os.getenv("HNSW_M", "16"))
+        self.hnsw_ef_construction = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))
+        self.hnsw_ef_search = int(os.getenv("HNSW_EF_SEARCH", "40"))
+        self.ivfflat_lists = int(os.getenv("IVFFLAT_LISTS", "100"))
+        self.ivfflat_probes = int(os.getenv("IVFFLAT_PROBES", "10"))
+        self.iterative_scan = os.getenv("VECTOR_ITERATIVE_SCAN", "relaxed_order").lower()
+        if self.iterative_scan not in ITERATIVE_SCAN_MODES:
+            raise ValueError(f"VECTOR_ITERATIVE_SCAN inválido: {self.iterative_scan}")
+        # O IVFFlat só suporta relaxed_order.
+        if self.index_type == "ivfflat" and self.iterative_scan == "strict_order":
+            self.iterative_scan = "relaxed_order"
+
+    @property
+    def index_name(self) -> str:
+        return f"ix_langchain_pg_embedding_embedding_{self.index_type}"
+
+    @property
+    def params(self) -> dict[str, int]:
+        if self.index_type == "hnsw":
+            return {
+                "m": self.hnsw_m,
+                "ef_construction": self.hnsw_ef_construction,
+                "ef_search": self.hnsw_ef_search,
+            }
+        if self.index_type == "ivfflat":
+            return {"lists": self.ivfflat_lists, "probes": self.ivfflat_probes}
+        return {}
+
+    async def ensure_index(self) -> None:
+        """
+        Cria o índice ANN configurado, caso ainda não exista.
+
+        Fixa a dimensão da coluna `embedding` (exigido por HNSW/IVFFlat) e remove
+        índices ANN de outro tipo deixados por configurações anteriores.
+        """
+        async with self.engine.begin() as conn:
+            await self._ensure_column_dimensions(conn)
+            await self._drop_other_indexes(conn)
+            if self.index_type != "none":
+                await conn.execute(text(self._create_index_sql()))
+
+        logger.info(
+            "Vector index ensured | type=%s | params=%s", self.index_type, self.params
+        )
+
+    async def rebuild_index(self) -> float:
+        """
+        Recria o índice ANN com os parâmetros atuais sem bloquear buscas e inserts.
+
+        O novo índice é construído com CREATE INDEX CONCURRENTLY sob um nome
+        temporário; só então o índice antigo é removido e o novo renomeado.
+
+        Returns:
+            float: Duração da reconstrução em milissegundos.
+        """
+        started_at = time.perf_counter()
+        async with self.engine.begin() as conn:
+            await self._ensure_column_dimensions(conn)
+
+        # Operações CONCURRENTLY não podem rodar dentro de uma transação.
+        temp_name = f"{self.index_name}_rebuild"
+        autocommit = self.engine.execution_options(isolation_level="AUTOCOMMIT")
+        async with autocommit.connect() as conn:
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {temp_name}"))
+            if self.index_type != "none":
+                await conn.execute(
+                    text(self._create_index_sql(temp_name, concurrently=True))
+                )
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {self.index_name}"))
+            if self.index_type != "none":
+                await conn.execute(
+                    text(f"ALTER INDEX {temp_name} RENAME TO {self.index_name}")
+                )
+            for index_type in INDEX_TYPES - {"none", self.index_type}:
+                await conn.execute(
+                    text(
+                        "DROP INDEX CONCURRENTLY IF EXISTS "
+                        f"ix_langchain_pg_embedding_embedding_{index_type}"
+                    )
+                )
+
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        logger.info(
+            "Vector index rebuilt | type=%s | params=%s | duration_ms=%.1f",
+            self.index_type,
+            self.params,
+            duration_ms,
+        )
+        return duration_ms
+
+    async def apply_search_params(
+        self,
+        conn: AsyncConnection,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> None:
+        """
+        Define `hnsw.ef_search` / `ivfflat.probes` e o iterative scan para a transação corrente.
+
+        Args:
+            conn: Conexão com transação aberta onde a busca será executada.
+            ef_search: Sobrescreve HNSW_EF_SEARCH nesta consulta.
+            probes: Sobrescreve IVFFLAT_PROBES nesta consulta.
+        """
+        if self.index_type == "hnsw":
+            await conn.execute(
+                text("SELECT set_config('hnsw.ef_search', :value, true)"),
+                {"value": str(ef_search or self.hnsw_ef_search)},
+            )
+        elif self.index_type == "ivfflat":
+            await conn.execute(
+                text("SELECT set_config('ivfflat.probes', :value, true)"),
+                {"value": str(probes or self.ivfflat_probes)},
+            )
+        if self.index_type != "none":
+            await conn.execute(
+                text(f"SELECT set_config('{self.index_type}.iterative_scan', :value, true)"),
+                {"value": self.iterative_scan},
+            )
+
+    def _create_index_sql(self, name: str | None = None, concurrently: bool = False) -> str:
+        name = name or self.index_name
+        concurrently_sql = "CONCURRENTLY " if concurrently else ""
+        if self.index_type == "hnsw":
+            return f"""
+                CREATE INDEX {concurrently_sql}IF NOT EXISTS {name}
+                ON langchain_pg_embedding USING hnsw (embedding vector_cosine_ops)
+                WITH (m = {self.hnsw_m}, ef_construction = {self.hnsw_ef_construction})
+            """
+        return f"""
+            CREATE INDEX {concurrently_sql}IF NOT EXISTS {name}
+            ON langchain_pg_embedding USING ivfflat (embedding vector_cosine_ops)
+            WITH (lists = {self.ivfflat_lists})
+        """
+
+    async def _ensure_column_dimensions(self, conn: AsyncConnection) -> None:
+        result = await conn.execute(
+            text("""
+                SELECT atttypmod FROM pg_attribute
+                WHERE attrelid = 'langchain_pg_embedding'::regclass
+                  AND attname = 'embedding'
+            """)
+        )
+        if result.scalar() == self.dimensions:
+            return
+
+        logger.info("Fixing embedding column dimensions | dimensions=%d", self.dimensions)
+        await conn.execute(
+            text(
+                "ALTER TABLE langchain_pg_embedding "
+                f"ALTER COLUMN embedding TYPE vector({self.dimensions})"
+            )
+        )
+
+    async def _drop_other_indexes(self, conn: AsyncConnection) -> None:
+        for index_type in INDEX_TYPES - {"none", self.index_type}:
+            await conn.execute(
+                text(f"DROP INDEX IF EXISTS ix_langchain_pg_embedding_embedding_{index_type}")
+            )
@@ -0,0 +1,28 @@
+import os
+import uuid
+import pytest
+
+# O módulo do agente instancia o ChatOllama na importação.
+os.environ.setdefault("OLLAMA_MODEL", "test")
+os.environ.setdefault("OLLAMA_HOST", "http://localhost:11434")
+os.environ.setdefault(
+    "HUGGINGFACE_MODEL_NAME",
+    "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+)
+
+
+@pytest.fixture
+def database_url(monkeypatch: pytest.MonkeyPatch) -> str:
+    """
+    URL do Postgres com pgvector usado nos testes de integração (TEST_PGVECTOR_DATABASE_URL).
+
+    Cada teste usa uma coleção própria; sem a variável, o teste é ignorado.
+    """
+    url = os.getenv("TEST_PGVECTOR_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_PGVECTOR_DATABASE_URL não definida")
+    monkeypatch.setenv("PGVECTOR_DATABASE_URL", url)
+    monkeypatch.setenv("PGVECTOR_COLLECTION_NAME", f"test_{uuid.uuid4().hex[:12]}")
+    monkeypatch.setenv("EMBEDDING_CACHE_DIR", "")
+    monkeypatch.setenv("RERANK_ENABLED", "false")
+    return url
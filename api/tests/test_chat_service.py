@@ -0,0 +1,134 @@
+import asyncio
+import json
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from src.models.chat_model import UserMessage
+from src.services import chat_service
+from src.services.agent.compaction import ContextCompactor, tool_output_sources
+
+
+def _tool_message() -> ToolMessage:
+    docs = [
+        Document(
+            page_content="Receita do trimestre.",
+            metadata={"source": "relatorio.pdf", "location": "página 2"},
+        ),
+        Document(
+            page_content="História da cidade.",
+            metadata={
+                "source": "https://pt.wikipedia.org/wiki/Recife",
+                "location": "Wikipedia",
+            },
+        ),
+    ]
+    return ToolMessage(content=ContextCompactor().format(docs), tool_call_id="call-1")
+
+
+def test_tool_output_sources_reads_tool_message_content():
+    assert tool_output_sources(_tool_message()) == {
+        "relatorio.pdf",
+        "https://pt.wikipedia.org/wiki/Recife",
+    }
+
+
+class _State:
+    def __init__(self, messages: list) -> None:
+        self.values = {"messages": messages}
+
+
+class _FakeAgent:
+    def __init__(self, output: ToolMessage, history: list | None = None) -> None:
+        self.output = output
+        self.history = history or []
+
+    async def aget_state(self, config):
+        return _State(self.history)
+
+    async def astream_events(self, *args, **kwargs):
+        yield {
+            "event": "on_tool_end",
+            "name": "search_documents",
+            "data": {"output": self.output},
+        }
+        yield {
+            "event": "on_chat_model_stream",
+            "data": {"chunk": _Chunk("Resposta final.")},
+        }
+
+
+class _Chunk:
+    def __init__(self, content: str) -> None:
+        self.content = content
+        self.additional_kwargs = {}
+
+
+class _Catalog:
+    version = 7
+
+    async def refresh_if_stale(self):
+        pass
+
+
+class _VectorStore:
+    catalog = _Catalog()
+
+
+class _SemanticCache:
+    enabled = True
+
+    def __init__(self) -> None:
+        self.stored = None
+        self.lookups = 0
+
+    async def embed(self, question):
+        return [0.0]
+
+    def lookup(self, embedding):
+        self.lookups += 1
+        return None
+
+    def store(self, question, embedding, events, answer, sources, version):
+        self.stored = {"answer": answer, "sources": sources, "version": version}
+
+
+def test_process_message_stores_sources_from_tool_message(monkeypatch):
+    monkeypatch.setattr(chat_service, "agent", _FakeAgent(_tool_message()))
+    cache = _SemanticCache()
+    service = chat_service.ChatService(cache)
+
+    async def run() -> list[dict]:
+        return [
+            json.loads(chunk)
+            async for chunk in service.process_message(
+                UserMessage(content="Qual a receita?", thread_id="t-1"), _VectorStore()
+            )
+        ]
+
+    events = asyncio.run(run())
+
+    assert [event["type"] for event in events] == ["tool_response", "content"]
+    assert cache.stored == {
+        "answer": "Resposta final.",
+        "sources": {"relatorio.pdf", "https://pt.wikipedia.org/wiki/Recife"},
+        "version": 7,
+    }
+
+
+def test_process_message_skips_cache_for_follow_up_turns(monkeypatch):
+    history = [HumanMessage(content="Fale do relatório."), AIMessage(content="Ok.")]
+    monkeypatch.setattr(chat_service, "agent", _FakeAgent(_tool_message(), history))
+    cache = _SemanticCache()
+    service = chat_service.ChatService(cache)
+
+    async def run() -> list[str]:
+        return [
+            chunk
+            async for chunk in service.process_message(
+                UserMessage(content="E a receita?", thread_id="t-2"), _VectorStore()
+            )
+        ]
+
+    asyncio.run(run())
+
+    assert cache.lookups == 0
+    assert cache.stored is None
@@ -0,0 +1,103 @@
+import asyncio
+import gc
+import tracemalloc
+import uuid
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.services.agent.checkpointer import CheckpointConflictError, TieredCheckpointSaver
+from src.services.schema_migrations import run_migrations
+
+
+def _checkpoint(saver: TieredCheckpointSaver, text: str, parent=None):
+    checkpoint = empty_checkpoint()
+    version = saver.get_next_version(
+        parent["channel_versions"]["messages"] if parent else None, None
+    )
+    checkpoint["channel_values"] = {"messages": [text]}
+    checkpoint["channel_versions"] = {"messages": version}
+    return checkpoint, {"messages": version}
+
+
+async def _put(saver: TieredCheckpointSaver, thread_id: str, text: str, parent_config=None):
+    parent = None
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    if parent_config:
+        parent = (await saver.aget_tuple(parent_config)).checkpoint
+        config = parent_config
+    checkpoint, new_versions = _checkpoint(saver, text, parent)
+    return await saver.aput(config, checkpoint, {"source": "loop", "step": 0}, new_versions)
+
+
+def test_memory_stays_bounded_with_many_threads(monkeypatch):
+    monkeypatch.setenv("CHECKPOINT_MAX_THREADS", "500")
+    monkeypatch.setenv("CHECKPOINT_TTL_SECONDS", "3600")
+    saver = TieredCheckpointSaver()
+    message = "mensagem " * 50
+
+    async def fill(start: int, count: int) -> None:
+        for i in range(start, start + count):
+            await _put(saver, f"thread-{i}", message)
+
+    async def run() -> tuple[int, int]:
+        tracemalloc.start()
+        try:
+            # Aquecimento até o limite: a partir daqui cada thread nova despeja outra.
+            await fill(0, 1_000)
+            gc.collect()
+            warm, _ = tracemalloc.get_traced_memory()
+            await fill(1_000, 30_000)
+            gc.collect()
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return warm, after
+
+    warm, after = asyncio.run(run())
+
+    assert len(saver._threads) == 500
+    assert len(saver.memory.storage) == 500
+    assert len(saver._load_locks) <= 500
+    assert len(saver._persisted_ids) <= 500
+    # 30 mil threads a mais não podem crescer a memória além de ruído de alocação.
+    assert after - warm < 0.2 * warm
+
+
+def test_checkpoint_writes_are_compare_and_set(database_url):
+    async def run() -> None:
+        engine = create_async_engine(database_url)
+        await run_migrations(engine)
+        thread_id = f"test-{uuid.uuid4().hex}"
+        worker_a, worker_b = TieredCheckpointSaver(), TieredCheckpointSaver()
+        worker_a.bind(engine)
+        worker_b.bind(engine)
+        latest = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        try:
+            first = await _put(worker_a, thread_id, "primeira")
+            assert (await worker_b.aget_tuple(latest)).checkpoint["id"] == (
+                first["configurable"]["checkpoint_id"]
+            )
+
+            # A avança a thread; B ainda parte do primeiro checkpoint.
+            second = await _put(worker_a, thread_id, "segunda", first)
+            checkpoint, new_versions = _checkpoint(
+                worker_b, "concorrente", (await worker_a.aget_tuple(first)).checkpoint
+            )
+            with pytest.raises(CheckpointConflictError):
+                await worker_b.aput(first, checkpoint, {"source": "loop", "step": 1}, new_versions)
+            assert thread_id not in worker_b._threads
+
+            # B recarrega o estado de A e grava em cima dele.
+            stored = await worker_b.aget_tuple(latest)
+            assert stored.checkpoint["id"] == second["configurable"]["checkpoint_id"]
+            third = await _put(worker_b, thread_id, "terceira", stored.config)
+
+            # A ainda tem o segundo checkpoint em memória e deve perceber que está obsoleto.
+            refreshed = await worker_a.aget_tuple(latest)
+            assert refreshed.checkpoint["id"] == third["configurable"]["checkpoint_id"]
+            assert refreshed.checkpoint["channel_values"]["messages"] == ["terceira"]
+        finally:
+            await worker_a.adelete_thread(thread_id)
+            await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,40 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from src.services.agent.context import ContextBuilder
+
+
+def _conversation(turns: int, tool_output_chars: int) -> list:
+    messages = []
+    for i in range(turns):
+        call_id = f"call-{i}"
+        messages += [
+            HumanMessage(content=f"Pergunta {i} sobre o relatório?"),
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "search_documents", "args": {"query": f"q{i}"}, "id": call_id}],
+            ),
+            ToolMessage(content="trecho " * (tool_output_chars // 7), tool_call_id=call_id),
+            AIMessage(content=f"Resposta {i}."),
+        ]
+    return messages
+
+
+def test_build_keeps_short_history_intact(monkeypatch):
+    monkeypatch.setenv("CONTEXT_MAX_TOKENS", "6000")
+    messages = _conversation(2, 200)
+
+    assert ContextBuilder().build(messages) == messages
+
+
+def test_build_enforces_budget_on_kept_turns(monkeypatch):
+    monkeypatch.setenv("CONTEXT_MAX_TOKENS", "500")
+    monkeypatch.setenv("CONTEXT_KEEP_TURNS", "2")
+    messages = _conversation(4, 6000)
+
+    context = ContextBuilder().build(messages, reserved_tokens=50)
+
+    assert count_tokens_approximately(context) <= 450
+    assert isinstance(context[0], HumanMessage)
+    assert context[-4].content == messages[-4].content
+    call_ids = {call["id"] for m in context if isinstance(m, AIMessage) for call in m.tool_calls}
+    assert {m.tool_call_id for m in context if isinstance(m, ToolMessage)} <= call_ids
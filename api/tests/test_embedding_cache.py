@@ -0,0 +1,40 @@
+import os
+from langchain_core.embeddings import Embeddings
+from src.services.embedding_cache import CachedEmbeddings
+
+
+class _FakeEmbeddings(Embeddings):
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [float(len(text)), 0.0]
+
+
+def _disk_files(cache_dir: str) -> list[str]:
+    return [
+        os.path.join(root, name)
+        for root, _, names in os.walk(cache_dir)
+        for name in names
+    ]
+
+
+def test_disk_cache_is_capped(tmp_path):
+    cache = CachedEmbeddings(
+        _FakeEmbeddings(), namespace="test", cache_dir=str(tmp_path), disk_max_entries=10
+    )
+
+    cache.embed_documents([f"documento {i}" for i in range(25)])
+
+    assert len(_disk_files(str(tmp_path))) <= 10
+    assert cache.stats()["disk_evictions"] > 0
+
+
+def test_query_embeddings_stay_in_memory(tmp_path):
+    cache = CachedEmbeddings(_FakeEmbeddings(), namespace="test", cache_dir=str(tmp_path))
+
+    cache.embed_query("qual a receita?")
+    assert cache.embed_query("qual a receita?") == [15.0, 0.0]
+
+    assert _disk_files(str(tmp_path)) == []
+    assert cache.stats()["memory_hits"] == 1
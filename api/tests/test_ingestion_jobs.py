@@ -0,0 +1,101 @@
+import asyncio
+import os
+from langchain_core.documents import Document
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.services.ingestion_jobs import IngestionJobManager
+from src.services.schema_migrations import run_migrations
+
+
+class _Upload:
+    def __init__(self, filename: str, content: bytes) -> None:
+        self.filename = filename
+        self.content = content
+
+    async def read(self) -> bytes:
+        return self.content
+
+
+class _BlockingIngestion:
+    """Simula uma extração longa: o job fica em 'running' até ser cancelado."""
+
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+
+    def validate(self, filenames: list[str]) -> None:
+        pass
+
+    async def process_files(self, files_data):
+        self.started.set()
+        await asyncio.Event().wait()
+        yield  # pragma: no cover
+
+
+class _Ingestion:
+    def validate(self, filenames: list[str]) -> None:
+        pass
+
+    async def process_files(self, files_data):
+        for file_data in files_data:
+            content = (await file_data.read()).decode("utf-8")
+            yield (
+                file_data.filename,
+                [Document(page_content=content, metadata={"source": file_data.filename})],
+                True,
+            )
+
+
+class _VectorStore:
+    def __init__(self, engine) -> None:
+        self.engine = engine
+        self.added: list[Document] = []
+
+    async def add_documents(self, documents: list[Document]) -> None:
+        self.added.extend(documents)
+
+
+def test_cancelled_durable_job_resumes_after_restart(database_url, monkeypatch, tmp_path):
+    monkeypatch.setenv("INGESTION_JOBS_DURABLE", "true")
+    monkeypatch.setenv("INGESTION_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setenv("INGESTION_JOB_WORKERS", "1")
+
+    async def run() -> None:
+        engine = create_async_engine(database_url)
+        await run_migrations(engine)
+        store = _VectorStore(engine)
+        job_id = None
+        try:
+            blocking = _BlockingIngestion()
+            manager = IngestionJobManager(blocking, store)
+            await manager.start()
+            job = await manager.submit([_Upload("notas.txt", b"conteudo do arquivo")])
+            job_id = job.job_id
+            await asyncio.wait_for(blocking.started.wait(), timeout=10)
+
+            # Shutdown com o job em andamento: os arquivos devem continuar no spool.
+            await manager.close()
+            assert job.status == "running"
+            assert all(os.path.exists(f.path) for f in job.files)
+
+            restarted = IngestionJobManager(_Ingestion(), store)
+            await restarted.start()
+
+            async def events() -> list[dict]:
+                return [event async for event in restarted.stream_events(job_id)]
+
+            received = await asyncio.wait_for(events(), timeout=10)
+            await restarted.close()
+
+            assert received[-1]["type"] == "completed"
+            assert [doc.page_content for doc in store.added] == ["conteudo do arquivo"]
+            assert (await restarted.get_job_status(job_id))["status"] == "completed"
+            assert not os.path.exists(os.path.join(str(tmp_path), job_id))
+        finally:
+            if job_id:
+                async with engine.begin() as conn:
+                    await conn.execute(
+                        text("DELETE FROM ingestion_jobs WHERE id = :id"), {"id": job_id}
+                    )
+            await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,44 @@
+import csv
+import io
+import re
+import zipfile
+import openpyxl
+from src.services.ingestion_service import _excel_sheet_to_csv, _list_excel_sheets
+
+
+def _workbook_with_stale_dimension() -> bytes:
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Vendas"
+    sheet.append(["produto", None, "valor"])
+    sheet.append(["Notebook"])
+    sheet.append(["Mouse", "sem fio", 59.9, "extra"])
+    sheet.append(["Teclado", None, "texto com\nquebra"])
+    workbook.create_sheet("Vazia")
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    # Simula arquivos gerados por outras ferramentas, com <dimension ref="A1"> desatualizado.
+    source = zipfile.ZipFile(io.BytesIO(buffer.getvalue()))
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename.startswith("xl/worksheets/"):
+                data = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="A1"', data)
+            target.writestr(item, data)
+    return output.getvalue()
+
+
+def test_excel_sheet_to_csv_ignores_stale_dimension_and_pads_rows():
+    file_bytes = _workbook_with_stale_dimension()
+
+    assert _list_excel_sheets(file_bytes) == ["Vendas", "Vazia"]
+    rows = list(csv.reader(io.StringIO(_excel_sheet_to_csv(file_bytes, "Vendas").decode("utf-8"))))
+    assert rows == [
+        ["produto", "Unnamed: 1", "valor"],
+        ["Notebook", "", ""],
+        ["Mouse", "sem fio", "59.9"],
+        ["Teclado", "", "texto com\nquebra"],
+    ]
+    assert _excel_sheet_to_csv(file_bytes, "Vazia") == b""
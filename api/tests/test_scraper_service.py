@@ -0,0 +1,123 @@
+import asyncio
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+import pytest
+from langchain_core.documents import Document
+from src.services import scraper_service
+from src.services.scraper_service import ScraperService
+
+PAGES = {
+    "/": ["/a", "/b", "/flaky", "/a#secao", "/missing", "http://outro-host.invalid/x"],
+    "/a": ["/a1"],
+    "/b": ["/"],
+    "/flaky": [],
+    "/a1": ["/a2"],
+    "/a2": [],
+}
+
+
+class _Site:
+    """Site local: páginas com links entre si, uma que falha uma vez (503) e uma 404."""
+
+    def __init__(self) -> None:
+        self.requests: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                with site._lock:
+                    site.requests[self.path] += 1
+                    attempt = site.requests[self.path]
+
+                if self.path not in PAGES or (self.path == "/flaky" and attempt == 1):
+                    self.send_response(404 if self.path not in PAGES else 503)
+                    self.end_headers()
+                    return
+
+                links = "".join(f'<a href="{link}">link</a>' for link in PAGES[self.path])
+                body = (
+                    f"<html><head><title>Página {self.path}</title></head>"
+                    f"<body><p>Conteúdo de {self.path}</p>{links}</body></html>"
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _parse_without_chunking(url: str, html: str) -> tuple[list[Document], list[str]]:
+    text, location, links = scraper_service._parse_page(url, html)
+    return [Document(page_content=text, metadata={"source": url, "location": location})], links
+
+
+@pytest.fixture
+def site(monkeypatch):
+    monkeypatch.setenv("SCRAPER_RETRY_BACKOFF_SECONDS", "0.01")
+    monkeypatch.setenv("SCRAPER_MAX_RETRIES", "2")
+    # Sem pool de processos o parsing roda numa thread; o chunking (tokenizer) fica de fora.
+    monkeypatch.setattr(scraper_service, "_parse_and_split", _parse_without_chunking)
+    site = _Site()
+    yield site
+    site.close()
+
+
+def _crawl(site: _Site, depth: int, max_pages: int | None = None) -> dict[str, tuple]:
+    async def run() -> dict[str, tuple]:
+        service = ScraperService(client=httpx.AsyncClient(trust_env=False))
+        try:
+            return {
+                url.removeprefix(site.url): (page, error)
+                async for url, page, error in service.crawl(
+                    [f"{site.url}/"], depth=depth, max_pages=max_pages
+                )
+            }
+        finally:
+            await service.close()
+
+    return asyncio.run(run())
+
+
+def test_crawl_follows_same_host_links_up_to_depth(site):
+    results = _crawl(site, depth=1)
+
+    assert set(results) == {"/", "/a", "/b", "/flaky", "/missing"}
+    assert results["/a"][0].chunks[0].page_content.startswith("Conteúdo de /a")
+    # 503 é retentado até dar certo; 404 falha sem retentativa.
+    assert results["/flaky"][1] is None
+    assert site.requests["/flaky"] == 2
+    assert results["/missing"][0] is None
+    assert site.requests["/missing"] == 1
+    # Cada página é buscada uma vez, apesar do link de volta para "/" e do fragmento.
+    assert site.requests["/"] == 1
+    assert site.requests["/a"] == 1
+    assert "/a1" not in site.requests
+
+
+def test_crawl_respects_max_pages(site):
+    results = _crawl(site, depth=5, max_pages=3)
+
+    assert len(results) == 3
+    assert len(site.requests) == 3
+
+
+def test_crawl_reaches_deeper_levels(site):
+    results = _crawl(site, depth=2)
+
+    assert "/a1" in results
+    assert "/a2" not in results
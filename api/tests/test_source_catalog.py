@@ -0,0 +1,56 @@
+import asyncio
+from src.services.source_catalog import SourceCatalog
+
+
+def _catalog(monkeypatch, snapshots: list[dict[str, str]]) -> SourceCatalog:
+    catalog = SourceCatalog(engine=None, collection_name="test")
+    pending = iter(snapshots)
+
+    async def load_from_embeddings():
+        return next(pending)
+
+    monkeypatch.setattr(catalog, "_load_from_embeddings", load_from_embeddings)
+    return catalog
+
+
+def test_reload_invalidates_sources_whose_content_changed(monkeypatch):
+    catalog = _catalog(
+        monkeypatch,
+        [
+            {"a.pdf": "3:10", "b.pdf": "2:5"},
+            {"a.pdf": "3:10", "b.pdf": "2:5"},
+            {"a.pdf": "4:99", "b.pdf": "2:5"},
+            {"a.pdf": "4:99"},
+        ],
+    )
+
+    async def run() -> None:
+        await catalog.load()
+        version = catalog.version
+
+        await catalog.load()
+        assert catalog.version == version
+
+        await catalog.load()
+        assert not catalog.is_current(version, {"a.pdf"})
+        assert catalog.is_current(version, {"b.pdf"})
+
+        version = catalog.version
+        await catalog.load()
+        assert not catalog.is_current(version, {"b.pdf"})
+
+    asyncio.run(run())
+
+
+def test_reload_after_local_insert_does_not_bump_again(monkeypatch):
+    catalog = _catalog(monkeypatch, [{"a.pdf": "3:10"}, {"a.pdf": "5:42"}])
+
+    async def run() -> None:
+        await catalog.load()
+        await catalog.add_sources({"a.pdf"})
+        version = catalog.version
+
+        await catalog.load()
+        assert catalog.version == version
+
+    asyncio.run(run())
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import time
+import uuid
+import numpy as np
+from sqlalchemy import text
+from src.services.pgvector_service import VectorStoreService, _to_pgvector
+
+CORPUS_SIZE = 5000
+CLUSTERS = 50
+QUERIES = 50
+K = 10
+
+
+def _synthetic_vectors(rng: np.random.Generator, count: int, dimensions: int) -> np.ndarray:
+    # Vetores agrupados em clusters, mais próximos da distribuição de embeddings
+    # reais do que vetores uniformes.
+    centers = rng.normal(size=(CLUSTERS, dimensions))
+    vectors = centers[rng.integers(0, CLUSTERS, count)] + 0.3 * rng.normal(
+        size=(count, dimensions)
+    )
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+async def _insert_corpus(service: VectorStoreService, vectors: np.ndarray) -> None:
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "collection_id": service.collection_id,
+            "embedding": _to_pgvector(vector.tolist()),
+            "document": f"documento sintético {i}",
+            "cmetadata": json.dumps({"source": "synthetic", "location": str(i)}),
+        }
+        for i, vector in enumerate(vectors)
+    ]
+    async with service.engine.begin() as conn:
+        await conn.execute(
+            text("""
+                INSERT INTO langchain_pg_embedding
+                    (id, collection_id, embedding, document, cmetadata)
+                VALUES (:id, :collection_id, CAST(:embedding AS vector), :document,
+                        CAST(:cmetadata AS jsonb))
+            """),
+            rows,
+        )
+
+
+async def _exact_ids(service: VectorStoreService, query: np.ndarray) -> set[str]:
+    async with service.engine.begin() as conn:
+        await conn.execute(text("SET LOCAL enable_indexscan = off"))
+        result = await conn.execute(
+            text("""
+                SELECT id FROM langchain_pg_embedding
+                WHERE collection_id = :collection_id
+                ORDER BY embedding <=> CAST(:embedding AS vector)
+                LIMIT :k
+            """),
+            {
+                "collection_id": service.collection_id,
+                "embedding": _to_pgvector(query.tolist()),
+                "k": K,
+            },
+        )
+        return {row.id for row in result.fetchall()}
+
+
+async def _measure(
+    service: VectorStoreService, queries: np.ndarray, exact: list[set[str]], ef_search: int
+) -> tuple[float, float]:
+    recall = 0.0
+    started_at = time.perf_counter()
+    for query, expected in zip(queries, exact):
+        docs = await service._search_by_vector(query.tolist(), K, ef_search=ef_search)
+        recall += len({doc.id for doc in docs} & expected) / K
+    latency_ms = (time.perf_counter() - started_at) * 1000 / len(queries)
+    return recall / len(queries), latency_ms
+
+
+def test_hnsw_recall_vs_latency_against_exact_search(database_url, monkeypatch):
+    monkeypatch.setenv("VECTOR_INDEX_TYPE", "hnsw")
+
+    async def run() -> None:
+        service = VectorStoreService()
+        await service.initialize()
+        try:
+            rng = np.random.default_rng(42)
+            vectors = _synthetic_vectors(
+                rng, CORPUS_SIZE + QUERIES, service.embedding_dimensions
+            )
+            await _insert_corpus(service, vectors[:CORPUS_SIZE])
+            # Também exercita a reconstrução CONCURRENTLY.
+            await service.vector_index.rebuild_index()
+
+            queries = vectors[CORPUS_SIZE:]
+            exact = [await _exact_ids(service, query) for query in queries]
+
+            results = {
+                ef_search: await _measure(service, queries, exact, ef_search)
+                for ef_search in (10, service.vector_index.hnsw_ef_search, 200)
+            }
+            for ef_search, (recall, latency_ms) in results.items():
+                print(f"ef_search={ef_search} recall@{K}={recall:.3f} latency_ms={latency_ms:.2f}")
+
+            default_recall, _ = results[service.vector_index.hnsw_ef_search]
+            assert default_recall >= 0.9
+            assert results[200][0] >= default_recall >= results[10][0]
+        finally:
+            await service.store.adelete_collection()
+            await service.close()
+
+    asyncio.run(run())
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from langchain_core.documents import Document
+from src.services.pgvector_service import VectorStoreService
+
+SEARCHES = 16
+ADDS = 4
+
+
+def _documents(source: str, count: int) -> list[Document]:
+    return [
+        Document(
+            page_content=f"Trecho {i} de {source}: relatório de vendas da região {i % 5}.",
+            metadata={"source": source, "location": f"linha {i + 1}"},
+        )
+        for i in range(count)
+    ]
+
+
+async def _max_loop_gap(stop: asyncio.Event) -> float:
+    gap = 0.0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.005)
+        now = time.perf_counter()
+        gap = max(gap, now - last)
+        last = now
+    return gap
+
+
+def test_concurrent_search_and_add_do_not_serialize(database_url):
+    async def run() -> None:
+        service = VectorStoreService()
+        await service.initialize()
+        try:
+            await service.add_documents(_documents("seed.txt", 50))
+
+            # Linha de base: as mesmas operações, uma de cada vez (queries
+            # distintas para não acertar os caches de embedding e de busca).
+            started_at = time.perf_counter()
+            for i in range(SEARCHES):
+                await service.search(f"vendas sequenciais {i}", k=4)
+            for i in range(ADDS):
+                await service.add_documents(_documents(f"sequencial-{i}.txt", 20))
+            sequential = time.perf_counter() - started_at
+
+            stop = asyncio.Event()
+            heartbeat = asyncio.create_task(_max_loop_gap(stop))
+            started_at = time.perf_counter()
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    *(service.search(f"vendas concorrentes {i}", k=4) for i in range(SEARCHES)),
+                    *(
+                        service.add_documents(_documents(f"concorrente-{i}.txt", 20))
+                        for i in range(ADDS)
+                    ),
+                ),
+                timeout=120,
+            )
+            concurrent = time.perf_counter() - started_at
+            stop.set()
+            max_gap = await heartbeat
+
+            assert all(len(docs) == 4 for docs in results[:SEARCHES])
+            for i in range(ADDS):
+                assert await service.document_exists(f"concorrente-{i}.txt")
+            # Sem serialização: o lote concorrente termina antes da soma das
+            # operações, e o event loop nunca fica bloqueado por embedding ou SQL.
+            assert concurrent < sequential
+            assert max_gap < 0.25
+        finally:
+            await service.store.adelete_collection()
+            await service.close()
+
+    asyncio.run(run())
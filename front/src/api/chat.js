@@ -14,6 +14,20 @@ export async function* streamMessageFromApi(content, thread_id) {
     throw new Error(`API error: ${response.status}`);
   }
 
+  yield* readServerSentEvents(response);
+}
+
+export async function* streamUploadEventsFromApi(jobId) {
+  const response = await fetch(`${API_URL}/chat/upload/${jobId}/events`);
+
+  if (!response.ok) {
+    throw new Error(`Upload events error: ${response.status}`);
+  }
+
+  yield* readServerSentEvents(response);
+}
+
+async function* readServerSentEvents(response) {
   const reader = response.body.getReader();
   const decoder = new TextDecoder();
   let buffer = '';